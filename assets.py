@@ -0,0 +1,45 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Carga de arquivos (sons, músicas) numa thread separada, para a janela e o
+# menu aparecerem sem esperar o disco e o mixer.
+#
+# Cada pedido tem um nome e devolve um Future. A thread é uma só, então os
+# pedidos rodam na ordem em que foram feitos (o mixer é iniciado antes dos
+# sons). get(nome) nunca bloqueia: até o arquivo ficar pronto devolve o
+# padrão, e o jogo segue sem aquele som.
+
+
+class AssetLoader:
+    def __init__(self):
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="assets")
+        self.futures = {}
+        self.times = {}  # nome -> segundos gastos na carga
+
+    def submit(self, name, function, *args):
+        def timed():
+            start = time.perf_counter()
+            try:
+                return function(*args)
+            finally:
+                self.times[name] = time.perf_counter() - start
+
+        future = self.executor.submit(timed)
+        self.futures[name] = future
+        return future
+
+    def get(self, name, default=None):
+        future = self.futures.get(name)
+        if future is None or not future.done() or future.exception() is not None:
+            return default
+        result = future.result()
+        return default if result is None else result
+
+    def ready(self, name=None):
+        if name is not None:
+            future = self.futures.get(name)
+            return future is not None and future.done()
+        return all(future.done() for future in self.futures.values())
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
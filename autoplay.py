@@ -0,0 +1,220 @@
+import time
+
+from tetris_engine import (BOARD_WIDTH, BOARD_HEIGHT, FULL_ROW, ROTATIONS, column_heights,
+                           ACTION_NONE, ACTION_LEFT, ACTION_RIGHT, ACTION_ROTATE,
+                           ACTION_DROP, ACTION_HOLD)
+
+# Jogador automático (modo demonstração e testes longos do renderizador).
+#
+# Para a peça atual (e, se der, a do hold ou a próxima), enumera todas as
+# posições (rotação, coluna) alcançáveis a partir de onde a peça está: girar
+# no lugar e depois andar na horizontal, com as mesmas regras de colisão do
+# engine, sobre o bitboard. Cada posição é encaixada numa cópia das linhas e
+# pontuada pela heurística; o plano vencedor vira ações normais
+# (hold, girar, ←/→, queda rápida).
+
+# Pesos da heurística (positivo = bom). Podem ser trocados no construtor.
+DEFAULT_WEIGHTS = {
+    "lines": 0.76,       # linhas limpas pela jogada
+    "height": -0.51,     # soma das alturas das colunas
+    "holes": -0.36,      # células vazias com algo em cima
+    "bumpiness": -0.18,  # soma das diferenças de altura entre colunas vizinhas
+    "wells": -0.10,      # profundidade dos poços (coluna abaixo das duas vizinhas)
+}
+# Penalidade para jogadas que deixam o tabuleiro perto do topo
+TOP_OUT_PENALTY = -100.0
+DANGER_HEIGHT = BOARD_HEIGHT - 3
+
+
+def fits(rows, x, y, masks, width):
+    # Mesmo teste de TetrisEngine.fits, sobre uma lista de linhas qualquer
+    if x < 0 or y < 0 or x + width > BOARD_WIDTH or y + len(masks) > BOARD_HEIGHT:
+        return False
+    for i, mask in enumerate(masks):
+        if rows[y + i] & (mask << x):
+            return False
+    return True
+
+
+def drop_y(rows, heights, piece, x, y):
+    # Linha onde a peça para caindo de (x, y); como get_ghost_y do engine
+    landing = BOARD_HEIGHT
+    for col, bottom in enumerate(piece.bottom):
+        row = BOARD_HEIGHT - heights[x + col] - 1 - bottom
+        if row < y:
+            # Saliência acima do topo da coluna: desce linha a linha
+            while fits(rows, x, y + 1, piece.masks, piece.width):
+                y += 1
+            return y
+        if row < landing:
+            landing = row
+    return landing
+
+
+def place(rows, heights, piece, x, y):
+    # Encaixa a peça numa cópia; devolve (linhas, alturas, linhas limpas)
+    rows = rows[:]
+    for i, mask in enumerate(piece.masks):
+        rows[y + i] |= mask << x
+    full = [y + i for i in range(piece.height) if rows[y + i] == FULL_ROW]
+    if full:
+        rows = [0] * len(full) + [row for i, row in enumerate(rows) if i not in full]
+        return rows, column_heights(rows), len(full)
+    heights = heights[:]
+    for col, top in enumerate(piece.top):
+        height = BOARD_HEIGHT - y - top
+        if height > heights[x + col]:
+            heights[x + col] = height
+    return rows, heights, 0
+
+
+class AutoPlayer:
+    def __init__(self, engine, weights=None, use_hold=True, lookahead=False):
+        self.engine = engine
+        self.weights = dict(DEFAULT_WEIGHTS)
+        if weights:
+            self.weights.update(weights)
+        self.use_hold = use_hold
+        self.lookahead = lookahead
+        self.plan = None  # (usar hold, rotação alvo, coluna alvo)
+        self.plan_key = None
+        self.evaluations = 0
+        self.search_time = 0.0
+
+    # ------------------------------------------------------------------
+    # Busca
+    # ------------------------------------------------------------------
+    def board_score(self, rows, heights, cleared):
+        w = self.weights
+        top = max(heights)
+        holes = 0
+        covered = 0
+        for row in rows[BOARD_HEIGHT - top:]:
+            covered |= row
+            holes += (covered & ~row).bit_count()
+        bumpiness = 0
+        wells = 0
+        for x in range(BOARD_WIDTH):
+            height = heights[x]
+            left = heights[x - 1] if x > 0 else BOARD_HEIGHT
+            right = heights[x + 1] if x < BOARD_WIDTH - 1 else BOARD_HEIGHT
+            if x < BOARD_WIDTH - 1:
+                bumpiness += abs(height - right)
+            depth = min(left, right) - height
+            if depth > 0:
+                wells += depth
+        score = (w["lines"] * cleared + w["height"] * sum(heights) + w["holes"] * holes +
+                 w["bumpiness"] * bumpiness + w["wells"] * wells)
+        if top >= DANGER_HEIGHT:
+            score += TOP_OUT_PENALTY
+        return score
+
+    def placements(self, rows, heights, shape, rotation, px, py):
+        # (rotação, x, y final, peça) de cada posição alcançável, sem repetir
+        # orientações iguais (O, e I/S/Z de 180°)
+        states = ROTATIONS[shape]
+        seen = set()
+        result = []
+        for steps in range(4):
+            r = (rotation + steps) % 4
+            piece = states[r]
+            if not fits(rows, px, py, piece.masks, piece.width):
+                break  # Girar no lugar bateu em algo
+            if piece.matrix in seen:
+                continue
+            seen.add(piece.matrix)
+            x = px
+            while fits(rows, x, py, piece.masks, piece.width):
+                result.append((r, x, drop_y(rows, heights, piece, x, py), piece))
+                x -= 1
+            x = px + 1
+            while fits(rows, x, py, piece.masks, piece.width):
+                result.append((r, x, drop_y(rows, heights, piece, x, py), piece))
+                x += 1
+        return result
+
+    def best_for(self, rows, heights, shape, rotation, px, py, next_shape=None):
+        # Melhor (pontuação, rotação, x) para a peça; com next_shape, soma a
+        # melhor jogada da peça seguinte no tabuleiro resultante
+        best = None
+        evaluations = 0
+        for r, x, y, piece in self.placements(rows, heights, shape, rotation, px, py):
+            new_rows, new_heights, cleared = place(rows, heights, piece, x, y)
+            evaluations += 1
+            if next_shape is None:
+                score = self.board_score(new_rows, new_heights, cleared)
+            else:
+                spawn = ROTATIONS[next_shape][0]
+                following = self.best_for(new_rows, new_heights, next_shape, 0,
+                                          spawn.spawn_x, 0)
+                if following is None:
+                    score = TOP_OUT_PENALTY * 10
+                else:
+                    score = self.weights["lines"] * cleared + following[0]
+            if best is None or score > best[0]:
+                best = (score, r, x)
+        self.evaluations += evaluations
+        return best
+
+    def search(self):
+        # Plano para o estado atual do engine, ou None
+        engine = self.engine
+        if engine.game_over or engine.piece is None:
+            return None
+        start = time.perf_counter()
+        rows, heights = engine.rows, engine.heights
+        upcoming = engine.next_pieces[0] if engine.next_pieces else None
+        next_shape = upcoming if self.lookahead else None
+
+        best = self.best_for(rows, heights, engine.current_shape, engine.rotation,
+                             engine.piece_x, engine.piece_y, next_shape)
+        plan = None if best is None else (best[0], False, best[1], best[2])
+
+        if self.use_hold and not engine.hold_used:
+            # Trocar pelo hold (ou, se vazio, pela próxima peça)
+            other = engine.hold_piece or upcoming
+            if other is not None and other != engine.current_shape:
+                spawn = ROTATIONS[other][0]
+                if engine.hold_piece is None:
+                    after = engine.next_pieces[1] if len(engine.next_pieces) > 1 else None
+                else:
+                    after = upcoming
+                held = self.best_for(rows, heights, other, 0, spawn.spawn_x, 0,
+                                     after if self.lookahead else None)
+                if held is not None and (plan is None or held[0] > plan[0]):
+                    plan = (held[0], True, held[1], held[2])
+
+        self.search_time += time.perf_counter() - start
+        return None if plan is None else plan[1:]
+
+    def rate(self):
+        # Posições avaliadas por segundo de busca
+        return self.evaluations / self.search_time if self.search_time else 0.0
+
+    # ------------------------------------------------------------------
+    # Execução
+    # ------------------------------------------------------------------
+    def invalidate(self):
+        self.plan = None
+
+    def next_action(self):
+        engine = self.engine
+        if engine.game_over or engine.piece is None:
+            return ACTION_NONE
+        key = (engine.pieces_placed, engine.hold_used, engine.current_shape)
+        if self.plan is None or key != self.plan_key:
+            self.plan = self.search()
+            self.plan_key = key
+        if self.plan is None:
+            return ACTION_DROP
+
+        hold, rotation, x = self.plan
+        if hold:
+            return ACTION_HOLD
+        if engine.rotation != rotation:
+            return ACTION_ROTATE
+        if engine.piece_x > x:
+            return ACTION_LEFT
+        if engine.piece_x < x:
+            return ACTION_RIGHT
+        return ACTION_DROP
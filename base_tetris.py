@@ -1,25 +1,137 @@
+import time
+STARTUP_TIME = time.perf_counter()  # Origem do relatório de inicialização
+
+import os
 import pygame
 import random
-import threading
-import time
 import sys
-
-# Tamanho do tabuleiro e blocos
-BOARD_WIDTH = 10
-BOARD_HEIGHT = 22
+from collections import OrderedDict
+
+from assets import AssetLoader
+from autoplay import AutoPlayer
+from finesse import FinesseAnalyzer, FinesseTracker
+from gravity import GravityScheduler
+from input_handler import InputHandler
+from music import MUSIC_END, MusicPlayer
+from particles import ParticleSystem
+from profiler import FrameProfiler, StartupTimer
+from replay import Replay, ReplayPlayer, ReplayRecorder
+from simulation import Simulation
+from solver import PuzzleJob, Solver, engine_state
+from sound import PROBE_EVENT, SoundEffects
+from tetris_engine import (BOARD_WIDTH, BOARD_HEIGHT, SHAPES, ROTATIONS, TetrisEngine,
+                           ACTION_LEFT, ACTION_RIGHT, ACTION_DOWN,
+                           ACTION_ROTATE, ACTION_DROP, ACTION_HOLD)
+
+# Tamanho dos blocos
 BLOCK_SIZE = 30
 PANEL_HEIGHT = 60  # Painel superior aumentado
 FOOTER_HEIGHT = 80  # Espaço para exibir controles abaixo do tabuleiro
 SIDEBAR_WIDTH = 150  # Largura para hold e preview
+FRAME_TIME = 1 / 60  # Duração de um quadro (60 FPS)
+IDLE_FRAME_TIME = 1 / 4  # Quadros por segundo com a janela sem foco
+IDLE_WAKE = 1.0  # Espera máxima quando nada está agendado
+IDLE_POLL = 0.02  # Intervalo entre olhadas na fila de eventos quando ocioso
+REPLAY_DIR = './replays'  # Onde as partidas são gravadas
+PROFILE_DIR = './profiles'  # Medições por fase do quadro (F3)
+AUTOPLAY_DELAY = 0.05  # Intervalo entre as ações do jogador automático
+AUTOPLAY_RESTART = 3  # Segundos até recomeçar sozinho depois do game over
+HINT_BUDGET = 0.3  # Segundos de busca da dica de perfect clear (tecla H)
 
 # Área total do jogo
 GAME_WIDTH = BOARD_WIDTH * BLOCK_SIZE + 2 * SIDEBAR_WIDTH
 GAME_HEIGHT = BOARD_HEIGHT * BLOCK_SIZE + PANEL_HEIGHT + FOOTER_HEIGHT
 
-pygame.init()
-FONT = pygame.font.SysFont('Arial', 18)
-LARGE_FONT = pygame.font.SysFont('Arial', 24, bold=True)
-TITLE_FONT = pygame.font.SysFont('Arial', 36, bold=True)
+# Os subsistemas do pygame são iniciados no primeiro uso (vídeo ao abrir a
+# janela, fontes na primeira fonte, áudio na thread de carga), e não todos
+# juntos na importação
+STARTUP = StartupTimer(STARTUP_TIME)
+STARTUP.lap('imports')
+
+# Registro de fontes: SysFont faz uma busca nas fontes do sistema a cada
+# chamada, então cada (nome, tamanho, negrito) é criada uma única vez
+FONTS = {}
+
+
+def get_font(name, size, bold=False):
+    key = (name, size, bold)
+    font = FONTS.get(key)
+    if font is None:
+        if not pygame.font.get_init():
+            pygame.font.init()
+        font = pygame.font.SysFont(name, size, bold=bold)
+        FONTS[key] = font
+    return font
+
+
+class LazyFont:
+    # Fonte do módulo criada só quando é usada pela primeira vez; repassa
+    # tudo (render, size, get_height...) para a fonte do registro
+    def __init__(self, name, size, bold=False):
+        self.key = (name, size, bold)
+
+    def __getattr__(self, attr):
+        return getattr(get_font(*self.key), attr)
+
+
+class TextCache:
+    # Textos já renderizados, chaveados por (fonte, texto, cor, antialias) e
+    # limitados por LRU. hits/misses mostram se um quadro estável ainda
+    # renderiza algum texto.
+    def __init__(self, max_size=256):
+        self.max_size = max_size
+        self.surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font, text, antialias, color):
+        key = (font, text, tuple(color), antialias)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.max_size:
+            self.surfaces.popitem(last=False)
+        return surface
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "size": len(self.surfaces)}
+
+
+TEXT_CACHE = TextCache()
+
+FONT = LazyFont('Arial', 18)
+LARGE_FONT = LazyFont('Arial', 24, bold=True)
+TITLE_FONT = LazyFont('Arial', 36, bold=True)
+HUD_FONT = LazyFont('Courier New', 14)  # Monoespaçada, para o HUD de tempos
+
+# Regiões do quadro do jogo
+GAME_RECT = pygame.Rect(0, 0, GAME_WIDTH, GAME_HEIGHT)
+PANEL_RECT = pygame.Rect(0, 0, GAME_WIDTH, PANEL_HEIGHT)
+BOARD_RECT = pygame.Rect(SIDEBAR_WIDTH, PANEL_HEIGHT,
+                         BOARD_WIDTH * BLOCK_SIZE, BOARD_HEIGHT * BLOCK_SIZE)
+HOLD_RECT = pygame.Rect(0, PANEL_HEIGHT, SIDEBAR_WIDTH, BOARD_HEIGHT * BLOCK_SIZE)
+NEXT_RECT = pygame.Rect(GAME_WIDTH - SIDEBAR_WIDTH, PANEL_HEIGHT,
+                        SIDEBAR_WIDTH, BOARD_HEIGHT * BLOCK_SIZE)
+FOOTER_RECT = pygame.Rect(0, PANEL_HEIGHT + BOARD_HEIGHT * BLOCK_SIZE, GAME_WIDTH, FOOTER_HEIGHT)
+PLAY_RECT = pygame.Rect(0, 0, GAME_WIDTH, FOOTER_RECT.y)
+
+# Sons carregados em segundo plano: nome -> (arquivo, volume, categoria)
+SOUNDS = {
+    'menu_move': ('./Sons/menu_move.wav', 0.5, 'ui'),
+    'menu_select': ('./Sons/menu_select.wav', 0.5, 'ui'),
+    'encaixe': ('./Sons/encaixe.wav', 0.5, 'lock'),
+    'linha': ('./Sons/clear.wav', 0.7, 'clear'),
+    'rotate': ('./Sons/rotate.wav', 0.3, 'action'),
+    'move': ('./Sons/move.wav', 0.2, 'move'),
+    'hold': ('./Sons/hold.wav', 0.4, 'action'),
+}
+MENU_MUSIC = './Sons/menu_music.wav'
 
 # Cores modernizadas
 COLORS = {
@@ -38,48 +150,129 @@ COLORS = {
     'highlight': (255, 255, 255, 50)  # Destaque de linha
 }
 
-# Formatos das peças (mesmo do original)
-SHAPES = {
-    'I': [[1, 1, 1, 1]],
-    'O': [[1, 1],
-          [1, 1]],
-    'T': [[0, 1, 0],
-          [1, 1, 1]],
-    'S': [[0, 1, 1],
-          [1, 1, 0]],
-    'Z': [[1, 1, 0],
-          [0, 1, 1]],
-    'J': [[1, 0, 0],
-          [1, 1, 1]],
-    'L': [[0, 0, 1],
-          [1, 1, 1]]
-}
 
+class BlockAtlas:
+    # Blocos pré-desenhados, um por (cor, tamanho, is_current). Cada sprite é
+    # desenhado uma única vez; trocar o tema (set_theme) descarta todos.
+    def __init__(self, colors):
+        self.colors = colors
+        self.sprites = {}
+
+    def set_theme(self, colors):
+        self.colors = colors
+        self.sprites.clear()
+
+    def get(self, color, size=BLOCK_SIZE, is_current=False):
+        key = (color, size, is_current)
+        sprite = self.sprites.get(key)
+        if sprite is None:
+            sprite = pygame.Surface((size, size), pygame.SRCALPHA)
+            self.render(sprite, 0, 0, color, size, is_current)
+            self.sprites[key] = sprite
+        return sprite
+
+    def render(self, surface, x, y, color, size, is_current):
+        colors = self.colors
+        rect = pygame.Rect(x, y, size, size)
 
-class Particle:
-    def __init__(self, x, y, color):
-        self.x = x
-        self.y = y
-        if isinstance(color, str):
-            self.color = COLORS.get(color, (random.randint(
-                100, 255), random.randint(100, 255), random.randint(100, 255)))
+        if color in colors and color != '':
+            base_color = colors[color]
+            highlight = (
+                min(255, base_color[0] + 40),
+                min(255, base_color[1] + 40),
+                min(255, base_color[2] + 40))
+
+            # Centro mais claro
+            pygame.draw.rect(surface, highlight, rect)
+
+            # Efeito de gradiente simples
+            for i in range(3):
+                border_rect = pygame.Rect(x+i, y+i, size-2*i, size-2*i)
+                color_component = (
+                    base_color[0] + (highlight[0]-base_color[0])*i//3,
+                    base_color[1] + (highlight[1]-base_color[1])*i//3,
+                    base_color[2] + (highlight[2]-base_color[2])*i//3
+                )
+                pygame.draw.rect(surface, color_component, border_rect)
+
+            # Borda
+            pygame.draw.rect(surface, colors['white'], rect, 2)
+
+            # Efeito 3D para peça atual
+            if is_current:
+                pygame.draw.line(surface, (255, 255, 255, 150),
+                                 (x+1, y+1), (x+size-2, y+1), 2)
+                pygame.draw.line(surface, (255, 255, 255, 150),
+                                 (x+1, y+1), (x+1, y+size-2), 2)
         else:
-            self.color = color[:3]
-        # Ajustes: Aumentar o tamanho e a vida útil
-        self.size = random.randint(5, 10)  # Tamanho maior
-        self.speed_x = random.uniform(-3, 3)  # Mais dispersão
-        self.speed_y = random.uniform(-6, -2)  # Mais impulso para cima
-        self.lifetime = random.randint(40, 80)  # Duração maior
-        self.alpha = 255
+            pygame.draw.rect(surface, colors[''], rect)
 
-    def update(self):
-        self.x += self.speed_x
-        self.y += self.speed_y
-        self.lifetime -= 1
-        self.alpha = max(0, self.alpha - 3)  # Fading mais lento
-        # Adicionar uma leve gravidade para que as partículas caiam um pouco
-        self.speed_y += 0.2
-        return self.lifetime > 0 and self.alpha > 0
+
+class MenuSprites:
+    # Sprites da animação do menu: quadrados e tetrominós desenhados uma vez e
+    # rotacionados em passos de ROTATION_STEP graus, mais o título com brilho.
+    # Fica fora do Menu porque o Menu é recriado a cada volta ao menu.
+    ROTATION_STEP = 5
+
+    def __init__(self):
+        self.squares = {}
+        self.pieces = {}
+        self.titles = {}
+
+    def angle(self, rotation, period=360):
+        step = self.ROTATION_STEP
+        return int(rotation // step) * step % period
+
+    def square(self, shape, size, rotation):
+        # Quadrado é simétrico a cada 90 graus; o alpha vem do set_alpha
+        key = (shape, size, self.angle(rotation, 90))
+        sprite = self.squares.get(key)
+        if sprite is None:
+            base = pygame.Surface((size, size), pygame.SRCALPHA)
+            base.fill((*COLORS[shape], 255))
+            sprite = pygame.transform.rotate(base, key[2])
+            self.squares[key] = sprite
+        return sprite
+
+    def piece(self, shape, rotation, block_size=20):
+        key = (shape, self.angle(rotation), block_size)
+        sprite = self.pieces.get(key)
+        if sprite is None:
+            base = self.pieces.get((shape, None, block_size))
+            if base is None:
+                matrix = SHAPES[shape]
+                base = pygame.Surface(
+                    (block_size * len(matrix[0]), block_size * len(matrix)), pygame.SRCALPHA)
+                for i, row in enumerate(matrix):
+                    for j, cell in enumerate(row):
+                        if cell:
+                            pygame.draw.rect(base, (*COLORS[shape], 150),
+                                             (j * block_size, i * block_size, block_size, block_size))
+                self.pieces[(shape, None, block_size)] = base
+            sprite = pygame.transform.rotate(base, key[1])
+            self.pieces[key] = sprite
+        return sprite
+
+    def title(self, font, text):
+        # Título já composto sobre o brilho (uma surface por fonte e texto)
+        key = (id(font), text)
+        cached = self.titles.get(key)
+        if cached is None:
+            title_text = TEXT_CACHE.render(font, text, True, COLORS["white"])
+            width, height = title_text.get_width() + 20, title_text.get_height() + 20
+            glow = pygame.Surface((width, height), pygame.SRCALPHA)
+            pygame.draw.rect(glow, (*COLORS["white"], 30),
+                             (0, 0, width, height), border_radius=10)
+            for i in range(3):
+                pygame.draw.rect(glow, (*COLORS["white"], 10 + i*10),
+                                 (i*5, i*5, width - i*10, height - i*10),
+                                 border_radius=10)
+            glow.blit(title_text, (10, 10))
+            cached = self.titles[key] = glow
+        return cached
+
+
+MENU_SPRITES = MenuSprites()
 
 
 class Menu:
@@ -100,13 +293,14 @@ class Menu:
         self.title = "TETRIS MODERNO"
         self.title_pos_y = -100
         self.title_target_y = 100
-        self.title_font = pygame.font.SysFont('Arial', 72, bold=True)
-        self.button_font = pygame.font.SysFont('Arial', 32)
+        self.title_font = get_font('Arial', 72, bold=True)
+        self.button_font = get_font('Arial', 32)
         self.animation_time = 0
         self.selected_button = 0
         self.transition_alpha = 255
         self.state = "entering"  # "entering", "menu", "exiting"
         self.next_state = None
+        self.overlay = None
         self.initialize_particles()
 
     def initialize_particles(self):
@@ -126,13 +320,15 @@ class Menu:
                 "target_y": random.randint(150, 300)
             })
 
-        # Partículas de fundo
+        # Partículas de fundo: pool fixo, reciclado no lugar
         for _ in range(50):
-            self.add_background_particle()
+            particle = {}
+            self.reset_background_particle(particle)
+            self.background_particles.append(particle)
 
-    def add_background_particle(self):
+    def reset_background_particle(self, particle):
         shape = random.choice(list(SHAPES.keys()))
-        self.background_particles.append({
+        particle.update({
             "x": random.randint(0, self.screen_width),
             "y": random.randint(0, self.screen_height),
             "shape": shape,
@@ -169,8 +365,7 @@ class Menu:
             p["y"] += p["speed"]
             p["rotation"] += p["rotation_speed"]
             if p["y"] > self.screen_height:
-                self.background_particles.remove(p)
-                self.add_background_particle()
+                self.reset_background_particle(p)
 
         # Posicionar botões
         button_start_y = self.screen_height // 2
@@ -188,51 +383,24 @@ class Menu:
         self.surface.fill((0, 0, 0, 0))
 
         # Desenhar partículas de fundo
+        surface = self.surface
         for p in self.background_particles:
-            shape_surf = pygame.Surface(
-                (p["size"], p["size"]), pygame.SRCALPHA)
-            color = COLORS[p["shape"]]
-            pygame.draw.rect(shape_surf, (*color, p["alpha"]),
-                             (0, 0, p["size"], p["size"]))
-            rotated = pygame.transform.rotate(shape_surf, p["rotation"])
-            self.surface.blit(rotated, (p["x"] - rotated.get_width()//2,
-                                        p["y"] - rotated.get_height()//2))
-
-        # Desenhar título
-        title_text = self.title_font.render(self.title, True, COLORS["white"])
-        title_rect = title_text.get_rect(
+            rotated = MENU_SPRITES.square(p["shape"], p["size"], p["rotation"])
+            rotated.set_alpha(p["alpha"])
+            surface.blit(rotated, (p["x"] - rotated.get_width()//2,
+                                   p["y"] - rotated.get_height()//2))
+
+        # Desenhar título (com efeito de brilho já composto)
+        title = MENU_SPRITES.title(self.title_font, self.title)
+        title_rect = title.get_rect(
             center=(self.screen_width//2, self.title_pos_y))
-
-        # Efeito de brilho no título
-        glow = pygame.Surface(
-            (title_rect.width + 20, title_rect.height + 20), pygame.SRCALPHA)
-        pygame.draw.rect(glow, (*COLORS["white"], 30),
-                         (0, 0, glow.get_width(), glow.get_height()), border_radius=10)
-        for i in range(3):
-            pygame.draw.rect(glow, (*COLORS["white"], 10 + i*10),
-                             (i*5, i*5, glow.get_width() -
-                              i*10, glow.get_height()-i*10),
-                             border_radius=10)
-
-        self.surface.blit(glow, (title_rect.x - 10, title_rect.y - 10))
-        self.surface.blit(title_text, title_rect)
+        surface.blit(title, title_rect)
 
         # Desenhar partículas do título
         for p in self.title_particles:
-            block_size = 20
-            shape = SHAPES[p["shape"]]
-            shape_surf = pygame.Surface(
-                (block_size * len(shape[0]), block_size * len(shape)), pygame.SRCALPHA)
-
-            for i, row in enumerate(shape):
-                for j, cell in enumerate(row):
-                    if cell:
-                        pygame.draw.rect(shape_surf, (*COLORS[p["shape"]], 150),
-                                         (j * block_size, i * block_size, block_size, block_size))
-
-            rotated = pygame.transform.rotate(shape_surf, p["rotation"])
-            self.surface.blit(rotated, (p["x"] - rotated.get_width()//2,
-                                        p["y"] - rotated.get_height()//2))
+            rotated = MENU_SPRITES.piece(p["shape"], p["rotation"])
+            surface.blit(rotated, (p["x"] - rotated.get_width()//2,
+                                   p["y"] - rotated.get_height()//2))
 
         # Desenhar botões
         for i, button in enumerate(self.buttons):
@@ -242,24 +410,25 @@ class Menu:
             pygame.draw.rect(
                 self.surface, COLORS["white"], button["rect"], 2, border_radius=10)
 
-            text = self.button_font.render(
-                button["text"], True, COLORS["white"])
+            text = TEXT_CACHE.render(
+                self.button_font, button["text"], True, COLORS["white"])
             text_rect = text.get_rect(center=button["rect"].center)
             self.surface.blit(text, text_rect)
 
         # Adicionar instruções de controle
-        controls_text = FONT.render(
-            "Use SETAS ↑↓ e ENTER para selecionar", True, COLORS["white"])
+        controls_text = TEXT_CACHE.render(
+            FONT, "Use SETAS ↑↓ e ENTER para selecionar", True, COLORS["white"])
         controls_rect = controls_text.get_rect(
             center=(self.screen_width//2, self.screen_height - 50))
         self.surface.blit(controls_text, controls_rect)
 
         # Transição
         if self.state == "exiting":
-            overlay = pygame.Surface(
-                (self.screen_width, self.screen_height), pygame.SRCALPHA)
-            overlay.fill((0, 0, 0, self.transition_alpha))
-            self.surface.blit(overlay, (0, 0))
+            if self.overlay is None:
+                self.overlay = pygame.Surface(
+                    (self.screen_width, self.screen_height), pygame.SRCALPHA)
+            self.overlay.fill((0, 0, 0, self.transition_alpha))
+            self.surface.blit(self.overlay, (0, 0))
 
         screen.blit(self.surface, (0, 0))
 
@@ -270,30 +439,31 @@ class Menu:
                     self.selected_button = (
                         self.selected_button + 1) % len(self.buttons)
                     # Som ao mover para baixo
-                    self.game.play_sound(self.game.sound_menu_move)
+                    self.game.play_sound('menu_move')
                 elif event.key == pygame.K_UP:
                     self.selected_button = (
                         self.selected_button - 1) % len(self.buttons)
                     # Som ao mover para cima
-                    self.game.play_sound(self.game.sound_menu_move)
+                    self.game.play_sound('menu_move')
                 elif event.key == pygame.K_RETURN:
                     # Som ao selecionar
-                    self.game.play_sound(self.game.sound_menu_select)
+                    self.game.play_sound('menu_select')
                     return self.buttons[self.selected_button]["action"]
 
         return None
 
     def start_transition(self, next_state):
         # Som ao iniciar transição
-        self.game.play_sound(self.game.sound_menu_select)
+        self.game.play_sound('menu_select')
         self.state = "exiting"
         self.next_state = next_state
         self.transition_alpha = 0
 
 
 class TetrisGame:
-    def __init__(self):
+    def __init__(self, audio_profile="low", audio=True):
         # Configuração da janela
+        pygame.display.init()
         self.fullscreen = True
         self.display_info = pygame.display.Info()
         self.screen_width = self.display_info.current_w
@@ -301,58 +471,110 @@ class TetrisGame:
         self.screen = pygame.display.set_mode(
             (self.screen_width, self.screen_height), pygame.FULLSCREEN)
         pygame.display.set_caption("Tetris Moderno")
+        STARTUP.lap('display')
 
-        # Superfície onde o jogo é desenhado
-        self.game_surface = pygame.Surface(
-            (GAME_WIDTH, GAME_HEIGHT), pygame.SRCALPHA)
-
-        # Cria tabuleiro vazio
-        self.board = [['' for _ in range(BOARD_WIDTH)]
-                      for _ in range(BOARD_HEIGHT)]
-        self.lock = threading.Semaphore(1)
+        # Áudio, sons e músicas carregam numa thread enquanto o menu aparece
+        self.sound_available = False
+        self.sfx = SoundEffects(audio_profile)
+        self.playlist = ["./Sons/musica1.mp3", "./Sons/musica2.mp3", "./Sons/musica3.mp3"]
+        self.menu_music = MENU_MUSIC
+        self.startup_reported = False
+        self.assets = AssetLoader()
+        # audio=False (exportação de vídeo): o mixer nem abre e nada é carregado
+        if audio:
+            self.load_sounds()
+
+        # Superfície onde o jogo é desenhado e as camadas em cache dela
+        self.game_surface = pygame.Surface((GAME_WIDTH, GAME_HEIGHT))
+        self.blocks = BlockAtlas(COLORS)
+        # Moldura e grade só são feitas no primeiro quadro do jogo (o menu
+        # não as usa)
+        self.chrome = None
+        self.grid_surface = None
+        self.base_surface = pygame.Surface((GAME_WIDTH, GAME_HEIGHT))
+        self.board_layer = pygame.Surface(BOARD_RECT.size)
+        self.ghost_block = pygame.Surface((BLOCK_SIZE, BLOCK_SIZE), pygame.SRCALPHA)
+        self.ghost_block.fill(COLORS['ghost'])
+        self.hint_block = pygame.Surface((BLOCK_SIZE, BLOCK_SIZE), pygame.SRCALPHA)
+        pygame.draw.rect(self.hint_block, COLORS['white'], self.hint_block.get_rect(), 2)
+        self.highlight_row = pygame.Surface(
+            (BOARD_WIDTH * BLOCK_SIZE, BLOCK_SIZE), pygame.SRCALPHA)
+        self.highlight_row.fill(COLORS['highlight'])
+        self.invalidate_layers()
+        STARTUP.lap('layers')
+
+        # Regras do jogo (tabuleiro, peças, pontuação) ficam no engine
+        self.engine = TetrisEngine(listener=self.on_engine_event)
+        # Só a simulação chama o engine: teclado, IA, gravidade e replay
+        # enfileiram comandos, e o desenho lê o último snapshot publicado
+        self.simulation = Simulation(self.engine)
+        self.simulation.on_action = self.record_action
+        self.snapshot = self.simulation.latest()
+        # Gravidade roda no loop principal, com prazos exatos
+        self.gravity = GravityScheduler(self.engine, tick=self.simulation.tick,
+                                        process=self.simulation.process)
+        # Teclado com DAS/ARR e medição da latência até a tela
+        self.input = InputHandler(self.perform, on_press=self.on_press)
+        for key, action in ((pygame.K_LEFT, ACTION_LEFT), (pygame.K_RIGHT, ACTION_RIGHT),
+                            (pygame.K_DOWN, ACTION_DOWN), (pygame.K_UP, ACTION_ROTATE),
+                            (pygame.K_SPACE, ACTION_DROP), (pygame.K_c, ACTION_HOLD)):
+            self.input.bind(key, action)
+        self.pending_events = []
+        # Gravação da partida atual / reprodução de um replay
+        self.recorder = None
+        self.replay_player = None
+        self.replay_reported = False
+        # Tempo por fase do quadro; F3 liga a medição e o HUD
+        self.profiler = FrameProfiler()
+        self.profiler_toggle = False
+        self.profiler_hud = None
+        # Treino de finesse (tecla F ou --finesse): teclas a mais por peça
+        self.finesse = None
+        self.finesse_analyzer = None
+        # Solucionador de perfect clear: dica (tecla H) e quebra-cabeças
+        # (--puzzle). O pool de processos só é criado no primeiro uso
+        self.solver = None
+        self.hint_job = None
+        self.hint_version = None  # board_version do pedido de dica
+        self.hint = None  # (board_version, SolveResult)
+        self.puzzle = None  # (semente, ações de preparação, jogadas que faltam)
+        self.puzzle_job = None  # procura do quebra-cabeça em andamento
+        self.puzzle_locks = 0
+        self.puzzle_solved = False
+        self.banner = None  # "Perfect clear!" até o próximo encaixe
+        # Jogador automático (tecla A ou --autoplay)
+        self.autoplayer = None
+        self.autoplay_next = 0.0
+        # Desenho sob demanda: a tela só é refeita quando algo visível muda
+        self.needs_render = True
+        self.window_focused = True
+        self.window_minimized = False
+        self.last_render = 0.0
+        self.rendered_frames = 0
+        self.idle_frames = 0
 
         # Estado do jogo
-        self.current_shape = None
-        self.current_piece = None
-        self.piece_x = 0
-        self.piece_y = 0
         self.running = False  # Inicia como False, só começa quando selecionado no menu
         self.paused = False
         self.game_state = "menu"  # Começa no menu
-        self.score = 0
-        self.level = 1
-        self.lines_cleared = 0
-        self.hold_piece = None
-        self.hold_used = False
-        self.next_pieces = [random.choice(list(SHAPES.keys())) for _ in range(3)]
 
         # Efeitos visuais
         self.clear_effect = None
         self.clear_effect_time = 0
         self.rotate_angle = 0
         self.rotate_direction = 1
-        self.particles = []
+        self.particles = None  # Criado no primeiro jogo (o menu não usa)
 
-        # Tempo e música
-        self.start_time = time.time()
+        # Tempo e música. clock é o relógio do jogo (painel, efeitos, pausa);
+        # a exportação de vídeo troca pelo tempo do vídeo
+        self.clock = time.time
+        self.start_time = self.clock()
         self.elapsed_time = 0
         self.game_over_time = None
         self.pause_start_time = None
         self.total_pause_duration = 0
 
-        # Configurações de áudio
-        pygame.mixer.pre_init(frequency=44100, size=-16, channels=2, buffer=4096)
-        try:
-            pygame.mixer.init()
-            self.sound_available = True
-        except pygame.error:
-            print("Áudio indisponível.")
-            self.sound_available = False
-
-        # Playlist de músicas
-        self.playlist = ["./Sons/musica1.mp3", "./Sons/musica2.mp3", "./Sons/musica3.mp3"]
-        self.current_song_index = 0
-        self.skip_song = False
+        # Música pausada pela tecla M
         self.music_paused = False
 
         # Volumes
@@ -360,455 +582,269 @@ class TetrisGame:
         self.menu_music_volume = 1.0 * self.master_volume
         self.game_music_volume = 0.7 * self.master_volume
         self.music_volume = self.menu_music_volume * self.master_volume
-
-        # Carrega os sons
-        self.load_sounds()
+        # Playlist guiada pelos eventos de fim de faixa do mixer
+        self.music = MusicPlayer(self.menu_music, self.playlist,
+                                 self.menu_music_volume, self.game_music_volume)
+        self.music.switch("menu")
+        STARTUP.lap('game')
 
         # Menu
         self.menu = Menu(self.screen_width, self.screen_height, self)
-
-        # Threads
-        threading.Thread(target=self.gravity_thread, daemon=True).start()
-        threading.Thread(target=self.music_thread, daemon=True).start()
+        STARTUP.lap('menu')
 
     def load_sounds(self):
-        try:
-            self.sound_menu_move = pygame.mixer.Sound('./Sons/menu_move.wav')
-            self.sound_menu_move.set_volume(0.5)
-        except Exception as e:
-            print('Erro ao carregar menu_move.wav:', e)
-            self.sound_menu_move = None
-
-        try:
-            self.sound_menu_select = pygame.mixer.Sound('./Sons/menu_select.wav')
-            self.sound_menu_select.set_volume(0.5)
-        except Exception as e:
-            print('Erro ao carregar menu_select.wav:', e)
-            self.sound_menu_select = None
-
-        try:
-            self.menu_music = './Sons/menu_music.wav'
-            pygame.mixer.music.load(self.menu_music)
-            pygame.mixer.music.set_volume(self.menu_music_volume)
-        except Exception as e:
-            print('Erro ao carregar menu_music.wav:', e)
-            self.menu_music = None
-
-        try:
-            self.sound_encaixe = pygame.mixer.Sound('./Sons/encaixe.wav')
-            self.sound_encaixe.set_volume(0.5)
-        except Exception as e:
-            print('Erro ao carregar encaixe.wav:', e)
-            self.sound_encaixe = None
-
-        try:
-            self.sound_linha = pygame.mixer.Sound('./Sons/clear.wav')
-            self.sound_linha.set_volume(0.7)
-        except Exception as e:
-            print('Erro ao carregar clear.wav:', e)
-            self.sound_linha = None
+        # Pedidos em ordem: o mixer primeiro, depois os sons e as músicas
+        self.assets.submit('audio', self.init_audio)
+        self.submit_sounds()
+        self.assets.submit('music', self.read_music, [self.menu_music] + self.playlist)
 
-        try:
-            self.sound_rotate = pygame.mixer.Sound('./Sons/rotate.wav')
-            self.sound_rotate.set_volume(0.3)
-        except Exception as e:
-            print('Erro ao carregar rotate.wav:', e)
-            self.sound_rotate = None
+    def submit_sounds(self):
+        for name, (path, volume, category) in SOUNDS.items():
+            self.assets.submit(name, self.load_sound, name, path, volume, category)
 
-        try:
-            self.sound_move = pygame.mixer.Sound('./Sons/move.wav')
-            self.sound_move.set_volume(0.2)
-        except Exception as e:
-            print('Erro ao carregar move.wav:', e)
-            self.sound_move = None
+    def init_audio(self):
+        # Mixer no perfil de latência pedido (ou no primeiro que abrir)
+        self.sound_available = self.sfx.open()
+        return self.sound_available
 
+    def load_sound(self, name, path, volume, category):
         try:
-            self.sound_hold = pygame.mixer.Sound('./Sons/hold.wav')
-            self.sound_hold.set_volume(0.4)
+            return self.sfx.load(name, path, volume, category)
         except Exception as e:
-            print('Erro ao carregar hold.wav:', e)
-            self.sound_hold = None
-
-    def play_sound(self, sound):
-        if self.sound_available and sound:
+            print(f'Erro ao carregar {os.path.basename(path)}:', e)
+            return None
+
+    def reopen_audio(self):
+        # Underruns demais: mixer de novo com buffer maior, e sons e música
+        # carregados outra vez
+        self.sound_available = self.sfx.reopen()
+        if self.sound_available:
+            self.submit_sounds()
+            if self.music.available:
+                self.music.attach(self.assets.get('music', {}))
+
+    def read_music(self, paths):
+        # Lê os arquivos de música para a memória: trocar de faixa não espera
+        # o disco
+        data = {}
+        for path in paths:
+            try:
+                with open(path, 'rb') as f:
+                    data[path] = f.read()
+            except Exception as e:
+                print(f'Erro ao carregar {os.path.basename(path)}:', e)
+        return data
+
+    def update_startup(self):
+        # Até tudo carregar: entrega as músicas ao player quando chegam e, com
+        # todos os pedidos prontos, mostra o relatório de inicialização
+        if not self.music.available and self.sound_available and self.assets.ready('music'):
+            self.music.attach(self.assets.get('music', {}))
+        if self.assets.ready() and 'primeiro quadro' in STARTUP.marks:
+            STARTUP.mark('interativo')
+            print('Inicialização:', STARTUP.report(self.assets.times))
+            self.startup_reported = True
+
+    def play_sound(self, name):
+        if self.sound_available:
             try:
-                sound.play()
+                self.sfx.play(name)
             except:
                 pass
 
-    def music_thread(self):
-        while True:
-            try:
-                if not hasattr(self, 'playlist') or not self.playlist:
-                    time.sleep(1)
-                    continue
-
-                # Verifica se estamos no menu ou no jogo para definir o volume
-                if self.game_state == "menu":
-                    pygame.mixer.music.set_volume(self.menu_music_volume)
-                else:
-                    pygame.mixer.music.set_volume(self.game_music_volume)
-
-                # Carrega e toca a música atual
-                pygame.mixer.music.load(self.playlist[self.current_song_index])
-                pygame.mixer.music.play()
-            except Exception as e:
-                print(f"Erro ao tocar música: {e}")
-                time.sleep(2)
-                continue
-
-            # Aguarda a música terminar ou ser interrompida
-            while True:
-                if self.skip_song:
-                    pygame.mixer.music.stop()
-                    self.skip_song = False
-                    break
-                if not pygame.mixer.music.get_busy() and not self.music_paused:
-                    break
-                time.sleep(0.1)
-
-            # Avança para a próxima música
-            if hasattr(self, 'playlist') and self.playlist:
-                self.current_song_index = (self.current_song_index + 1) % len(self.playlist)
-
-    def spawn_piece(self):
-        try:
-            while len(self.next_pieces) < 3:
-                self.next_pieces.append(random.choice(list(SHAPES.keys())))
-
-            self.current_shape = self.next_pieces.pop(0)
-            self.current_piece = [row[:] for row in SHAPES[self.current_shape]]
-            self.piece_x = BOARD_WIDTH // 2 - len(self.current_piece[0]) // 2
-            self.piece_y = 0
-            self.hold_used = False
-            self.rotate_angle = 0
-            self.last_move_time = time.time()
-
-            if not self.valid_position(self.piece_x, self.piece_y, self.current_piece):
-                self.running = False
-                self.game_over_time = time.time()
-                self.current_piece = None
-                self.current_shape = None
-                return False
-            return True
-        except Exception as e:
-            print("Erro ao gerar peça:", e)
-            return False
-
-    def draw_block(self, surface, x, y, color, size=BLOCK_SIZE, is_current=False):
-        rect = pygame.Rect(x, y, size, size)
-        
-        if color in COLORS and color != '':
-            base_color = COLORS[color]
-            highlight = (
-                min(255, base_color[0] + 40),
-                min(255, base_color[1] + 40),
-                min(255, base_color[2] + 40))
-            shadow = (
-                max(0, base_color[0] - 40),
-                max(0, base_color[1] - 40),
-                max(0, base_color[2] - 40))
-
-            # Centro mais claro
-            pygame.draw.rect(surface, highlight, rect)
-
-            # Efeito de gradiente simples
-            for i in range(3):
-                border_rect = pygame.Rect(x+i, y+i, size-2*i, size-2*i)
-                color_component = (
-                    base_color[0] + (highlight[0]-base_color[0])*i//3,
-                    base_color[1] + (highlight[1]-base_color[1])*i//3,
-                    base_color[2] + (highlight[2]-base_color[2])*i//3
-                )
-                pygame.draw.rect(surface, color_component, border_rect)
-
-            # Borda
-            pygame.draw.rect(surface, COLORS['white'], rect, 2)
-
-            # Efeito 3D para peça atual
-            if is_current:
-                pygame.draw.line(surface, (255, 255, 255, 150),
-                                 (x+1, y+1), (x+size-2, y+1), 2)
-                pygame.draw.line(surface, (255, 255, 255, 150),
-                                 (x+1, y+1), (x+1, y+size-2), 2)
-        else:
-            pygame.draw.rect(surface, COLORS[''], rect)
-
-    def get_ghost_y(self):
-        if self.current_piece is None:
-            return 0
-
-        ghost_y = self.piece_y
-        while self.valid_position(self.piece_x, ghost_y + 1, self.current_piece):
-            ghost_y += 1
-        return ghost_y
-
-    def valid_position(self, x, y, shape):
-        if shape is None:
-            return False
-
-        for i, row in enumerate(shape):
-            for j, cell in enumerate(row):
-                if cell:
-                    nx, ny = x + j, y + i
-                    if nx < 0 or nx >= BOARD_WIDTH or ny < 0 or ny >= BOARD_HEIGHT:
-                        return False
-                    if self.board[ny][nx]:
-                        return False
-        return True
-
-    def move(self, dx, dy):
-        if not self.running or self.paused or self.current_piece is None:
-            return False
-
-        new_x = self.piece_x + dx
-        new_y = self.piece_y + dy
-        if self.valid_position(new_x, new_y, self.current_piece):
-            self.piece_x = new_x
-            self.piece_y = new_y
-            if dx != 0 or dy != 0:
-                self.play_sound(self.sound_move)
-            return True
-        return False
-
-    def rotate(self):
-        if not self.running or self.paused:
-            return
-        rotated = list(zip(*self.current_piece[::-1]))
-        rotated = [list(row) for row in rotated]
-        if self.valid_position(self.piece_x, self.piece_y, rotated):
-            self.current_piece = rotated
+    def on_engine_event(self, event, **data):
+        # Efeitos de som e visuais disparados pelas regras do engine
+        self.needs_render = True
+        # A peça mudou: teclas seguradas que encostaram voltam a repetir
+        self.input.unblock()
+        if self.finesse is not None:
+            if event in ("spawn", "hold"):
+                self.finesse.spawn()
+            elif event == "lock":
+                self.finesse.lock(self.engine)
+        if event == "move":
+            self.play_sound('move')
+        elif event == "rotate":
             self.rotate_angle = 15 * self.rotate_direction
             self.rotate_direction *= -1
-            self.play_sound(self.sound_rotate)
-
-    def hold_current_piece(self):
-        if self.hold_used:
+            self.play_sound('rotate')
+        elif event == "hold":
+            self.play_sound('hold')
+        elif event == "spawn":
+            self.rotate_angle = 0
+        elif event == "lock":
+            self.banner = None
+            self.puzzle_locks += 1
+            self.play_sound('encaixe')
+        elif event == "clear":
+            # Partículas nas células removidas
+            for x, y, shape in data["cells"]:
+                color = COLORS.get(shape, (random.randint(
+                    100, 255), random.randint(100, 255), random.randint(100, 255)))
+                px = SIDEBAR_WIDTH + x * BLOCK_SIZE + BLOCK_SIZE//2
+                py = PANEL_HEIGHT + y * BLOCK_SIZE + BLOCK_SIZE//2
+                # Aumentado de 3 para 5 partículas por bloco
+                self.particles.emit(px, py, color, 5)
+
+            self.clear_effect = data["rows"]
+            self.clear_effect_time = self.clock()
+            self.play_sound('linha')
+            if not any(self.engine.rows):
+                self.banner = "Perfect clear!"
+                self.puzzle_solved = self.puzzle is not None
+        elif event == "game_over":
+            self.running = False
+            self.game_over_time = self.clock()
+            self.save_replay()
+
+    def perform(self, action, on_result=None):
+        # A ação só entra na fila; o engine a aplica em simulation.process()
+        if not self.running or self.paused or self.replay_player is not None:
+            return False
+        return self.simulation.step(action, on_result)
+
+    def on_press(self, action):
+        # Tecla pressionada (sem as repetições): conta para o finesse na
+        # ordem em que as ações são aplicadas
+        if (self.finesse is not None and self.running and not self.paused and
+                self.replay_player is None):
+            self.simulation.call(self.finesse.press, action)
+
+    def record_action(self, action):
+        # Gravada na ordem em que é aplicada, entre as quedas da fila
+        if self.recorder is not None:
+            self.recorder.record(action)
+
+    def save_replay(self):
+        if self.recorder is None:
             return
-
-        self.play_sound(self.sound_hold)
-        if self.hold_piece is None:
-            self.hold_piece = self.current_shape
-            self.spawn_piece()
-        else:
-            self.hold_piece, self.current_shape = self.current_shape, self.hold_piece
-            self.current_piece = [row[:] for row in SHAPES[self.current_shape]]
-            self.piece_x = BOARD_WIDTH // 2 - len(self.current_piece[0]) // 2
-            self.piece_y = 0
-        self.hold_used = True
-
-    def freeze_piece(self):
-        if self.current_piece is None:
+        replay = self.recorder.finish()
+        self.recorder = None
+        if not replay.events:
             return
+        try:
+            os.makedirs(REPLAY_DIR, exist_ok=True)
+            path = os.path.join(
+                REPLAY_DIR, f"{time.strftime('%Y%m%d-%H%M%S')}-{replay.seed}.trp")
+            replay.save(path)
+            print('Replay salvo em', path)
+        except OSError as e:
+            print('Erro ao salvar replay:', e)
+
+    def start_replay(self, path):
+        # Abre um replay e o reproduz na velocidade normal
+        try:
+            replay = Replay.load(path)
+        except (OSError, ValueError) as e:
+            print('Erro ao carregar replay:', e)
+            return False
+        self.__init_game(replay)
+        return True
 
-        for i, row in enumerate(self.current_piece):
-            for j, cell in enumerate(row):
-                if cell:
-                    self.board[self.piece_y + i][self.piece_x + j] = self.current_shape
-        self.play_sound(self.sound_encaixe)
-
-    def clear_lines(self):
-        lines_cleared = []
-        new_board = []
-
-        # Identifica linhas completas
-        for i, row in enumerate(self.board):
-            if all(cell != '' for cell in row):
-                lines_cleared.append(i)
-            else:
-                new_board.append(row)
-
-        # Cria partículas ANTES de modificar o tabuleiro
-        if lines_cleared:
-            for y in lines_cleared:
-                for x in range(BOARD_WIDTH):
-                    if self.board[y][x]:
-                        color = COLORS.get(self.board[y][x], (random.randint(
-                            100, 255), random.randint(100, 255), random.randint(100, 255)))
-                        for _ in range(5):  # Aumentado de 3 para 5 partículas por bloco
-                            px = SIDEBAR_WIDTH + x * BLOCK_SIZE + BLOCK_SIZE//2
-                            py = PANEL_HEIGHT + y * BLOCK_SIZE + BLOCK_SIZE//2
-                            self.particles.append(Particle(px, py, color))
-
-            self.clear_effect = lines_cleared
-            self.clear_effect_time = time.time()
-            self.lines_cleared += len(lines_cleared)
-            self.update_level()
-
-            # Adiciona linhas vazias no topo para substituir as linhas limpas
-            lines_to_add = len(lines_cleared)
-            for _ in range(lines_to_add):
-                new_board.insert(0, ['' for _ in range(BOARD_WIDTH)])
-
-            # Atualiza o tabuleiro com as novas linhas
-            self.board = new_board
-
-            # Sistema de pontuação
-            if len(lines_cleared) == 1:
-                self.score += 100 * self.level
-            elif len(lines_cleared) == 2:
-                self.score += 300 * self.level
-            elif len(lines_cleared) == 3:
-                self.score += 500 * self.level
-            elif len(lines_cleared) == 4:
-                self.score += 800 * self.level
-
-            self.play_sound(self.sound_linha)
-
-    def update_level(self):
-        self.level = 1 + self.lines_cleared // 10
-
-    def gravity_thread(self):
-        while True:
-            if not self.running:
-                time.sleep(0.1)
-                continue
-
-            if self.paused:
-                time.sleep(0.1)
-                continue
-
-            with self.lock:
-                gravity_delay = max(0.05, 0.8 - (self.level * 0.07))
-                time.sleep(gravity_delay)
-
-                # Verifica novamente se o jogo não foi pausado nesse intervalo
-                if self.paused or not self.running:
-                    continue
-
-                if not self.move(0, 1):
-                    self.freeze_piece()
-                    self.clear_lines()
-                    self.spawn_piece()
+    def draw_block(self, surface, x, y, color, size=BLOCK_SIZE, is_current=False):
+        surface.blit(self.blocks.get(color, size, is_current), (x, y))
 
-    def draw_piece_preview(self, shape, x, y, scale=1.0):
-        if shape not in SHAPES:
+    def draw_piece_preview(self, surface, shape, x, y, scale=1.0):
+        if shape not in ROTATIONS:
             return
 
-        piece = SHAPES[shape]
+        piece = ROTATIONS[shape][0]
         block_size = int(BLOCK_SIZE * scale * 0.8)
+        sprite = self.blocks.get(shape, block_size)
+
+        surface.blits(
+            [(sprite, (x + j * block_size, y + i * block_size)) for j, i in piece.cells],
+            doreturn=False)
+
+    # ------------------------------------------------------------------
+    # Camadas do quadro do jogo:
+    #   chrome   fundo, painéis, bordas, grade vazia e rodapé (fixo)
+    #   base     chrome + HUD (textos, hold/next) + tabuleiro assentado;
+    #            cada parte só é redesenhada quando sua chave muda
+    #   dinâmica sombra, peça atual e partículas, redesenhadas sobre a base
+    #            apenas nos retângulos sujos
+    #   overlay  pausa / game over, guardado pronto enquanto não muda
+    # ------------------------------------------------------------------
+    def invalidate_layers(self):
+        self.layer_keys = {}
+        self.dynamic_key = None
+        self.dynamic_rects = []
+        self.overlay = None
+        self.full_redraw = True
+
+    def build_chrome(self):
+        chrome = pygame.Surface((GAME_WIDTH, GAME_HEIGHT), pygame.SRCALPHA)
+        chrome.fill(COLORS[''])
 
-        for i, row in enumerate(piece):
-            for j, cell in enumerate(row):
-                if cell:
-                    block_x = x + j * block_size
-                    block_y = y + i * block_size
-                    self.draw_block(self.game_surface, block_x, block_y, shape, block_size)
-
-    def draw_sidebar(self):
-        # Fundo da sidebar
-        sidebar_rect = pygame.Rect(
-            0, PANEL_HEIGHT, SIDEBAR_WIDTH, BOARD_HEIGHT * BLOCK_SIZE)
-        pygame.draw.rect(self.game_surface, COLORS['panel'], sidebar_rect)
-        pygame.draw.rect(self.game_surface, COLORS['violeta'], sidebar_rect, 3)
-
-        # Hold piece
-        hold_text = LARGE_FONT.render("GUARDAR", True, COLORS['white'])
-        self.game_surface.blit(
-            hold_text, (SIDEBAR_WIDTH//2 - hold_text.get_width()//2, PANEL_HEIGHT + 10))
-
-        if self.hold_piece:
-            # Centraliza a peça hold
-            hold_piece_width = len(SHAPES[self.hold_piece][0])
-            hold_x = SIDEBAR_WIDTH//2 - (hold_piece_width * BLOCK_SIZE)//2
-            self.draw_piece_preview(self.hold_piece, hold_x, PANEL_HEIGHT + 50)
-
-        # Next pieces
-        next_text = LARGE_FONT.render("NEXT", True, COLORS['white'])
-        self.game_surface.blit(next_text, (GAME_WIDTH - SIDEBAR_WIDTH //
-                               2 - next_text.get_width()//2, PANEL_HEIGHT + 10))
-
-        # Garante que temos pelo menos 3 próximas peças para mostrar
-        next_pieces_to_show = self.next_pieces[:3]
-        for i, piece in enumerate(next_pieces_to_show):
-            # Centraliza cada peça next
-            piece_width = len(SHAPES[piece][0])
-            next_x = GAME_WIDTH - SIDEBAR_WIDTH//2 - \
-                (piece_width * BLOCK_SIZE)//2
-            self.draw_piece_preview(piece, next_x, PANEL_HEIGHT + 50 + i * 100)
-
-    def draw_panel(self):
         # Painel superior com gradiente
-        panel_rect = pygame.Rect(0, 0, GAME_WIDTH, PANEL_HEIGHT)
-        pygame.draw.rect(self.game_surface, COLORS['panel'], panel_rect)
+        pygame.draw.rect(chrome, COLORS['panel'], PANEL_RECT)
 
         # Gradiente
         for i in range(PANEL_HEIGHT):
             alpha = 255 * (1 - i/PANEL_HEIGHT)
             line_rect = pygame.Rect(0, i, GAME_WIDTH, 1)
-            pygame.draw.rect(self.game_surface,
-                             (138, 43, 226, alpha), line_rect)
+            pygame.draw.rect(chrome, (138, 43, 226, alpha), line_rect)
 
         # Bordas
-        pygame.draw.rect(self.game_surface, COLORS['violeta'], panel_rect, 3)
-        pygame.draw.line(self.game_surface, (200, 200, 200),
+        pygame.draw.rect(chrome, COLORS['violeta'], PANEL_RECT, 3)
+        pygame.draw.line(chrome, (200, 200, 200),
                          (0, PANEL_HEIGHT-1), (GAME_WIDTH, PANEL_HEIGHT-1), 2)
 
-        # Informações
-        time_text = FONT.render(
-            f"Tempo: {self.elapsed_time//60:02d}:{self.elapsed_time % 60:02d}", True, COLORS['white'])
-        score_text = FONT.render(
-            f"Pontos: {self.score}", True, COLORS['white'])
-        level_text = FONT.render(f"Nível: {self.level}", True, COLORS['white'])
-        lines_text = FONT.render(
-            f"Linhas: {self.lines_cleared}", True, COLORS['white'])
-
-        # Barra de progresso do nível
-        level_progress = self.lines_cleared % 10
-        pygame.draw.rect(self.game_surface, (80, 80, 100),
-                         (10, PANEL_HEIGHT-15, 100, 8))
-        pygame.draw.rect(
-            self.game_surface, COLORS['I'], (10, PANEL_HEIGHT-15, level_progress * 10, 8))
+        # Fundo da sidebar
+        pygame.draw.rect(chrome, COLORS['panel'], HOLD_RECT)
+        pygame.draw.rect(chrome, COLORS['violeta'], HOLD_RECT, 3)
 
-        self.game_surface.blit(time_text, (10, 10))
-        self.game_surface.blit(score_text, (10, 30))
-        self.game_surface.blit(
-            level_text, (GAME_WIDTH//2 - level_text.get_width()//2, 10))
-        self.game_surface.blit(
-            lines_text, (GAME_WIDTH - lines_text.get_width() - 10, 10))
+        hold_text = TEXT_CACHE.render(LARGE_FONT, "GUARDAR", True, COLORS['white'])
+        chrome.blit(
+            hold_text, (SIDEBAR_WIDTH//2 - hold_text.get_width()//2, PANEL_HEIGHT + 10))
+        next_text = TEXT_CACHE.render(LARGE_FONT, "NEXT", True, COLORS['white'])
+        chrome.blit(next_text, (GAME_WIDTH - SIDEBAR_WIDTH //
+                                2 - next_text.get_width()//2, PANEL_HEIGHT + 10))
 
-    def draw_board(self):
-        if self.running:
-            self.elapsed_time = int(
-                time.time() - self.start_time - self.total_pause_duration)
-        elif self.game_over_time is not None:
-            self.elapsed_time = int(
-                self.game_over_time - self.start_time - self.total_pause_duration)
+        # Rodapé com controles
+        pygame.draw.rect(chrome, COLORS['panel'], FOOTER_RECT)
+        pygame.draw.rect(chrome, COLORS['violeta'], FOOTER_RECT, 3)
 
-        # Fundo do jogo
-        self.game_surface.fill(COLORS[''])
+        # Ícones e textos de controles, em duas linhas de colunas iguais
+        controls = [
+            ("← →", "Mover"),
+            ("↑", "Girar"),
+            ("↓", "Cair"),
+            ("Space", "Drop"),
+            ("C", "Guardar"),
+            ("P", "Pausa"),
+            ("M", "Mudo"),
+            ("N", "Música"),
+            ("A", "Automático"),
+            ("F", "Finesse"),
+            ("H", "Dica"),
+            ("R", "Reiniciar"),
+            ("F3", "Desempenho"),
+            ("ESC", "Sair")
+        ]
 
-        # Desenha os painéis
-        self.draw_panel()
-        self.draw_sidebar()
+        icon_font = get_font('Arial', 16, bold=True)
+        text_font = get_font('Arial', 12)
 
-        # Área do tabuleiro principal
-        board_rect = pygame.Rect(
-            SIDEBAR_WIDTH, PANEL_HEIGHT, 
-            BOARD_WIDTH * BLOCK_SIZE, BOARD_HEIGHT * BLOCK_SIZE
-        )
-        pygame.draw.rect(self.game_surface, COLORS[''], board_rect)
-        pygame.draw.rect(self.game_surface, COLORS['violeta'], board_rect, 3)
+        per_row = (len(controls) + 1) // 2
+        column = FOOTER_RECT.width // per_row
+        for i, (icon, text) in enumerate(controls):
+            icon_surf = TEXT_CACHE.render(icon_font, icon, True, COLORS['white'])
+            text_surf = TEXT_CACHE.render(text_font, text, True, COLORS['white'])
 
-        # Efeito de linha limpa
-        if self.clear_effect and time.time() - self.clear_effect_time < 0.5:
-            for y in self.clear_effect:
-                highlight_surf = pygame.Surface(
-                    (BOARD_WIDTH * BLOCK_SIZE, BLOCK_SIZE), pygame.SRCALPHA)
-                highlight_surf.fill(COLORS['highlight'])
-                self.game_surface.blit(
-                    highlight_surf, (SIDEBAR_WIDTH, PANEL_HEIGHT + y * BLOCK_SIZE))
-        else:
-            self.clear_effect = None
+            center_x = column * (i % per_row) + column // 2
+            y_pos = FOOTER_RECT.y + 6 + (i // per_row) * 36
+            chrome.blit(icon_surf, (center_x - icon_surf.get_width()//2, y_pos))
+            chrome.blit(text_surf, (center_x - text_surf.get_width()//2, y_pos + 18))
 
-        # Tabuleiro e peças fixas
-        for y in range(BOARD_HEIGHT):
-            for x in range(BOARD_WIDTH):
-                if self.board[y][x]:
-                    block_x = SIDEBAR_WIDTH + x * BLOCK_SIZE
-                    block_y = PANEL_HEIGHT + y * BLOCK_SIZE
-                    self.draw_block(self.game_surface, block_x, block_y, self.board[y][x])
+        # A transparência do gradiente é resolvida uma vez contra o fundo,
+        # assim as camadas seguintes podem ser copiadas sem mistura
+        flat = pygame.Surface((GAME_WIDTH, GAME_HEIGHT))
+        flat.fill(COLORS[''])
+        flat.blit(chrome, (0, 0))
+        return flat
 
+    def build_grid(self):
         # Grade do tabuleiro
         grid_surface = pygame.Surface(
             (BOARD_WIDTH * BLOCK_SIZE, BOARD_HEIGHT * BLOCK_SIZE), pygame.SRCALPHA)
@@ -823,228 +859,537 @@ class TetrisGame:
             pygame.draw.line(grid_surface, grid_color,
                              (x * BLOCK_SIZE + 0.5, 0),
                              (x * BLOCK_SIZE + 0.5, BOARD_HEIGHT * BLOCK_SIZE), 1)
+        return grid_surface
 
-        self.game_surface.blit(grid_surface, (SIDEBAR_WIDTH, PANEL_HEIGHT))
-
-        # Sombra da peça
-        if self.current_piece is not None:
-            ghost_y = self.get_ghost_y()
-            for i, row in enumerate(self.current_piece):
-                for j, cell in enumerate(row):
-                    if cell:
-                        x = SIDEBAR_WIDTH + (self.piece_x + j) * BLOCK_SIZE
-                        y = PANEL_HEIGHT + (ghost_y + i) * BLOCK_SIZE
-
-                        ghost_surf = pygame.Surface(
-                            (BLOCK_SIZE, BLOCK_SIZE), pygame.SRCALPHA)
-                        ghost_surf.fill(COLORS['ghost'])
-                        self.game_surface.blit(ghost_surf, (x, y))
-
-        # Peça atual com rotação
-        if self.current_piece is not None:
-            for i, row in enumerate(self.current_piece):
-                for j, cell in enumerate(row):
-                    if cell:
-                        x = SIDEBAR_WIDTH + (self.piece_x + j) * BLOCK_SIZE
-                        y = PANEL_HEIGHT + (self.piece_y + i) * BLOCK_SIZE
-
-                        # Animação de rotação
-                        if abs(self.rotate_angle) > 0:
-                            rotated_block = pygame.Surface(
-                                (BLOCK_SIZE+10, BLOCK_SIZE+10), pygame.SRCALPHA)
-                            block_rect = pygame.Rect(
-                                5, 5, BLOCK_SIZE, BLOCK_SIZE)
-                            self.draw_block(rotated_block, 5, 5,
-                                            self.current_shape, BLOCK_SIZE, True)
-
-                            # Aplica rotação
-                            rotated_block = pygame.transform.rotate(
-                                rotated_block, self.rotate_angle)
-                            self.rotate_angle *= 0.9  # Suaviza a rotação
-
-                            # Centraliza após rotação
-                            block_rect = rotated_block.get_rect(
-                                center=(x + BLOCK_SIZE//2, y + BLOCK_SIZE//2))
-                            self.game_surface.blit(rotated_block, block_rect)
-                        else:
-                            self.draw_block(
-                                self.game_surface, x, y, self.current_shape, BLOCK_SIZE, True)
-
-        # Partículas
-        self.particles = [p for p in self.particles if p.update()]
-        for p in self.particles:
-            surf = pygame.Surface((p.size * 2, p.size * 2), pygame.SRCALPHA)
-            pygame.draw.circle(surf, (*p.color, p.alpha),
-                               (p.size, p.size), p.size)
-            self.game_surface.blit(
-                surf, (int(p.x - p.size), int(p.y - p.size)))
+    def draw_sidebar(self, surface):
+        if self.snapshot.hold_piece:
+            # Centraliza a peça hold
+            hold_piece_width = ROTATIONS[self.snapshot.hold_piece][0].width
+            hold_x = SIDEBAR_WIDTH//2 - (hold_piece_width * BLOCK_SIZE)//2
+            self.draw_piece_preview(surface, self.snapshot.hold_piece, hold_x, PANEL_HEIGHT + 50)
 
-        # Rodapé com controles
-        footer_rect = pygame.Rect(
-            0, PANEL_HEIGHT + BOARD_HEIGHT * BLOCK_SIZE, GAME_WIDTH, FOOTER_HEIGHT)
-        pygame.draw.rect(self.game_surface, COLORS['panel'], footer_rect)
-        pygame.draw.rect(self.game_surface, COLORS['violeta'], footer_rect, 3)
+        # Garante que temos pelo menos 3 próximas peças para mostrar
+        next_pieces_to_show = self.snapshot.next_pieces
+        for i, piece in enumerate(next_pieces_to_show):
+            # Centraliza cada peça next
+            piece_width = ROTATIONS[piece][0].width
+            next_x = GAME_WIDTH - SIDEBAR_WIDTH//2 - \
+                (piece_width * BLOCK_SIZE)//2
+            self.draw_piece_preview(surface, piece, next_x, PANEL_HEIGHT + 50 + i * 100)
 
-        # Ícones e textos de controles
-        controls = [
-            ("← →", "Mover"),
-            ("↑", "Girar"),
-            ("↓", "Cair"),
-            ("Space", "Drop"),
-            ("C", "Guardar"),
-            ("P", "Pausa"),
-            ("M", "Mudo"),
-            ("N", "Próxima Música"),
-            ("ESC", "Sair")
-        ]
+    def draw_panel(self, surface):
+        # Informações
+        time_text = TEXT_CACHE.render(
+            FONT, f"Tempo: {self.elapsed_time//60:02d}:{self.elapsed_time % 60:02d}", True, COLORS['white'])
+        score_text = TEXT_CACHE.render(
+            FONT, f"Pontos: {self.snapshot.score}", True, COLORS['white'])
+        level_text = TEXT_CACHE.render(FONT, f"Nível: {self.snapshot.level}", True, COLORS['white'])
+        lines_text = TEXT_CACHE.render(
+            FONT, f"Linhas: {self.snapshot.lines_cleared}", True, COLORS['white'])
+        status = self.status_message()
 
-        icon_font = pygame.font.SysFont('Arial', 24, bold=True)
-        text_font = pygame.font.SysFont('Arial', 16)
+        # Barra de progresso do nível
+        level_progress = self.snapshot.lines_cleared % 10
+        pygame.draw.rect(surface, (80, 80, 100),
+                         (10, PANEL_HEIGHT-15, 100, 8))
+        pygame.draw.rect(
+            surface, COLORS['I'], (10, PANEL_HEIGHT-15, level_progress * 10, 8))
 
-        start_x = 20
-        for icon, text in controls:
-            icon_surf = icon_font.render(icon, True, COLORS['white'])
-            text_surf = text_font.render(text, True, COLORS['white'])
+        surface.blit(time_text, (10, 10))
+        surface.blit(score_text, (10, 30))
+        surface.blit(
+            level_text, (GAME_WIDTH//2 - level_text.get_width()//2, 10))
+        surface.blit(
+            lines_text, (GAME_WIDTH - lines_text.get_width() - 10, 10))
+        if status:
+            status_text = TEXT_CACHE.render(FONT, status[0], True, status[1])
+            surface.blit(
+                status_text, (GAME_WIDTH - status_text.get_width() - 10, 30))
+
+    def status_message(self):
+        # (texto, cor) da linha de baixo do painel, por prioridade: perfect
+        # clear, dica, quebra-cabeça, finesse
+        if self.banner:
+            return self.banner, COLORS['I']
+        if self.puzzle_job is not None:
+            return "Quebra-cabeça: gerando...", COLORS['white']
+        if self.hint_job is not None:
+            return "Dica: procurando...", COLORS['white']
+        hint = self.current_hint()
+        if hint is not None:
+            move = hint.moves[0]
+            what = f"perfect clear em {len(hint.moves)}" if hint.solved else "sem perfect clear à vista"
+            return f"Dica: {what}{', hold antes' if move.hold else ''}", COLORS['white']
+        if self.hint is not None and self.hint[0] == self.snapshot.board_version:
+            return "Dica: nada com as peças à vista", COLORS['white']
+        if self.puzzle is not None:
+            seed, _, moves = self.puzzle
+            if self.puzzle_solved:
+                return f"Quebra-cabeça {seed}: resolvido! (R repete)", COLORS['S']
+            if self.puzzle_locks >= len(moves):
+                return f"Quebra-cabeça {seed}: não foi (R repete)", COLORS['Z']
+            left = len(moves) - self.puzzle_locks
+            return f"Quebra-cabeça {seed}: perfect clear em {left} peças", COLORS['white']
+        if self.finesse is not None:
+            message = self.finesse.message()
+            if message:
+                return message, COLORS['white'] if self.finesse.last.extra == 0 else COLORS['Z']
+        return None
 
-            y_pos = PANEL_HEIGHT + BOARD_HEIGHT * BLOCK_SIZE + 20
-            self.game_surface.blit(icon_surf, (start_x, y_pos))
-            self.game_surface.blit(
-                text_surf, (start_x + (icon_surf.get_width() - text_surf.get_width())//2, y_pos + 30))
+    def current_hint(self):
+        # Resultado da dica, se ainda vale para o tabuleiro e a peça da vez
+        if self.hint is None:
+            return None
+        version, result = self.hint
+        if version != self.snapshot.board_version or not result.moves:
+            return None
+        move = result.moves[0]
+        if move.shape != self.snapshot.shape and not move.hold:
+            return None
+        return result
+
+    def draw_settled(self, surface, clear_rows):
+        # Tabuleiro assentado, em coordenadas locais do tabuleiro
+        local_rect = pygame.Rect(0, 0, BOARD_RECT.width, BOARD_RECT.height)
+        pygame.draw.rect(surface, COLORS[''], local_rect)
+        pygame.draw.rect(surface, COLORS['violeta'], local_rect, 3)
 
-            start_x += 100
+        # Efeito de linha limpa
+        for y in clear_rows or ():
+            surface.blit(self.highlight_row, (0, y * BLOCK_SIZE))
+
+        # Peças fixas, em uma única chamada de blits
+        get_block = self.blocks.get
+        surface.blits(
+            [(get_block(cell), (x * BLOCK_SIZE, y * BLOCK_SIZE))
+             for y, row in enumerate(self.snapshot.board)
+             for x, cell in enumerate(row) if cell],
+            doreturn=False)
+
+        surface.blit(self.grid_surface, (0, 0))
+
+    def build_overlay(self, paused, game_over):
+        overlay = pygame.Surface((GAME_WIDTH, GAME_HEIGHT), pygame.SRCALPHA)
 
         # Mensagem de pausa
-        if self.paused:
-            overlay = pygame.Surface(
-                (GAME_WIDTH, GAME_HEIGHT), pygame.SRCALPHA)
-            overlay.fill((0, 0, 0, 180))
-            self.game_surface.blit(overlay, (0, 0))
+        if paused:
+            shade = pygame.Surface((GAME_WIDTH, GAME_HEIGHT), pygame.SRCALPHA)
+            shade.fill((0, 0, 0, 180))
+            overlay.blit(shade, (0, 0))
 
-            pause_text = TITLE_FONT.render("PAUSADO", True, COLORS['white'])
-            resume_text = FONT.render(
-                "Pressione P para continuar", True, COLORS['white'])
+            pause_text = TEXT_CACHE.render(TITLE_FONT, "PAUSADO", True, COLORS['white'])
+            resume_text = TEXT_CACHE.render(
+                FONT, "Pressione P para continuar", True, COLORS['white'])
 
-            self.game_surface.blit(
+            overlay.blit(
                 pause_text, (GAME_WIDTH//2 - pause_text.get_width()//2, GAME_HEIGHT//2 - 50))
-            self.game_surface.blit(
+            overlay.blit(
                 resume_text, (GAME_WIDTH//2 - resume_text.get_width()//2, GAME_HEIGHT//2 + 10))
 
         # Mensagem de game over
-        if not self.running and self.game_over_time is not None:
-            overlay = pygame.Surface(
-                (GAME_WIDTH, GAME_HEIGHT), pygame.SRCALPHA)
-            overlay.fill((0, 0, 0, 200))
-            self.game_surface.blit(overlay, (0, 0))
-
-            game_over_text = TITLE_FONT.render(
-                "GAME OVER", True, (255, 80, 80))
-            score_text = LARGE_FONT.render(
-                f"Pontuação: {self.score}", True, COLORS['white'])
-            lines_text = LARGE_FONT.render(
-                f"Linhas: {self.lines_cleared}", True, COLORS['white'])
-            restart_text = FONT.render(
-                "Pressione R para reiniciar", True, COLORS['white'])
-
-            self.game_surface.blit(
+        if game_over:
+            shade = pygame.Surface((GAME_WIDTH, GAME_HEIGHT), pygame.SRCALPHA)
+            shade.fill((0, 0, 0, 200))
+            overlay.blit(shade, (0, 0))
+
+            game_over_text = TEXT_CACHE.render(
+                TITLE_FONT, "GAME OVER", True, (255, 80, 80))
+            score_text = TEXT_CACHE.render(
+                LARGE_FONT, f"Pontuação: {self.snapshot.score}", True, COLORS['white'])
+            lines_text = TEXT_CACHE.render(
+                LARGE_FONT, f"Linhas: {self.snapshot.lines_cleared}", True, COLORS['white'])
+            restart_text = TEXT_CACHE.render(
+                FONT, "Pressione R para reiniciar", True, COLORS['white'])
+
+            overlay.blit(
                 game_over_text, (GAME_WIDTH//2 - game_over_text.get_width()//2, GAME_HEIGHT//2 - 80))
-            self.game_surface.blit(
+            overlay.blit(
                 score_text, (GAME_WIDTH//2 - score_text.get_width()//2, GAME_HEIGHT//2 - 20))
-            self.game_surface.blit(
+            overlay.blit(
                 lines_text, (GAME_WIDTH//2 - lines_text.get_width()//2, GAME_HEIGHT//2 + 20))
-            self.game_surface.blit(
+            overlay.blit(
                 restart_text, (GAME_WIDTH//2 - restart_text.get_width()//2, GAME_HEIGHT//2 + 80))
+        return overlay
+
+    def dynamic_items(self):
+        # (superfície, posição, retângulo) da sombra e da peça atual
+        items = []
+        hint = self.current_hint()
+        if hint is not None:
+            # Onde a dica põe a peça: contorno das células
+            move = hint.moves[0]
+            for j, i in ROTATIONS[move.shape][move.rotation].cells:
+                x = SIDEBAR_WIDTH + (move.x + j) * BLOCK_SIZE
+                y = PANEL_HEIGHT + (move.y + i) * BLOCK_SIZE
+                rect = pygame.Rect(x, y, BLOCK_SIZE, BLOCK_SIZE)
+                items.append((self.hint_block, rect.topleft, rect))
+        piece = self.snapshot.piece
+        if piece is not None:
+            # Sombra da peça
+            ghost_y = self.snapshot.ghost_y
+            for j, i in piece.cells:
+                x = SIDEBAR_WIDTH + (self.snapshot.piece_x + j) * BLOCK_SIZE
+                y = PANEL_HEIGHT + (ghost_y + i) * BLOCK_SIZE
+                rect = pygame.Rect(x, y, BLOCK_SIZE, BLOCK_SIZE)
+                items.append((self.ghost_block, rect.topleft, rect))
+
+            # Peça atual com rotação
+            sprite = self.blocks.get(self.snapshot.shape, BLOCK_SIZE, True)
+            for j, i in piece.cells:
+                x = SIDEBAR_WIDTH + (self.snapshot.piece_x + j) * BLOCK_SIZE
+                y = PANEL_HEIGHT + (self.snapshot.piece_y + i) * BLOCK_SIZE
+
+                # Animação de rotação
+                if abs(self.rotate_angle) > 0:
+                    # Aplica rotação
+                    rotated_block = pygame.transform.rotate(sprite, self.rotate_angle)
+                    self.rotate_angle *= 0.9  # Suaviza a rotação
+                    if abs(self.rotate_angle) < 0.5:
+                        self.rotate_angle = 0
+
+                    # Centraliza após rotação
+                    block_rect = rotated_block.get_rect(
+                        center=(x + BLOCK_SIZE//2, y + BLOCK_SIZE//2))
+                    items.append((rotated_block, block_rect.topleft, block_rect))
+                else:
+                    rect = pygame.Rect(x, y, BLOCK_SIZE, BLOCK_SIZE)
+                    items.append((sprite, rect.topleft, rect))
+        return items
+
+    def draw_board(self):
+        # Atualiza self.game_surface e devolve os retângulos (em coordenadas
+        # do game_surface) que mudaram desde o quadro anterior
+        if self.running:
+            self.elapsed_time = int(
+                self.clock() - self.start_time - self.total_pause_duration)
+        elif self.game_over_time is not None:
+            self.elapsed_time = int(
+                self.game_over_time - self.start_time - self.total_pause_duration)
+
+        # Tudo o que vem do jogo sai do último snapshot publicado
+        self.snapshot = self.simulation.latest()
+        dirty = []
+        keys = self.layer_keys
+        base = self.base_surface
+
+        lap = self.profiler.lap
+
+        if 'chrome' not in keys:
+            keys['chrome'] = True
+            if self.chrome is None:
+                self.chrome = self.build_chrome()
+                self.grid_surface = self.build_grid()
+            base.blit(self.chrome, (0, 0))
+            dirty.append(GAME_RECT)
+
+        # HUD do painel: muda com o relógio, pontos, nível e linhas
+        panel_key = (self.elapsed_time, self.snapshot.score, self.snapshot.level,
+                     self.snapshot.lines_cleared, self.status_message())
+        if keys.get('panel') != panel_key:
+            keys['panel'] = panel_key
+            base.blit(self.chrome, PANEL_RECT, PANEL_RECT)
+            self.draw_panel(base)
+            dirty.append(PANEL_RECT)
+        lap('panel')
+
+        # Hold e próximas peças
+        sidebar_key = (self.snapshot.hold_piece, self.snapshot.next_pieces)
+        if keys.get('sidebar') != sidebar_key:
+            keys['sidebar'] = sidebar_key
+            base.blit(self.chrome, HOLD_RECT, HOLD_RECT)
+            base.blit(self.chrome, NEXT_RECT, NEXT_RECT)
+            self.draw_sidebar(base)
+            dirty.extend((HOLD_RECT, NEXT_RECT))
+        lap('sidebar')
+
+        # Tabuleiro assentado: muda ao encaixar/limpar e no efeito de linha
+        if self.clear_effect and self.clock() - self.clear_effect_time < 0.5:
+            clear_rows = tuple(self.clear_effect)
+        else:
+            self.clear_effect = None
+            clear_rows = None
+        board_key = (self.snapshot.board_version, clear_rows)
+        if keys.get('board') != board_key:
+            keys['board'] = board_key
+            self.draw_settled(self.board_layer, clear_rows)
+            base.blit(self.board_layer, BOARD_RECT)
+            dirty.append(BOARD_RECT)
+        lap('board')
+
+        # Pausa / game over
+        overlay_key = (self.paused, not self.running and self.game_over_time is not None,
+                       self.snapshot.score, self.snapshot.lines_cleared)
+        if keys.get('overlay') != overlay_key:
+            keys['overlay'] = overlay_key
+            paused, game_over = overlay_key[:2]
+            self.overlay = self.build_overlay(paused, game_over) if paused or game_over else None
+            dirty.append(GAME_RECT)
+        lap('overlay')
+
+        # Camada dinâmica: só suja a tela se algo nela mudou. A peça com a
+        # sombra e as partículas viram um retângulo cada
+        angle = self.rotate_angle
+        items = self.dynamic_items()
+        lap('piece')
+        self.particles.update()
+        particle_rect = self.particles.bounds()
+        particle_blits = self.particles.blit_list()
+        lap('particles')
+        dynamic_key = (self.snapshot.shape, angle,
+                       [tuple(item[2]) for item in items],
+                       tuple(particle_rect) if particle_rect else None)
+        # Partículas vivas sempre se movem, então sempre sujam a tela
+        if dynamic_key != self.dynamic_key or particle_rect:
+            rects = []
+            if items:
+                rects.append(items[0][2].unionall([item[2] for item in items[1:]]))
+            if particle_rect:
+                rects.append(particle_rect)
+            dirty.extend(self.dynamic_rects)
+            dirty.extend(rects)
+            self.dynamic_key = dynamic_key
+            self.dynamic_rects = rects
+
+        if any(rect == GAME_RECT for rect in dirty):
+            dirty = [GAME_RECT]
+        else:
+            dirty = [rect.clip(GAME_RECT) for rect in dirty]
+            dirty = [rect for rect in dirty if rect.width and rect.height]
+
+        # Recompõe cada retângulo sujo: base, camada dinâmica e overlay
+        surface = self.game_surface
+        for rect in dirty:
+            surface.set_clip(rect)
+            surface.blit(base, rect, rect)
+            for image, pos, item_rect in items:
+                if item_rect.colliderect(rect):
+                    surface.blit(image, pos)
+            if particle_blits and particle_rect.colliderect(rect):
+                # Partículas ficam atrás do rodapé, como antes
+                surface.set_clip(rect.clip(PLAY_RECT))
+                surface.blits(particle_blits, doreturn=False)
+                surface.set_clip(rect)
+            if self.overlay is not None:
+                surface.blit(self.overlay, rect, rect)
+        surface.set_clip(None)
+        lap('compose')
+        return dirty
 
-    
     def run(self):
         try:
-            clock = pygame.time.Clock()
             running = True
 
-            # Inicia a música do menu
-            if self.sound_available and self.menu_music:
-                pygame.mixer.music.load(self.menu_music)
-                pygame.mixer.music.set_volume(self.menu_music_volume)
-                pygame.mixer.music.play(-1)
-
+            # A música do menu começa quando a thread de carga termina de lê-la
             while running:
-                for event in pygame.event.get():
+                frame_start = time.perf_counter()
+                profiler = self.profiler
+                profiler.start()
+                # pygame não expõe o timestamp do SDL: o instante é o da retirada
+                # da fila (e a espera do quadro acorda assim que chega uma tecla)
+                events = self.pending_events + [(event, frame_start) for event in pygame.event.get()]
+                self.pending_events = []
+                self.sfx.begin_frame()
+                for event, stamp in events:
                     if event.type == pygame.QUIT:
                         running = False
+                    elif event.type == MUSIC_END:
+                        self.music.handle_end()
+                        continue
+                    elif event.type == PROBE_EVENT:
+                        self.sfx.handle_probe(stamp)
+                        continue
+                    elif event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                        self.profiler_toggle = True
+                        continue
+                    elif event.type == pygame.WINDOWFOCUSLOST:
+                        self.window_focused = False
+                        continue
+                    elif event.type == pygame.WINDOWFOCUSGAINED:
+                        self.window_focused = True
+                        self.full_redraw = True
+                        continue
+                    elif event.type == pygame.WINDOWMINIMIZED:
+                        self.window_minimized = True
+                        continue
+                    elif event.type in (pygame.WINDOWRESTORED, pygame.WINDOWEXPOSED):
+                        self.window_minimized = False
+                        self.full_redraw = True
+                        continue
+                    self.needs_render = True
 
                     if self.game_state == "menu":
                         action = self.menu.handle_event(event)
                         if action == "start":
-                            pygame.mixer.music.fadeout(500)
-                            while pygame.mixer.music.get_busy():
-                                pygame.time.wait(100)
-
                             self.game_state = "game"
                             self.__init_game()
 
-                            pygame.mixer.music.load(self.playlist[self.current_song_index])
-                            pygame.mixer.music.set_volume(self.game_music_volume)
-                            pygame.mixer.music.play(-1)
-
                         elif action == "quit":
                             running = False
 
                     elif self.game_state == "game":
                         if event.type == pygame.KEYDOWN:
                             if event.key == pygame.K_ESCAPE:
+                                if self.running:
+                                    # Ações ainda na fila entram no replay
+                                    self.simulation.process()
+                                    self.save_replay()
+                                self.replay_player = None
+                                self.autoplayer = None
+                                self.puzzle = None
+                                self.cancel_puzzle()
+                                self.cancel_hint()
+                                self.hint = None
                                 self.running = False
                                 self.paused = False
-                                self.current_piece = None
-                                self.board = [['' for _ in range(BOARD_WIDTH)] for _ in range(BOARD_HEIGHT)]
+                                self.simulation.reset()
+                                self.input.reset()
                                 self.menu = Menu(self.screen_width, self.screen_height, self)
                                 self.game_state = "menu"
-                                pygame.mixer.music.fadeout(300)
-                                while pygame.mixer.music.get_busy():
-                                    pygame.time.wait(100)
-                                if self.sound_available and self.menu_music:
-                                    pygame.mixer.music.load(self.menu_music)
-                                    pygame.mixer.music.set_volume(self.menu_music_volume)
-                                    pygame.mixer.music.play(-1)
+                                self.music_paused = False
+                                self.music.switch("menu", 300)
+                                self.music.set_paused(False)
                             elif event.key == pygame.K_p:
                                 self.toggle_pause()
                             elif event.key == pygame.K_m:
                                 self.toggle_music()
-                            elif event.key == pygame.K_r and not self.running:
+                            elif event.key == pygame.K_r and (not self.running or self.puzzle is not None):
                                 self.__init_game()
                             elif event.key == pygame.K_n:
-                                self.skip_song = True
+                                self.music.skip()
+                            elif event.key == pygame.K_a and self.replay_player is None:
+                                self.toggle_autoplay()
+                            elif event.key == pygame.K_f:
+                                self.toggle_finesse()
+                            elif event.key == pygame.K_h:
+                                self.request_hint()
                             elif self.running and not self.paused:
-                                if event.key == pygame.K_LEFT:
-                                    self.move(-1, 0)
-                                elif event.key == pygame.K_RIGHT:
-                                    self.move(1, 0)
-                                elif event.key == pygame.K_DOWN:
-                                    self.move(0, 1)
-                                elif event.key == pygame.K_UP:
-                                    self.rotate()
-                                elif event.key == pygame.K_SPACE:
-                                    self.hard_drop()
-                                elif event.key == pygame.K_c:
-                                    self.hold_current_piece()
-
+                                self.input.key_down(event.key, stamp)
+                        elif event.type == pygame.KEYUP:
+                            self.input.key_up(event.key, stamp)
+
+                profiler.lap('events')
+
+                if not self.startup_reported:
+                    self.update_startup()
+                if self.sound_available:
+                    self.sfx.update(frame_start)
+                    if self.sfx.needs_fallback():
+                        self.reopen_audio()
                 if self.game_state == "menu":
                     self.menu.update()
                 elif self.game_state == "game":
+                    if self.puzzle_job is not None:
+                        self.update_puzzle()
                     if self.running and not self.paused:
-                        self.elapsed_time = int(time.time() - self.start_time - self.total_pause_duration)
+                        if self.replay_player is not None:
+                            self.update_replay()
+                        else:
+                            self.input.update()
+                            if self.autoplayer is not None:
+                                self.update_autoplay()
+                            self.gravity.update()
+                            if self.hint_job is not None:
+                                self.update_hint()
+                            # Aplica na ordem tudo o que teclado, IA e
+                            # gravidade enfileiraram neste quadro
+                            self.simulation.process()
+                        elapsed = int(self.clock() - self.start_time - self.total_pause_duration)
+                        if elapsed != self.elapsed_time:
+                            self.elapsed_time = elapsed
+                            self.needs_render = True
                     elif self.game_over_time is not None:
                         self.elapsed_time = int(self.game_over_time - self.start_time - self.total_pause_duration)
-
-                self.screen.fill(COLORS[''])
-                if self.game_state == "menu":
-                    self.menu.draw(self.screen)
-                elif self.game_state == "game":
-                    x_offset = (self.screen_width - GAME_WIDTH) // 2
-                    y_offset = (self.screen_height - GAME_HEIGHT) // 2
-                    self.draw_board()
-                    self.screen.blit(self.game_surface, (x_offset, y_offset))
-
-                pygame.display.flip()
-                clock.tick(60)
+                        if self.autoplayer is not None and self.clock() - self.game_over_time > AUTOPLAY_RESTART:
+                            self.__init_game()
+                profiler.lap('update')
+
+                # Sem nada novo na tela, o quadro não é desenhado; sem foco, no
+                # máximo IDLE_FRAME_TIME por quadro; minimizada, nunca
+                render = not self.window_minimized and (
+                    self.needs_render or self.full_redraw or self.animating())
+                if render and not self.window_focused and frame_start - self.last_render < IDLE_FRAME_TIME:
+                    render = False
+                if render:
+                    if self.game_state == "menu":
+                        self.screen.fill(COLORS[''])
+                        self.menu.draw(self.screen)
+                        profiler.lap('menu')
+                        if self.profiler.enabled:
+                            self.draw_profiler_hud()
+                            profiler.lap('hud')
+                        pygame.display.flip()
+                        profiler.lap('present')
+                        # Ao voltar para o jogo a tela inteira precisa ser refeita
+                        self.full_redraw = True
+                    elif self.game_state == "game":
+                        x_offset = (self.screen_width - GAME_WIDTH) // 2
+                        y_offset = (self.screen_height - GAME_HEIGHT) // 2
+                        dirty = self.draw_board()
+                        if self.full_redraw:
+                            self.screen.fill(COLORS[''])
+                            self.screen.blit(self.game_surface, (x_offset, y_offset))
+                            profiler.lap('blit')
+                            if self.profiler.enabled:
+                                self.draw_profiler_hud()
+                                profiler.lap('hud')
+                            pygame.display.flip()
+                            self.full_redraw = False
+                        else:
+                            # Só os retângulos que mudaram vão para a tela
+                            screen_rects = [rect.move(x_offset, y_offset) for rect in dirty]
+                            for screen_rect, rect in zip(screen_rects, dirty):
+                                self.screen.blit(self.game_surface, screen_rect, rect)
+                            profiler.lap('blit')
+                            if self.profiler.enabled:
+                                # O HUD é opaco e vai por cima de novo a cada quadro
+                                screen_rects.append(self.draw_profiler_hud())
+                                profiler.lap('hud')
+                            if screen_rects:
+                                pygame.display.update(screen_rects)
+                        profiler.lap('present')
+                        self.input.presented()
+                    if 'primeiro quadro' not in STARTUP.marks:
+                        STARTUP.mark('primeiro quadro')
+                    self.needs_render = False
+                    self.last_render = frame_start
+                    self.rendered_frames += 1
+                else:
+                    self.idle_frames += 1
+
+                # Espera o próximo quadro animado, a próxima queda/repetição ou
+                # só um evento, se nada está agendado
+                idle = self.idle()
+                # Medição de áudio só com o loop atento à fila
+                self.sfx.busy(time.perf_counter() - frame_start)
+                if idle:
+                    self.sfx.busy(IDLE_POLL)
+                self.wait_until(self.next_wake(frame_start), IDLE_POLL if idle else None)
+                profiler.lap('wait')
+                profiler.end()
+
+                if self.profiler_toggle:
+                    # Só troca entre quadros, para não gravar um quadro pela metade
+                    self.profiler_toggle = False
+                    self.profiler.set_enabled(not self.profiler.enabled)
+                    self.full_redraw = True
+
+            if self.input.latency.count:
+                print('Latência entrada → tela:', self.input.latency.report())
+            if self.sfx.played:
+                print('Áudio:', self.sfx.report())
+            if self.gravity.history:
+                print('Gravidade:', self.gravity.report())
+            if self.idle_frames:
+                print(f'Quadros: {self.rendered_frames} desenhados, {self.idle_frames} sem mudança na tela')
+            if self.profiler.frames:
+                self.save_profile()
+            if self.autoplayer is not None:
+                self.report_autoplay()
+            if self.finesse is not None and self.finesse.pieces:
+                print('Finesse:', self.finesse.report())
+            self.assets.shutdown()
+            if self.solver is not None:
+                self.solver.shutdown()
 
         except Exception as e:
             print('Erro inesperado:', e)
@@ -1054,21 +1399,266 @@ class TetrisGame:
             pygame.quit()
 
 
-    def __init_game(self):
+    def draw_profiler_hud(self):
+        # Tabela p50/p95/p99 por fase e gráficos do tempo de quadro, no canto
+        # da tela. O texto só é refeito a cada 15 quadros.
+        profiler = self.profiler
+        hud = self.profiler_hud
+        if hud is None or profiler.frames % 15 == 0:
+            summary = profiler.summary()
+            phases = [phase for phase in summary if phase not in ('frame', 'work')]
+            phases += ['work', 'frame']
+            line_height = HUD_FONT.get_linesize()
+            graph_height = 40
+            width = 250
+            height = 10 + line_height * (len(phases) + 3) + 2 * (graph_height + 10)
+            hud = pygame.Surface((width, height))
+            hud.fill((10, 10, 25))
+            pygame.draw.rect(hud, COLORS['violeta'], hud.get_rect(), 1)
+
+            y = 5
+            header = TEXT_CACHE.render(HUD_FONT, "fase      p50   p95   p99 ms", True, COLORS['white'])
+            hud.blit(header, (8, y))
+            for phase in phases:
+                y += line_height
+                p50, p95, p99 = summary[phase]
+                text = HUD_FONT.render(f"{phase:<9} {p50:5.2f} {p95:5.2f} {p99:5.2f}", True,
+                                   COLORS['I'] if phase in ('work', 'frame') else COLORS['white'])
+                hud.blit(text, (8, y))
+            y += line_height
+            sfx = self.sfx
+            text = HUD_FONT.render(f"áudio {sfx.buffer:<5} ur {sfx.underruns}  roubos {sfx.steals}",
+                                   True, COLORS['white'])
+            hud.blit(text, (8, y))
+            y += line_height
+            gravity = self.gravity
+            text = HUD_FONT.render(f"queda p99 {gravity.worst_p99() * 1000:5.2f} ms  pulos {gravity.skipped}",
+                                   True, COLORS['white'])
+            hud.blit(text, (8, y))
+
+            # Gráficos: tempo total do quadro e tempo de trabalho (sem a espera);
+            # a linha horizontal marca 1/60 s
+            y += line_height + 10
+            for values, color in ((profiler.frame_times(width - 16), COLORS['I']),
+                                  (profiler.work_times(width - 16), COLORS['L'])):
+                area = pygame.Rect(8, y, width - 16, graph_height)
+                pygame.draw.rect(hud, (25, 25, 50), area)
+                scale = graph_height / (2 * FRAME_TIME)
+                budget_y = area.bottom - int(FRAME_TIME * scale)
+                pygame.draw.line(hud, COLORS['violeta'], (area.left, budget_y), (area.right - 1, budget_y))
+                if len(values) > 1:
+                    points = [(area.left + i, area.bottom - 1 - min(graph_height - 1, int(v * scale)))
+                              for i, v in enumerate(values.tolist())]
+                    pygame.draw.lines(hud, color, False, points)
+                y += graph_height + 10
+            self.profiler_hud = hud
+        return self.screen.blit(hud, (10, 10))
+
+    def save_profile(self):
+        try:
+            os.makedirs(PROFILE_DIR, exist_ok=True)
+            base = os.path.join(PROFILE_DIR, time.strftime('%Y%m%d-%H%M%S'))
+            self.profiler.dump_csv(base + '.csv')
+            self.profiler.dump_json(base + '.json')
+            print('Tempos por fase salvos em', base + '.csv/.json')
+        except OSError as e:
+            print('Erro ao salvar tempos por fase:', e)
+
+    def toggle_autoplay(self):
+        if self.autoplayer is None:
+            self.autoplayer = AutoPlayer(self.engine)
+            self.autoplay_next = time.perf_counter()
+        else:
+            self.report_autoplay()
+            self.autoplayer = None
+
+    def start_autoplay(self):
+        # Partida direto com o jogador automático (demonstração, testes longos)
+        self.__init_game()
+        self.toggle_autoplay()
+
+    def update_autoplay(self):
+        # Uma ação a cada AUTOPLAY_DELAY, pelas mesmas ações do teclado
+        now = time.perf_counter()
+        if now < self.autoplay_next:
+            return
+        action = self.autoplayer.next_action()
+        self.perform(action, self.autoplay_result)
+        self.autoplay_next += AUTOPLAY_DELAY
+        if self.autoplay_next < now:
+            self.autoplay_next = now + AUTOPLAY_DELAY
+
+    def autoplay_result(self, ok):
+        # Ação recusada pelo engine: o plano da IA não vale mais
+        if not ok and self.autoplayer is not None:
+            self.autoplayer.invalidate()
+
+    def report_autoplay(self):
+        ai = self.autoplayer
+        print(f'Jogador automático: {ai.evaluations} posições avaliadas, '
+              f'{ai.rate():,.0f} por segundo de busca')
+
+    def toggle_finesse(self):
+        # As buscas do tabuleiro vazio são feitas na primeira vez e ficam
+        if self.finesse is None:
+            if self.finesse_analyzer is None:
+                self.finesse_analyzer = FinesseAnalyzer()
+            self.finesse = FinesseTracker(self.finesse_analyzer)
+        else:
+            if self.finesse.pieces:
+                print('Finesse:', self.finesse.report())
+            self.finesse = None
+        self.needs_render = True
+
+    def get_solver(self):
+        # Um processo a menos que os núcleos: o jogo fica com um só para ele
+        if self.solver is None:
+            self.solver = Solver(workers=max(1, (os.cpu_count() or 2) - 1), budget=HINT_BUDGET)
+        return self.solver
+
+    def request_hint(self):
+        # A busca começa em process(), com o estado que as ações da fila deixarem
+        if (self.running and not self.paused and self.replay_player is None and
+                self.hint_job is None):
+            self.simulation.call(self.start_hint)
+
+    def start_hint(self):
+        if self.engine.piece is None:
+            return
+        try:
+            self.hint_job = self.get_solver().submit(*engine_state(self.engine))
+            self.hint_version = self.engine.board_version
+        except Exception as e:
+            print('Erro ao iniciar a dica:', e)
+            self.hint_job = None
+
+    def update_hint(self):
+        # O resultado é lido sem esperar; a busca tem prazo de HINT_BUDGET
+        if self.hint_job.poll():
+            self.hint = (self.hint_version, self.hint_job.result)
+            self.hint_job = None
+            self.needs_render = True
+
+    def cancel_hint(self):
+        # Os ramos da busca no pool param na hora, sem esperar o prazo
+        if self.hint_job is not None:
+            self.hint_job.cancel()
+            self.hint_job = None
+
+    def start_puzzle(self, seed=0):
+        # Quebra-cabeça de perfect clear a partir da semente (ou da seguinte
+        # que tiver um). A procura roda no pool, sem travar o loop: até ela
+        # acabar o tabuleiro fica vazio com "gerando..."; R recomeça o mesmo
+        self.cancel_puzzle()
+        self.puzzle = None
+        try:
+            self.puzzle_job = PuzzleJob(seed, self.get_solver())
+        except Exception as e:
+            print('Erro ao gerar o quebra-cabeça:', e)
+            self.puzzle_job = None
+        self.__init_game()
+
+    def update_puzzle(self):
+        try:
+            if not self.puzzle_job.poll():
+                return
+            puzzle = self.puzzle_job.result
+        except Exception as e:
+            print('Erro ao gerar o quebra-cabeça:', e)
+            puzzle = None
+        if puzzle is None:
+            print(f'Nenhum quebra-cabeça a partir da semente {self.puzzle_job.seed}')
+        self.puzzle_job = None
+        self.puzzle = puzzle
+        self.needs_render = True
+        self.__init_game()
+
+    def cancel_puzzle(self):
+        if self.puzzle_job is not None:
+            self.puzzle_job.cancel()
+            self.puzzle_job = None
+
+    def update_replay(self):
+        self.replay_player.update()
+        self.simulation.process()
+        if self.replay_player.finished and not self.replay_reported:
+            self.replay_reported = True
+            result = 'ok' if self.replay_player.verify() else 'DIVERGIU do estado gravado'
+            print('Fim do replay:', result)
+
+    def animating(self):
+        # Algo na tela se mexe sozinho e pede quadros seguidos
+        return (self.game_state == "menu" or self.rotate_angle != 0 or
+                self.clear_effect is not None or self.profiler.enabled or
+                (self.particles is not None and self.particles.count > 0))
+
+    def next_wake(self, now):
+        # Próximo instante em que há algo a fazer: quadro de animação, queda,
+        # repetição de tecla, ação automática ou o relógio do painel virar
+        deadlines = [now + IDLE_WAKE]
+        if not self.window_minimized and (self.animating() or self.needs_render or self.full_redraw):
+            if self.window_focused:
+                deadlines.append(now + FRAME_TIME)
+            else:
+                deadlines.append(self.last_render + IDLE_FRAME_TIME)
+        if not self.startup_reported:
+            deadlines.append(now + FRAME_TIME)
+        if self.game_state == "game":
+            if self.running and not self.paused:
+                if self.replay_player is not None:
+                    deadline = self.replay_player.next_deadline()
+                    if deadline is not None:
+                        deadlines.append(deadline)
+                else:
+                    deadlines.append(self.gravity.next_deadline())
+                    repeat = self.input.next_deadline()
+                    if repeat is not None:
+                        deadlines.append(repeat)
+                    if self.autoplayer is not None:
+                        deadlines.append(self.autoplay_next)
+                    if self.hint_job is not None:
+                        deadlines.append(now + FRAME_TIME)
+                elapsed = self.clock() - self.start_time - self.total_pause_duration
+                deadlines.append(now + 1 - elapsed % 1)
+            elif self.game_over_time is not None and self.autoplayer is not None:
+                deadlines.append(now + self.game_over_time + AUTOPLAY_RESTART - self.clock())
+            if self.puzzle_job is not None:
+                deadlines.append(now + FRAME_TIME)
+        return min(deadlines)
+
+    def idle(self):
+        # Nada com pressa: pausa, fim de jogo, janela sem foco ou minimizada
+        return (self.window_minimized or not self.window_focused or
+                (self.game_state == "game" and (self.paused or not self.running)))
+
+    def wait_until(self, deadline, step=None):
+        # Dorme até deadline, mas volta na hora se chegar um evento; o evento
+        # fica em pending_events com o instante em que chegou. pygame.event.wait
+        # olha a fila a cada 1 ms; com step, a fila é vista a cada step segundos
+        # (para quando a demora em responder não importa)
+        while True:
+            delay = deadline - time.perf_counter()
+            if delay <= 0:
+                return
+            if step is not None and delay > step:
+                event = pygame.event.poll()
+                if event.type != pygame.NOEVENT:
+                    self.pending_events.append((event, time.perf_counter()))
+                    return
+                time.sleep(step)
+                continue
+            if delay < 0.001:
+                time.sleep(delay)
+                return
+            event = pygame.event.wait(int(delay * 1000))
+            if event.type != pygame.NOEVENT:
+                self.pending_events.append((event, time.perf_counter()))
+                return
+
+    def __init_game(self, replay=None):
             # Reinicializa todas as variáveis do jogo
-            self.board = [['' for _ in range(BOARD_WIDTH)] for _ in range(BOARD_HEIGHT)]
-            self.current_shape = None
-            self.current_piece = None
-            self.piece_x = 0
-            self.piece_y = 0
             self.running = True
             self.paused = False
-            self.score = 0
-            self.level = 1
-            self.lines_cleared = 0
-            self.hold_piece = None
-            self.hold_used = False
-            self.next_pieces = [random.choice(list(SHAPES.keys())) for _ in range(3)]
             self.game_over_time = None
 
             # Reinicia efeitos visuais
@@ -1078,85 +1668,95 @@ class TetrisGame:
             self.rotate_direction = 1
 
             # Reinicia tempo
-            self.start_time = time.time()
+            self.start_time = self.clock()
             self.elapsed_time = 0
             self.total_pause_duration = 0
 
             # Limpa partículas
-            self.particles = []
+            if self.particles is None:
+                self.particles = ParticleSystem(capacity=5000)
+            self.particles.clear()
 
             # Inicia novo jogo
-            self.spawn_piece()
             self.game_state = "game"
-            self.running = True
+            self.music.switch("game")
+            if self.autoplayer is not None:
+                self.autoplayer.invalidate()
+                self.autoplay_next = time.perf_counter()
+            if replay is not None:
+                self.simulation.start(replay.seed)
+                self.recorder = None
+                self.replay_player = ReplayPlayer(replay, self.engine, self.simulation)
+                self.replay_reported = False
+            elif self.puzzle_job is not None:
+                # Quebra-cabeça ainda sendo gerado: tabuleiro vazio e parado
+                # até update_puzzle() recomeçar a partida
+                self.simulation.reset()
+                self.recorder = None
+                self.replay_player = None
+                self.running = False
+            elif self.puzzle is not None:
+                # Mesma semente e as jogadas de preparação, que também vão
+                # para o replay
+                seed, actions, _ = self.puzzle
+                self.simulation.start(seed)
+                self.recorder = ReplayRecorder(self.engine)
+                self.replay_player = None
+                for action in actions:
+                    self.simulation.step(action)
+                self.simulation.process()
+            else:
+                self.simulation.start()
+                self.recorder = ReplayRecorder(self.engine)
+                self.replay_player = None
+            self.cancel_hint()
+            self.hint = None
+            self.banner = None
+            self.puzzle_locks = 0
+            self.puzzle_solved = False
+            self.gravity.reset()
+            self.input.reset()
+            self.invalidate_layers()
 
     def toggle_pause(self):
             self.paused = not self.paused
             if self.paused:
-                self.pause_start_time = time.time()
-                self.music_paused = True
-                pygame.mixer.music.pause()
+                self.pause_start_time = self.clock()
+                self.gravity.pause()
+                self.input.reset()
+                self.music.set_paused(True)
             else:
                 if self.pause_start_time:
-                    self.total_pause_duration += time.time() - self.pause_start_time
+                    self.total_pause_duration += self.clock() - self.pause_start_time
                     self.pause_start_time = None
-                self.music_paused = False
-                pygame.mixer.music.unpause()
+                self.gravity.resume()
+                if self.replay_player is not None:
+                    self.replay_player.start()
+                # Silenciada pela tecla M continua silenciada
+                self.music.set_paused(self.music_paused)
 
     def toggle_music(self):
             self.music_paused = not self.music_paused
-            if self.music_paused:
-                pygame.mixer.music.pause()
-            else:
-                if not self.paused:
-                    pygame.mixer.music.unpause()
-
-    def hard_drop(self):
-            if not self.running or self.paused:
-                return
-            ghost_y = self.get_ghost_y()
-            self.piece_y = ghost_y
-            self.freeze_piece()
-            self.clear_lines()
-            self.spawn_piece()
-
-    def music_thread(self):
-            while True:
-                try:
-                    if self.game_state == "menu":
-                        time.sleep(1)
-                        continue
-
-                    if not hasattr(self, 'playlist') or not self.playlist:
-                        time.sleep(1)
-                        continue
-
-                    pygame.mixer.music.set_volume(self.game_music_volume)
-                    pygame.mixer.music.load(self.playlist[self.current_song_index])
-                    pygame.mixer.music.play()
-                except Exception as e:
-                    print(f"Erro ao tocar música: {e}")
-                    time.sleep(2)
-                    continue
-
-                while True:
-                    if self.skip_song:
-                        pygame.mixer.music.stop()
-                        self.skip_song = False
-                        break
-                    if not pygame.mixer.music.get_busy() and not self.music_paused:
-                        break
-                    time.sleep(0.1)
-
-                if hasattr(self, 'playlist') and self.playlist:
-                    self.current_song_index = (self.current_song_index + 1) % len(self.playlist)
+            self.music.set_paused(self.music_paused or self.paused)
 
 if __name__ == "__main__":
-    game = TetrisGame()
-    game.run()
-()
-
-
-if __name__ == '__main__':
-    game = TetrisGame()
+    # --audio low|medium|safe escolhe o buffer do mixer (padrão: low)
+    audio_profile = "low"
+    if "--audio" in sys.argv[1:-1]:
+        audio_profile = sys.argv[sys.argv.index("--audio") + 1]
+    game = TetrisGame(audio_profile)
+    # python base_tetris.py --replay partida.trp reproduz uma partida gravada;
+    # --autoplay começa direto com o jogador automático
+    if "--replay" in sys.argv[1:-1]:
+        game.start_replay(sys.argv[sys.argv.index("--replay") + 1])
+    elif "--autoplay" in sys.argv[1:]:
+        game.start_autoplay()
+    # --puzzle [semente] começa num quebra-cabeça de perfect clear
+    elif "--puzzle" in sys.argv[1:]:
+        index = sys.argv.index("--puzzle") + 1
+        seed = sys.argv[index] if index < len(sys.argv) else ""
+        game.start_puzzle(int(seed) if seed.isdigit() else 0)
+    # --finesse liga o treino de finesse desde o início
+    if "--finesse" in sys.argv[1:]:
+        game.toggle_finesse()
     game.run()
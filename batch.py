@@ -0,0 +1,237 @@
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from autoplay import AutoPlayer
+from tetris_engine import TetrisEngine, ACTIONS, ACTION_NONE
+
+# Simulação de muitas partidas em paralelo, sem janela nem áudio.
+#
+#   python batch.py --games 200 --workers 4 --output jogos.jsonl --summary resumo.json
+#
+# Cada partida usa uma semente (--seed + índice) e uma política ("ai" =
+# AutoPlayer, "random" = ações aleatórias). O tempo é simulado: o jogador age a
+# cada --action-delay segundos e a gravidade cai no atraso do nível, como no
+# jogo, então as curvas de velocidade influenciam o resultado. As sementes são
+# divididas em lotes entre os processos. Cada lote volta ao processo principal
+# assim que termina, e as partidas vão sendo gravadas e agregadas.
+
+METRICS = ("score", "lines", "level", "pieces", "sim_time", "wall_time")
+
+
+def make_engine(seed, config):
+    engine = TetrisEngine(seed=seed)
+    # Variações das curvas (atributos de classe do engine) só nesta instância
+    for key in ("line_scores", "lines_per_level", "gravity_start", "gravity_step",
+                "gravity_min"):
+        if config.get(key) is not None:
+            setattr(engine, key, config[key])
+    engine.start(seed)
+    return engine
+
+
+def play_game(seed, config):
+    start = time.perf_counter()
+    engine = make_engine(seed, config)
+    policy = config["policy"]
+    ai = AutoPlayer(engine, lookahead=config.get("lookahead", False)) if policy == "ai" else None
+    rng = random.Random(seed)
+
+    # Linha do tempo simulada: próxima ação do jogador e próxima queda
+    action_delay = config["action_delay"]
+    next_action = action_delay
+    next_tick = engine.gravity_delay()
+    now = 0.0
+    max_pieces = config["max_pieces"]
+    while not engine.game_over and engine.pieces_placed < max_pieces:
+        if next_action <= next_tick:
+            now = next_action
+            if ai is not None:
+                if not engine.step(ai.next_action()):
+                    ai.invalidate()
+            else:
+                engine.step(rng.choice(ACTIONS[1:]) if rng.random() < 0.9 else ACTION_NONE)
+            next_action += action_delay
+        else:
+            now = next_tick
+            engine.tick()
+            next_tick += engine.gravity_delay()
+
+    return {
+        "seed": seed,
+        "score": engine.score,
+        "lines": engine.lines_cleared,
+        "level": engine.level,
+        "pieces": engine.pieces_placed,
+        "ticks": engine.ticks,
+        "game_over": engine.game_over,
+        "sim_time": round(now, 3),
+        "wall_time": round(time.perf_counter() - start, 4),
+    }
+
+
+def play_chunk(seeds, config):
+    return [play_game(seed, config) for seed in seeds]
+
+
+def chunks(seeds, size):
+    for i in range(0, len(seeds), size):
+        yield seeds[i:i + size]
+
+
+def distribution(values):
+    # None sem nenhum valor (nenhuma partida terminou)
+    if not values:
+        return None
+    values = sorted(values)
+    n = len(values)
+
+    def pct(p):
+        return values[min(n - 1, int(p / 100 * n))]
+
+    return {
+        "mean": statistics.fmean(values),
+        "stdev": statistics.pstdev(values),
+        "min": values[0],
+        "p10": pct(10),
+        "p50": pct(50),
+        "p90": pct(90),
+        "max": values[-1],
+    }
+
+
+def histogram(values, bins=10, width=40):
+    # Histograma em texto, para o terminal
+    if not values:
+        return []
+    low, high = min(values), max(values)
+    if low == high:
+        return [f"{low:>10.0f} | {'#' * width} {len(values)}"]
+    step = (high - low) / bins
+    counts = [0] * bins
+    for value in values:
+        counts[min(bins - 1, int((value - low) / step))] += 1
+    top = max(counts)
+    return [f"{low + i * step:>10.0f} | {'#' * round(count / top * width):<{width}} {count}"
+            for i, count in enumerate(counts)]
+
+
+def summarize(results):
+    summary = {metric: distribution([r[metric] for r in results]) for metric in METRICS}
+    summary["games"] = len(results)
+    summary["game_over_rate"] = (sum(r["game_over"] for r in results) / len(results)
+                                 if results else 0.0)
+    return summary
+
+
+def run(args):
+    seeds = list(range(args.seed, args.seed + args.games))
+    workers = args.workers or os.cpu_count() or 1
+    # Lotes pequenos o bastante para equilibrar a carga (partidas têm durações
+    # bem diferentes) e grandes o bastante para diluir o custo de cada envio
+    size = args.chunk or max(1, len(seeds) // (workers * 8))
+    config = {
+        "policy": args.policy,
+        "lookahead": args.lookahead,
+        "action_delay": args.action_delay,
+        "max_pieces": args.max_pieces,
+        "line_scores": ({i + 1: int(v) for i, v in enumerate(args.line_scores.split(","))}
+                        if args.line_scores else None),
+        "lines_per_level": args.lines_per_level,
+        "gravity_start": args.gravity_start,
+        "gravity_step": args.gravity_step,
+        "gravity_min": args.gravity_min,
+    }
+
+    results = []
+    out = open(args.output, "w") if args.output else None
+    start = time.perf_counter()
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(play_chunk, chunk, config) for chunk in chunks(seeds, size)]
+            for future in as_completed(futures):
+                for result in future.result():
+                    results.append(result)
+                    if out is not None:
+                        out.write(json.dumps(result) + "\n")
+                    if args.verbose:
+                        print(f"semente {result['seed']}: {result['score']} pontos, "
+                              f"{result['lines']} linhas, nível {result['level']}, "
+                              f"{result['pieces']} peças")
+                if out is not None:
+                    out.flush()
+                print(f"\r{len(results)}/{len(seeds)} partidas", end="", file=sys.stderr)
+    finally:
+        if out is not None:
+            out.close()
+    elapsed = time.perf_counter() - start
+    print(file=sys.stderr)
+
+    results.sort(key=lambda r: r["seed"])
+    summary = summarize(results)
+    summary["workers"] = workers
+    summary["chunk"] = size
+    summary["elapsed"] = elapsed
+    summary["games_per_second"] = len(results) / elapsed
+    summary["config"] = {k: v for k, v in config.items() if v is not None}
+
+    if args.summary:
+        with open(args.summary, "w") as f:
+            json.dump(summary, f, indent=2)
+
+    print(f"{len(results)} partidas em {elapsed:.1f} s com {workers} processo(s) "
+          f"({summary['games_per_second']:.1f} partidas/s, lotes de {size})")
+    if not results:
+        print("nenhuma partida para resumir")
+        return summary
+    print(f"game over em {summary['game_over_rate'] * 100:.0f}% "
+          f"(o resto parou em {args.max_pieces} peças)")
+    print(f"{'métrica':<10}{'média':>10}{'desvio':>10}{'mín':>9}{'p10':>9}{'p50':>9}"
+          f"{'p90':>9}{'máx':>9}")
+    for metric in METRICS:
+        d = summary[metric]
+        print(f"{metric:<10}{d['mean']:>10.1f}{d['stdev']:>10.1f}{d['min']:>9.0f}"
+              f"{d['p10']:>9.0f}{d['p50']:>9.0f}{d['p90']:>9.0f}{d['max']:>9.0f}")
+    print("\nscore:")
+    for line in histogram([r["score"] for r in results]):
+        print(line)
+    return summary
+
+
+def positive_int(text):
+    value = int(text)
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"precisa ser pelo menos 1: {value}")
+    return value
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Simula partidas em lote, em paralelo")
+    parser.add_argument("--games", type=positive_int, default=100)
+    parser.add_argument("--seed", type=int, default=0, help="semente da primeira partida")
+    parser.add_argument("--workers", type=positive_int, help="processos (padrão: número de núcleos)")
+    parser.add_argument("--chunk", type=positive_int, help="partidas por lote enviado a um processo")
+    parser.add_argument("--policy", choices=("ai", "random"), default="ai")
+    parser.add_argument("--lookahead", action="store_true", help="IA olha a próxima peça")
+    parser.add_argument("--action-delay", type=float, default=0.05,
+                        help="segundos simulados entre ações do jogador")
+    parser.add_argument("--max-pieces", type=positive_int, default=1000,
+                        help="encerra a partida depois de tantas peças")
+    parser.add_argument("--line-scores", help="pontos por 1,2,3,4 linhas (ex.: 100,300,500,800)")
+    parser.add_argument("--lines-per-level", type=positive_int)
+    parser.add_argument("--gravity-start", type=float)
+    parser.add_argument("--gravity-step", type=float)
+    parser.add_argument("--gravity-min", type=float)
+    parser.add_argument("--output", help="JSONL com uma linha por partida")
+    parser.add_argument("--summary", help="JSON com as distribuições agregadas")
+    parser.add_argument("--verbose", action="store_true")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    run(parse_args())
@@ -0,0 +1,116 @@
+import os
+import random
+import sys
+import time
+
+# Permite rodar direto da raiz: python benchmarks/bench_bitboard.py
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tetris_engine import (BOARD_WIDTH, BOARD_HEIGHT, SHAPES, TetrisEngine,
+                           row_masks)
+
+# Microbenchmark: colisão e detecção de linhas com o bitboard do engine
+# contra a versão antiga baseada na grade de listas.
+
+
+def list_valid_position(board, x, y, shape):
+    # Implementação original de TetrisGame.valid_position
+    if shape is None:
+        return False
+
+    for i, row in enumerate(shape):
+        for j, cell in enumerate(row):
+            if cell:
+                nx, ny = x + j, y + i
+                if nx < 0 or nx >= BOARD_WIDTH or ny < 0 or ny >= BOARD_HEIGHT:
+                    return False
+                if board[ny][nx]:
+                    return False
+    return True
+
+
+def list_full_rows(board):
+    # Detecção de linhas completas original de TetrisGame.clear_lines
+    return [i for i, row in enumerate(board) if all(cell != '' for cell in row)]
+
+
+def make_board(filled_rows, seed=1):
+    rng = random.Random(seed)
+    board = [['' for _ in range(BOARD_WIDTH)] for _ in range(BOARD_HEIGHT)]
+    for y in range(BOARD_HEIGHT - filled_rows, BOARD_HEIGHT):
+        hole = rng.randrange(BOARD_WIDTH)
+        for x in range(BOARD_WIDTH):
+            if x != hole:
+                board[y][x] = rng.choice(list(SHAPES.keys()))
+    return board
+
+
+def all_orientations():
+    shapes = []
+    for shape in SHAPES.values():
+        for _ in range(4):
+            shapes.append(shape)
+            shape = [list(row) for row in zip(*shape[::-1])]
+    return shapes
+
+
+def best_of(func, repeat=5):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def run(rounds=20):
+    shapes = all_orientations()
+    positions = [(x, y) for y in range(-1, BOARD_HEIGHT) for x in range(-1, BOARD_WIDTH)]
+    checks = rounds * len(shapes) * len(positions)
+    results = []
+
+    for name, filled in (("vazio", 0), ("meio cheio", BOARD_HEIGHT // 2),
+                         ("quase no topo", BOARD_HEIGHT - 2)):
+        board = make_board(filled)
+        engine = TetrisEngine()
+        engine.set_board(board)
+        masked = [(row_masks(shape), len(shape[0])) for shape in shapes]
+
+        def old_collision():
+            for _ in range(rounds):
+                for shape in shapes:
+                    for x, y in positions:
+                        list_valid_position(board, x, y, shape)
+
+        def new_collision():
+            fits = engine.fits
+            for _ in range(rounds):
+                for masks, width in masked:
+                    for x, y in positions:
+                        fits(x, y, masks, width)
+
+        def old_rows():
+            for _ in range(rounds * 100):
+                list_full_rows(board)
+
+        def new_rows():
+            rows = engine.rows
+            full = (1 << BOARD_WIDTH) - 1
+            for _ in range(rounds * 100):
+                [i for i, row in enumerate(rows) if row == full]
+
+        old_c, new_c = best_of(old_collision), best_of(new_collision)
+        old_r, new_r = best_of(old_rows), best_of(new_rows)
+        results.append((name, checks / old_c, checks / new_c, old_r / new_r))
+
+    print(f"{'tabuleiro':<15}{'listas (chk/s)':>18}{'bitboard (chk/s)':>20}"
+          f"{'colisão':>10}{'linhas':>10}")
+    for name, old_rate, new_rate, rows_speedup in results:
+        print(f"{name:<15}{old_rate:>18,.0f}{new_rate:>20,.0f}"
+              f"{new_rate / old_rate:>9.1f}x{rows_speedup:>9.1f}x")
+    return results
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,97 @@
+import os
+import sys
+import time
+
+# Permite rodar direto da raiz: python benchmarks/bench_gravity.py [quedas por nível]
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gravity import GravityScheduler
+from tetris_engine import TetrisEngine
+
+# Precisão da gravidade por nível, em tempo real.
+# - agendador: loop de 60 FPS com o mesmo esquema de espera do run()
+#   (dorme até o fim do quadro ou até o próximo prazo); mede o atraso de cada
+#   queda em relação ao prazo exato.
+# - antigo: o laço do gravity_thread (sleep(gravity_delay) + tick); mede o
+#   desvio acumulado em relação a início + k * atraso.
+
+FRAME_TIME = 1 / 60
+FRAME_WORK = 0.004  # Custo simulado de desenhar um quadro
+LEVELS = range(1, 16)
+
+
+def busy(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def fresh_engine(level):
+    engine = TetrisEngine()
+    engine.start()
+    engine.level = level
+    return engine
+
+
+def run_scheduler(gravity, level, drops):
+    # As quedas ficam no histórico do agendador, separadas por nível
+    engine = gravity.engine
+    engine.start()
+    engine.level = level
+    gravity.reset()
+    target = len(gravity.history) + drops
+    while len(gravity.history) < target:
+        frame_start = time.perf_counter()
+        gravity.update()
+        if engine.game_over:
+            engine.start()
+            engine.level = level
+        busy(FRAME_WORK)
+        frame_end = min(frame_start + FRAME_TIME, gravity.next_deadline())
+        delay = frame_end - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+
+
+def run_old(level, drops):
+    engine = fresh_engine(level)
+    start = time.perf_counter()
+    ideal = start
+    drift = []
+    for _ in range(drops):
+        gravity_delay = engine.gravity_delay()
+        time.sleep(gravity_delay)
+        ideal += gravity_delay
+        drift.append(time.perf_counter() - ideal)
+        engine.tick()
+        if engine.game_over:
+            engine.start()
+            engine.level = level
+    return drift
+
+
+def summary(values):
+    values = sorted(values)
+    p99 = values[min(len(values) - 1, int(len(values) * 0.99))]
+    return sum(values) / len(values) * 1000, p99 * 1000, values[-1] * 1000
+
+
+def run(drops=5):
+    print(f"{drops} quedas por nível (ms)")
+    print(f"{'nível':>5}{'atraso':>9}{'agendador média/p99/máx':>28}{'antigo média/máx':>22}")
+    gravity = GravityScheduler(TetrisEngine(), history=drops * len(LEVELS))
+    old = {}
+    for level in LEVELS:
+        run_scheduler(gravity, level, drops)
+        old[level] = summary(run_old(level, drops))
+    # O mesmo relatório por nível que o jogo mostra ao sair (GravityScheduler.jitter)
+    for level, (_, new_mean, new_p99, new_max) in gravity.jitter().items():
+        delay = fresh_engine(level).gravity_delay()
+        old_mean, _, old_max = old.get(level, (0.0, 0.0, 0.0))
+        print(f"{level:>5}{delay * 1000:>9.0f}"
+              f"{new_mean * 1000:>12.3f}{new_p99 * 1000:>8.3f}{new_max * 1000:>8.3f}"
+              f"{old_mean:>14.3f}{old_max:>8.3f}")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
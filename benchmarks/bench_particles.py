@@ -0,0 +1,103 @@
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+# Permite rodar direto da raiz: python benchmarks/bench_particles.py
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+
+from particles import ParticleSystem
+
+# Benchmark do sistema de partículas: 5.000 partículas simultâneas,
+# atualização + desenho por quadro, contra a versão antiga com um objeto
+# Particle e uma Surface nova por partícula a cada quadro.
+
+PARTICLES = 5000
+FRAMES = 30
+COLORS = [(0, 240, 240), (247, 211, 0), (173, 77, 156), (66, 182, 66),
+          (239, 51, 64), (0, 101, 182), (239, 121, 33)]
+
+
+class OldParticle:
+    # Particle original de base_tetris.py
+    def __init__(self, x, y, color):
+        self.x = x
+        self.y = y
+        self.color = color[:3]
+        self.size = random.randint(5, 10)
+        self.speed_x = random.uniform(-3, 3)
+        self.speed_y = random.uniform(-6, -2)
+        self.lifetime = random.randint(40, 80)
+        self.alpha = 255
+
+    def update(self):
+        self.x += self.speed_x
+        self.y += self.speed_y
+        self.lifetime -= 1
+        self.alpha = max(0, self.alpha - 3)
+        self.speed_y += 0.2
+        return self.lifetime > 0 and self.alpha > 0
+
+
+def spawn_points(count):
+    rng = random.Random(7)
+    return [(rng.randint(150, 450), rng.randint(60, 720), COLORS[i % len(COLORS)])
+            for i in range(count // 5)]
+
+
+def bench_old(surface):
+    particles = [OldParticle(x, y, color)
+                 for x, y, color in spawn_points(PARTICLES) for _ in range(5)]
+    start = time.perf_counter()
+    for _ in range(FRAMES):
+        particles = [p for p in particles if p.update()]
+        for p in particles:
+            surf = pygame.Surface((p.size * 2, p.size * 2), pygame.SRCALPHA)
+            pygame.draw.circle(surf, (*p.color, p.alpha), (p.size, p.size), p.size)
+            surface.blit(surf, (int(p.x - p.size), int(p.y - p.size)))
+    return (time.perf_counter() - start) / FRAMES
+
+
+def bench_new(surface):
+    system = ParticleSystem(capacity=PARTICLES, seed=7)
+    for x, y, color in spawn_points(PARTICLES):
+        system.emit(x, y, color, 5)
+    # Primeiro quadro preenche o cache de sprites
+    system.update()
+    system.draw(surface)
+
+    update_time = draw_time = 0.0
+    for _ in range(FRAMES):
+        start = time.perf_counter()
+        system.update()
+        middle = time.perf_counter()
+        system.draw(surface)
+        end = time.perf_counter()
+        update_time += middle - start
+        draw_time += end - middle
+    return update_time / FRAMES, draw_time / FRAMES, system.count
+
+
+def run():
+    pygame.init()
+    surface = pygame.Surface((600, 800))
+
+    old = bench_old(surface)
+    update, draw, alive = bench_new(surface)
+    new = update + draw
+
+    print(f"{PARTICLES} partículas, média de {FRAMES} quadros")
+    print(f"  antigo (Particle + Surface por partícula): {old * 1000:8.2f} ms/quadro")
+    print(f"  ParticleSystem:                            {new * 1000:8.2f} ms/quadro "
+          f"(update {update * 1000:.2f} ms, draw {draw * 1000:.2f} ms, {alive} vivas)")
+    print(f"  ganho: {old / new:.1f}x")
+    return old, new
+
+
+if __name__ == "__main__":
+    run()
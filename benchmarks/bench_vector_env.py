@@ -0,0 +1,63 @@
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+# Permite rodar direto da raiz: python benchmarks/bench_vector_env.py [tabuleiros]
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tetris_engine import BOARD_WIDTH, ROTATIONS, TetrisEngine
+from vector_env import NUM_ACTIONS, PLACEMENTS, VectorTetris
+
+# Jogadas por segundo (tabuleiro-passos) do VectorTetris para vários tamanhos
+# de lote, com e sem action_mask(), contra o TetrisEngine jogando uma partida
+# de cada vez as mesmas jogadas (girar, mover, hard drop).
+
+STEPS = 50
+
+
+def engine_rate(steps=20000, seed=1):
+    rng = random.Random(seed)
+    engine = TetrisEngine(seed=seed)
+    engine.start(seed)
+    start = time.perf_counter()
+    for _ in range(steps):
+        if engine.game_over:
+            engine.start(rng.randrange(1 << 32))
+        placement = rng.randrange(PLACEMENTS)
+        rotation = ROTATIONS[engine.current_shape][placement // BOARD_WIDTH]
+        engine.set_piece(engine.current_shape, placement // BOARD_WIDTH)
+        x = min(placement % BOARD_WIDTH, BOARD_WIDTH - rotation.width)
+        if engine.fits(x, 0, rotation.masks, rotation.width):
+            engine.piece_x = x
+        engine.hard_drop()
+    return steps / (time.perf_counter() - start)
+
+
+def vector_rate(num_envs, masked, seed=1):
+    env = VectorTetris(num_envs, seed=seed)
+    env.reset()
+    rng = np.random.default_rng(seed)
+    actions = rng.integers(0, NUM_ACTIONS, (STEPS, num_envs))
+    start = time.perf_counter()
+    for step_actions in actions:
+        if masked:
+            # Uma ação válida sorteada por tabuleiro
+            scores = rng.random((num_envs, NUM_ACTIONS)) * env.action_mask()
+            step_actions = scores.argmax(axis=1)
+        env.step(step_actions)
+    return STEPS * num_envs / (time.perf_counter() - start)
+
+
+def run(sizes):
+    print(f"TetrisEngine, uma partida por vez: {engine_rate():>12,.0f} jogadas/s")
+    print(f"{'tabuleiros':>10} {'jogadas/s':>14} {'com máscara':>14}")
+    for size in sizes:
+        print(f"{size:>10} {vector_rate(size, False):>14,.0f} {vector_rate(size, True):>14,.0f}")
+
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or [64, 256, 1024, 4096]
+    run(sizes)
@@ -0,0 +1,407 @@
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Permite rodar direto da raiz: python benchmarks/suite.py
+sys.path.insert(0, ROOT)
+
+# Suíte de benchmarks dos caminhos quentes do engine e da renderização.
+#
+#   python benchmarks/suite.py --output base.json
+#   python benchmarks/suite.py --compare base.json --threshold 0.15
+#
+# Cada caso roda ROUNDS rodadas de pelo menos ROUND_TIME segundos (o número de
+# iterações é calibrado antes), com o coletor de lixo desligado, e guarda a
+# mediana e o mínimo por iteração. Com --compare, casos cuja mediana piorou
+# mais que --threshold são marcados como regressão e o script sai com 1.
+# Com --quick (3 rodadas) a dispersão passa do limite, então a comparação só
+# é mostrada e nunca reprova.
+
+ROUNDS = 7
+ROUND_TIME = 0.05
+STARTUP_RUNS = 5
+
+
+# ----------------------------------------------------------------------
+# Medição
+# ----------------------------------------------------------------------
+def measure(case, rounds=ROUNDS, round_time=ROUND_TIME):
+    # case(n) roda n iterações e devolve o tempo gasto (sem o preparo)
+    case(1)
+    number = 1
+    while True:
+        elapsed = case(number)
+        if elapsed >= round_time / 4 or number >= 1 << 20:
+            break
+        number *= 2
+    number = max(1, int(number * round_time / max(elapsed, 1e-9)))
+
+    samples = []
+    gc_was_enabled = gc.isenabled()
+    gc.collect()
+    gc.disable()
+    try:
+        for _ in range(rounds):
+            samples.append(case(number) / number)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+    median = statistics.median(samples)
+    return {
+        "unit": "us",
+        "median": median * 1e6,
+        "min": min(samples) * 1e6,
+        # Dispersão relativa entre as rodadas (máx - mín) / mediana
+        "spread": (max(samples) - min(samples)) / median if median else 0.0,
+        "rounds": rounds,
+        "number": number,
+    }
+
+
+# ----------------------------------------------------------------------
+# Engine
+# ----------------------------------------------------------------------
+def make_board(filled_rows, full_rows=0, seed=1):
+    from tetris_engine import BOARD_WIDTH, BOARD_HEIGHT, SHAPE_NAMES
+    rng = random.Random(seed)
+    board = [['' for _ in range(BOARD_WIDTH)] for _ in range(BOARD_HEIGHT)]
+    for y in range(BOARD_HEIGHT - filled_rows, BOARD_HEIGHT):
+        hole = rng.randrange(BOARD_WIDTH) if y >= BOARD_HEIGHT - filled_rows + full_rows else None
+        for x in range(BOARD_WIDTH):
+            if x != hole:
+                board[y][x] = rng.choice(SHAPE_NAMES)
+    return board
+
+
+def board_fills():
+    from tetris_engine import BOARD_HEIGHT
+    return (("vazio", 0), ("meio", BOARD_HEIGHT // 2), ("topo", BOARD_HEIGHT - 4))
+
+
+def engine_cases():
+    from tetris_engine import (BOARD_WIDTH, BOARD_HEIGHT, ROTATIONS, TetrisEngine)
+    cases = {}
+    for name, filled in board_fills():
+        board = make_board(filled)
+        engine = TetrisEngine(seed=1)
+        engine.start(1)
+        engine.set_board(board)
+        engine.set_piece('T')
+        engine.piece_x, engine.piece_y = 4, 0
+
+        args = [(x, y, rotation.matrix)
+                for rotation in ROTATIONS['T']
+                for y in range(-1, BOARD_HEIGHT) for x in range(-1, BOARD_WIDTH)]
+
+        def valid_position(n, engine=engine, args=args):
+            valid = engine.valid_position
+            count = len(args)
+            start = time.perf_counter()
+            for i in range(n):
+                x, y, shape = args[i % count]
+                valid(x, y, shape)
+            return time.perf_counter() - start
+
+        def rotate(n, engine=engine):
+            rotate = engine.rotate
+            start = time.perf_counter()
+            for _ in range(n):
+                rotate()
+            return time.perf_counter() - start
+
+        def ghost(n, engine=engine):
+            # Sem cache: cada chamada vê uma versão nova do tabuleiro. A peça
+            # volta ao mesmo estado (o caso rotate a deixa girada)
+            engine.set_piece('T')
+            engine.piece_x, engine.piece_y = 4, 0
+            get_ghost_y = engine.get_ghost_y
+            start = time.perf_counter()
+            for _ in range(n):
+                engine.board_version += 1
+                get_ghost_y()
+            return time.perf_counter() - start
+
+        # Quatro linhas completas no fundo, mais o preenchimento do caso
+        clear_board = make_board(max(filled, 4), full_rows=4)
+        clear_engine = TetrisEngine(seed=1)
+
+        def clear_lines(n, engine=clear_engine, board=clear_board):
+            total = 0.0
+            for _ in range(n):
+                engine.set_board(board)
+                start = time.perf_counter()
+                engine.clear_lines()
+                total += time.perf_counter() - start
+            return total
+
+        cases[f"engine.valid_position[{name}]"] = valid_position
+        cases[f"engine.rotate[{name}]"] = rotate
+        cases[f"engine.get_ghost_y[{name}]"] = ghost
+        cases[f"engine.clear_lines[{name}]"] = clear_lines
+    return cases
+
+
+def ai_cases():
+    from autoplay import AutoPlayer
+    from tetris_engine import TetrisEngine
+    cases = {}
+    for name, filled in board_fills():
+        engine = TetrisEngine(seed=1)
+        engine.start(1)
+        engine.set_board(make_board(filled))
+        engine.set_piece('T')
+        engine.piece_x, engine.piece_y = 4, 0
+
+        def search(n, engine=engine):
+            # Busca completa da jogada (peça atual + hold)
+            ai = AutoPlayer(engine)
+            start = time.perf_counter()
+            for _ in range(n):
+                ai.search()
+            return time.perf_counter() - start
+
+        cases[f"ai.search[{name}]"] = search
+    return cases
+
+
+# ----------------------------------------------------------------------
+# Renderização
+# ----------------------------------------------------------------------
+def make_game():
+    import base_tetris
+    from particles import ParticleSystem
+    game = base_tetris.TetrisGame()
+    game.particles = ParticleSystem(capacity=5000, seed=1)
+    return game
+
+
+def prepare_game(game, board):
+    # Partida em andamento sem passar pelo menu (o game_state continua "menu"
+    # e o run() não roda, então nenhuma música toca). O desenho lê só o
+    # snapshot da simulação: o tabuleiro trocado aqui precisa ser publicado
+    game.simulation.start(1)
+    game.engine.set_board(board)
+    game.simulation.publish()
+    game.running = True
+    game.paused = False
+    game.start_time = time.time()
+    game.total_pause_duration = 0
+    game.game_over_time = None
+    game.particles.clear()
+    game.invalidate_layers()
+
+
+def render_cases(game):
+    import base_tetris
+    from tetris_engine import ACTION_LEFT, ACTION_RIGHT
+    cases = {}
+    empty = make_board(0)
+    full = make_board(board_fills()[2][1])
+
+    def animate(frame):
+        # Peça andando (pela fila, como no jogo), animação de rotação e
+        # partículas vivas
+        simulation = game.simulation
+        simulation.step(ACTION_RIGHT if frame % 16 < 8 else ACTION_LEFT)
+        simulation.process()
+        if frame % 8 == 0:
+            game.rotate_angle = 15
+        if game.particles.count < 150:
+            for x in range(10):
+                game.particles.emit(base_tetris.SIDEBAR_WIDTH + 15 + x * base_tetris.BLOCK_SIZE,
+                                    base_tetris.PANEL_HEIGHT + 600, (0, 240, 240), 5)
+
+    for name, board in (("vazio", empty), ("cheio", full)):
+        def incremental(n, board=board):
+            prepare_game(game, board)
+            game.draw_board()
+            total = 0.0
+            for frame in range(n):
+                animate(frame)
+                start = time.perf_counter()
+                game.draw_board()
+                total += time.perf_counter() - start
+            return total
+
+        def full_frame(n, board=board):
+            prepare_game(game, board)
+            total = 0.0
+            for frame in range(n):
+                animate(frame)
+                game.invalidate_layers()
+                start = time.perf_counter()
+                game.draw_board()
+                total += time.perf_counter() - start
+            return total
+
+        cases[f"render.draw_board[{name}]"] = incremental
+        cases[f"render.draw_board_full[{name}]"] = full_frame
+
+    def menu(n):
+        random.seed(1)
+        menu = base_tetris.Menu(game.screen_width, game.screen_height, game)
+        start = time.perf_counter()
+        for _ in range(n):
+            menu.update()
+            menu.draw(game.screen)
+        return time.perf_counter() - start
+
+    cases["render.menu_frame"] = menu
+    return cases
+
+
+STARTUP_SCRIPT = """
+import sys
+sys.path.insert(0, {root!r})
+import pygame
+import base_tetris
+game = base_tetris.TetrisGame()
+game.screen.fill(base_tetris.COLORS[''])
+game.menu.draw(game.screen)
+pygame.display.flip()
+print("frame", flush=True)
+import os
+os._exit(0)
+"""
+
+
+def startup():
+    # Processo novo até o primeiro quadro do menu na tela
+    samples = []
+    script = STARTUP_SCRIPT.format(root=ROOT)
+    for _ in range(STARTUP_RUNS):
+        start = time.perf_counter()
+        process = subprocess.Popen([sys.executable, "-c", script], cwd=ROOT,
+                                   stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                                   text=True)
+        for line in process.stdout:
+            if line.strip() == "frame":
+                break
+        elapsed = time.perf_counter() - start
+        process.wait()
+        if process.returncode != 0:
+            raise RuntimeError("o jogo não chegou ao primeiro quadro")
+        samples.append(elapsed)
+    median = statistics.median(samples)
+    return {
+        "unit": "ms",
+        "median": median * 1e3,
+        "min": min(samples) * 1e3,
+        "spread": (max(samples) - min(samples)) / median,
+        "rounds": len(samples),
+        "number": 1,
+    }
+
+
+# ----------------------------------------------------------------------
+# Relatório
+# ----------------------------------------------------------------------
+def metadata():
+    meta = {
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+    }
+    try:
+        import pygame
+        meta["pygame"] = pygame.version.ver
+    except ImportError:
+        pass
+    try:
+        import numpy
+        meta["numpy"] = numpy.__version__
+    except ImportError:
+        pass
+    try:
+        meta["commit"] = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                                        capture_output=True, text=True).stdout.strip()
+    except OSError:
+        pass
+    return meta
+
+
+def compare(results, baseline, threshold):
+    # Lista de (caso, razão nova/antiga, regressão?)
+    rows = []
+    for name, result in results.items():
+        old = baseline.get("results", {}).get(name)
+        if old is None or not old.get("median"):
+            continue
+        ratio = result["median"] / old["median"]
+        rows.append((name, ratio, ratio > 1 + threshold))
+    return rows
+
+
+def run(args):
+    results = {}
+
+    def selected(name):
+        return not args.filter or any(f in name for f in args.filter)
+
+    def report(name, result):
+        results[name] = result
+        print(f"{name:<40}{result['median']:>12.2f} {result['unit']:<3}"
+              f"  (mín {result['min']:.2f}, dispersão {result['spread'] * 100:.0f}%)")
+
+    rounds = 3 if args.quick else ROUNDS
+    for name, case in {**engine_cases(), **ai_cases()}.items():
+        if selected(name):
+            report(name, measure(case, rounds))
+
+    if any(selected(name) for name in ("render.draw_board", "render.draw_board_full",
+                                        "render.menu_frame")):
+        game = make_game()
+        for name, case in render_cases(game).items():
+            if selected(name):
+                report(name, measure(case, rounds))
+
+    if selected("startup.first_frame"):
+        report("startup.first_frame", startup())
+
+    data = {"meta": metadata(), "results": results}
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(data, f, indent=2, sort_keys=True)
+        print(f"resultados salvos em {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = 0
+        note = ", só informativa com --quick" if args.quick else ""
+        print(f"\ncomparação com {args.compare} (limite +{args.threshold * 100:.0f}%{note})")
+        for name, ratio, regressed in compare(results, baseline, args.threshold):
+            regressions += regressed
+            flag = "  REGRESSÃO" if regressed else ""
+            print(f"{name:<40}{(ratio - 1) * 100:>+8.1f}%{flag}")
+        return 1 if regressions and not args.quick else 0
+    return 0
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks do engine e da renderização")
+    parser.add_argument("--output", help="arquivo JSON para salvar os resultados")
+    parser.add_argument("--compare", help="JSON de uma execução anterior para comparar")
+    parser.add_argument("--threshold", type=float, default=0.15,
+                        help="piora relativa aceita antes de marcar regressão (0.15 = 15%%)")
+    parser.add_argument("--filter", action="append",
+                        help="roda só os casos cujo nome contém o texto (pode repetir)")
+    parser.add_argument("--quick", action="store_true", help="menos rodadas por caso (a comparação não reprova)")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    sys.exit(run(parse_args()))
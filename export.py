@@ -0,0 +1,207 @@
+import argparse
+import os
+import struct
+import sys
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+
+from replay import Replay, ReplayPlayer
+from simulation import Simulation
+from tetris_engine import TetrisEngine
+
+# Exportação de replays para vídeo, sem janela e sem captura de tela.
+#
+#   python export.py partida.trp --format png --output quadros/
+#   python export.py partida.trp --format raw --output partida.rgb --workers 4
+#   ffmpeg -f rawvideo -pix_fmt rgb24 -s 600x800 -r 60 -i partida.rgb partida.mp4
+#
+# Os quadros saem do mesmo draw_board() do jogo, com o driver de vídeo
+# "dummy" do SDL, direto do game_surface (fora da tela). O tempo é o do
+# vídeo: o quadro n é o instante n / fps, tanto para o ReplayPlayer (quedas e
+# ações) quanto para o relógio do jogo (painel, efeito de linha).
+#
+# O intervalo de quadros é dividido em trechos contíguos, um por processo,
+# cada um com o seu TetrisGame e as suas superfícies. Um processo refaz a
+# partida do início só com o engine até WARMUP quadros antes do seu trecho e
+# então desenha: partículas (sorteadas com o número do quadro), giro e efeito
+# de linha chegam ao trecho iguais aos de uma exportação num processo só.
+#
+# PNG: um arquivo por quadro (quadro_000000.png...), gravado aqui com zlib no
+# nível 1: o pygame.image.save comprime no nível padrão e leva três vezes mais
+# que o desenho. raw: RGB 24 bits, os quadros em sequência num arquivo só;
+# cada processo escreve os seus na posição certa (os.pwrite), sem passar pelo
+# processo principal.
+
+FORMATS = ("png", "raw")
+WARMUP = 90  # Quadros desenhados antes do trecho (vida máxima das partículas: 80)
+TAIL = 2.0  # Segundos de vídeo depois do fim do replay (tela de game over)
+PNG_LEVEL = 1
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+def count_frames(replay, fps, tail=TAIL):
+    # Quadros até o replay acabar (pelo mesmo caminho do jogo: fila da
+    # simulação, processada a cada quadro), mais tail segundos
+    engine = TetrisEngine()
+    simulation = Simulation(engine)
+    simulation.start(replay.seed)
+    player = ReplayPlayer(replay, engine, simulation)
+    frame = 0
+    while not player.finished and not engine.game_over:
+        player.update(frame / fps)
+        simulation.process()
+        frame += 1
+    return frame + int(tail * fps)
+
+
+def png_chunk(kind, data):
+    return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+
+def write_png(path, rgb, width, height):
+    # PNG RGB 8 bits sem filtro (byte 0 no começo de cada linha)
+    stride = width * 3
+    rows = b"".join(b"\x00" + rgb[i:i + stride] for i in range(0, len(rgb), stride))
+    with open(path, "wb") as f:
+        f.write(PNG_SIGNATURE)
+        f.write(png_chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)))
+        f.write(png_chunk(b"IDAT", zlib.compress(rows, PNG_LEVEL)))
+        f.write(png_chunk(b"IEND", b""))
+
+
+def frame_size():
+    from base_tetris import GAME_WIDTH, GAME_HEIGHT
+    return GAME_WIDTH, GAME_HEIGHT
+
+
+def render_range(path, first, last, fps, fmt, output, base=0):
+    # Tarefa de um processo: desenha os quadros [first, last) e os grava (no
+    # raw, o quadro base é o primeiro do arquivo). Devolve (first, last,
+    # segundos desenhando o trecho, segundos refazendo a partida até ele,
+    # com os WARMUP quadros desenhados antes)
+    # Sempre sem janela e sem dispositivo de som, mesmo que o ambiente peça outro
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+    os.environ["SDL_AUDIODRIVER"] = "dummy"
+    import pygame
+    import base_tetris
+
+    game = base_tetris.TetrisGame(audio=False)
+    video_time = [0.0]
+    game.clock = lambda: video_time[0]
+    if not game.start_replay(path):
+        raise ValueError(f"não foi possível abrir {path}")
+
+    width, height = base_tetris.GAME_WIDTH, base_tetris.GAME_HEIGHT
+    frame_bytes = width * height * 3
+    fd = os.open(output, os.O_WRONLY) if fmt == "raw" else None
+    start = time.perf_counter()
+    warmup_start = max(0, first - WARMUP)
+    seek = 0.0
+    try:
+        for frame in range(last):
+            if frame == warmup_start:
+                # Partículas de antes não chegam vivas ao trecho
+                game.particles.clear()
+            if frame == first:
+                seek = time.perf_counter() - start
+            now = frame / fps
+            video_time[0] = now
+            game.particles.seed(frame)
+            if game.running:
+                game.replay_player.update(now)
+                game.simulation.process()
+            if frame < warmup_start:
+                continue
+            game.draw_board()
+            if frame < first:
+                continue
+            rgb = pygame.image.tobytes(game.game_surface, "RGB")
+            if fmt == "png":
+                write_png(os.path.join(output, f"quadro_{frame:06d}.png"), rgb, width, height)
+            else:
+                os.pwrite(fd, rgb, (frame - base) * frame_bytes)
+    finally:
+        if fd is not None:
+            os.close(fd)
+        game.assets.shutdown()
+        pygame.quit()
+    return first, last, time.perf_counter() - start - seek, seek
+
+
+def split(first, last, parts):
+    # Trechos contíguos de tamanhos quase iguais
+    total = last - first
+    bounds = [first + total * i // parts for i in range(parts + 1)]
+    return [(a, b) for a, b in zip(bounds, bounds[1:]) if b > a]
+
+
+def export(path, fmt="png", output=None, fps=60, workers=None, start=0.0, end=None,
+           tail=TAIL):
+    # Devolve (saída, [(first, last, desenhando, refazendo)] por processo,
+    # segundos no total, tamanho do quadro)
+    replay = Replay.load(path)
+    total = count_frames(replay, fps, tail)
+    first = min(total, int(start * fps))
+    last = total if end is None else min(total, int(end * fps))
+    if last <= first:
+        raise ValueError("intervalo de quadros vazio")
+
+    size = frame_size()
+    if output is None:
+        output = os.path.splitext(path)[0] + ("_quadros" if fmt == "png" else ".rgb")
+    if fmt == "png":
+        os.makedirs(output, exist_ok=True)
+    else:
+        # Arquivo já no tamanho final; cada processo escreve na sua posição
+        with open(output, "wb") as f:
+            f.truncate((last - first) * size[0] * size[1] * 3)
+
+    workers = (os.cpu_count() or 1) if workers is None else workers
+    began = time.perf_counter()
+    if workers == 0:
+        # Tudo aqui mesmo (o pygame fica aberto neste processo)
+        results = [render_range(path, first, last, fps, fmt, output, first)]
+    else:
+        ranges = split(first, last, workers)
+        with ProcessPoolExecutor(max_workers=len(ranges)) as pool:
+            futures = [pool.submit(render_range, path, a, b, fps, fmt, output, first)
+                       for a, b in ranges]
+            results = [future.result() for future in futures]
+    return output, results, time.perf_counter() - began, size
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Exporta um replay para PNG ou RGB cru")
+    parser.add_argument("replay")
+    parser.add_argument("--format", choices=FORMATS, default="png")
+    parser.add_argument("--output", help="pasta (png) ou arquivo (raw)")
+    parser.add_argument("--fps", type=int, default=60)
+    parser.add_argument("--workers", type=int, help="processos (0 = sem pool)")
+    parser.add_argument("--start", type=float, default=0.0, help="segundo inicial")
+    parser.add_argument("--end", type=float, help="segundo final")
+    parser.add_argument("--tail", type=float, default=TAIL, help="segundos depois do fim")
+    args = parser.parse_args(argv)
+
+    try:
+        output, results, elapsed, size = export(args.replay, args.format, args.output, args.fps,
+                                                args.workers, args.start, args.end, args.tail)
+    except (OSError, ValueError) as e:
+        print(f"{args.replay}: erro ao exportar: {e}")
+        return 1
+
+    frames = sum(last - first for first, last, _, _ in results)
+    for i, (first, last, drawing, seek) in enumerate(results):
+        print(f"  processo {i}: quadros {first}-{last - 1}, "
+              f"{(last - first) / drawing:,.0f} quadros/s (refazendo até o trecho: {seek * 1000:.0f} ms)")
+    print(f"{frames} quadros ({frames / args.fps:.1f} s de vídeo) em {elapsed:.1f} s: "
+          f"{frames / elapsed:,.0f} quadros/s, {frames / args.fps / elapsed:.1f}x o tempo real "
+          f"-> {output}")
+    if args.format == "raw":
+        print(f"  ffmpeg -f rawvideo -pix_fmt rgb24 -s {size[0]}x{size[1]} -r {args.fps} "
+              f"-i {output} video.mp4")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,243 @@
+import time
+from collections import OrderedDict, deque, namedtuple
+
+from tetris_engine import (BOARD_WIDTH, BOARD_HEIGHT, ROTATIONS, SHAPE_NAMES,
+                           ACTION_LEFT, ACTION_RIGHT, ACTION_DOWN, ACTION_ROTATE)
+
+# Finesse: menor número de teclas para levar a peça do spawn até onde ela
+# encaixou.
+#
+# Busca em largura sobre os estados (x, y, rotação) com as regras do engine
+# (girar sem "kicks", andar, descer uma linha) e o que o InputHandler faz com
+# a tecla segura: ←/→ seguras vão até encostar (DAS) e ↓ segura desce até o
+# chão, cada uma contando como uma tecla. A queda rápida final não conta. Um
+# destino é (orientação, x, y onde a peça para); rotações com a mesma matriz
+# (O, I/S/Z a 180°) são o mesmo destino.
+#
+# A busca fica em cache por (tabuleiro, peça): no tabuleiro vazio ela é feita
+# inteira no início para as 7 peças; nos outros, só até achar o destino
+# pedido, e o que foi explorado vai para um LRU.
+
+# Nome de cada entrada na dica (ASCII: a fonte padrão do pygame não tem setas)
+INPUT_NAMES = {
+    "left": "<", "right": ">", "das_left": "<<", "das_right": ">>",
+    "rotate": "gira", "down": "v", "soft_drop": "vv",
+}
+# Ações do engine que contam como tecla
+COUNTED = (ACTION_LEFT, ACTION_RIGHT, ACTION_DOWN, ACTION_ROTATE)
+EMPTY_ROWS = (0,) * BOARD_HEIGHT
+
+FinesseResult = namedtuple(
+    "FinesseResult", ["shape", "presses", "minimum", "extra", "inputs", "elapsed", "cached"])
+
+
+# Estados numerados: índice = (rotação * LINES + y) * STRIDE + x. A coluna
+# extra de cada linha e a linha extra de cada rotação ficam sempre ocupadas,
+# então x - 1, x + 1 e y + 1 fora do tabuleiro caem em posições bloqueadas.
+STRIDE = BOARD_WIDTH + 1
+LINES = BOARD_HEIGHT + 1
+LAYER = LINES * STRIDE
+MOVES = ("left", "right", "das_left", "das_right", "rotate", "down", "soft_drop")
+
+
+def piece_cells(piece):
+    # (linha, deslocamento) de cada célula: a célula j da linha i bate em x
+    # se o bit x + j da linha y + i está ocupado
+    return [(i, j) for i, mask in enumerate(piece.masks)
+            for j in range(piece.width) if mask >> j & 1]
+
+
+CELLS = {shape: [piece_cells(piece) for piece in states]
+         for shape, states in ROTATIONS.items()}
+
+
+class FinesseSearch:
+    # Busca a partir do spawn de uma peça num tabuleiro. Ela anda só o
+    # necessário: minimum() continua a busca até o destino pedido sair da
+    # fila (a primeira vez é a de menos teclas) e para ali; o que já foi
+    # explorado fica para as próximas perguntas.
+    def __init__(self, rows, shape):
+        self.shape = shape
+        self.matrices = [piece.matrix for piece in ROTATIONS[shape]]
+        self.targets = {}  # destino -> estado de onde a queda chega nele
+        self.parent = {}  # estado -> (estado anterior, entrada)
+        self.queue = deque()
+        self.expanded = 0
+        self.free = self.free_states(rows, shape)
+        start = ROTATIONS[shape][0].spawn_x
+        if self.free[start]:
+            self.parent[start] = None
+            self.queue.append(start)
+
+    @staticmethod
+    def free_states(rows, shape):
+        free = [False] * (4 * LAYER)
+        for r, piece in enumerate(ROTATIONS[shape]):
+            cells = CELLS[shape][r]
+            columns = (1 << (BOARD_WIDTH - piece.width + 1)) - 1
+            for y in range(BOARD_HEIGHT - piece.height + 1):
+                # Colunas x em que alguma célula bate, todas de uma vez
+                blocked = 0
+                for i, j in cells:
+                    blocked |= rows[y + i] >> j
+                open_x = columns & ~blocked
+                base = (r * LINES + y) * STRIDE
+                x = 0
+                while open_x:
+                    if open_x & 1:
+                        free[base + x] = True
+                    open_x >>= 1
+                    x += 1
+        return free
+
+    def expand(self, goal=None):
+        # Continua a busca até goal virar destino conhecido (ou até o fim)
+        free, parent, targets, queue = self.free, self.parent, self.targets, self.queue
+        matrices = self.matrices
+        while queue:
+            state = queue.popleft()
+            self.expanded += 1
+            landed = state
+            while free[landed + STRIDE]:
+                landed += STRIDE
+            left = state
+            while free[left - 1]:
+                left -= 1
+            right = state
+            while free[right + 1]:
+                right += 1
+            rotated = state + LAYER if state < 3 * LAYER else state - 3 * LAYER
+            for name, move in zip(MOVES, (state - 1, state + 1, left, right,
+                                          rotated, state + STRIDE, landed)):
+                if free[move] and move not in parent:
+                    parent[move] = (state, name)
+                    queue.append(move)
+
+            r, rest = divmod(landed, LAYER)
+            target = (matrices[r], rest % STRIDE, rest // STRIDE)
+            if target not in targets:
+                targets[target] = state
+                if target == goal:
+                    return
+
+    def minimum(self, rotation, x, y):
+        # (teclas, entradas) até o destino, ou None se ele não é alcançável
+        goal = (ROTATIONS[self.shape][rotation].matrix, x, y)
+        if goal not in self.targets:
+            self.expand(goal)
+        state = self.targets.get(goal)
+        if state is None:
+            return None
+        inputs = []
+        while self.parent[state] is not None:
+            state, name = self.parent[state]
+            inputs.append(name)
+        inputs.reverse()
+        return len(inputs), inputs
+
+
+class FinesseAnalyzer:
+    def __init__(self, cache_size=128, precompute=True):
+        self.cache_size = cache_size
+        self.empty = {}
+        self.cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        if precompute:
+            for shape in SHAPE_NAMES:
+                search = FinesseSearch(EMPTY_ROWS, shape)
+                search.expand()
+                self.empty[shape] = search
+
+    def search(self, rows, shape):
+        # (FinesseSearch, veio do cache)
+        rows = tuple(rows)
+        if rows == EMPTY_ROWS and shape in self.empty:
+            self.hits += 1
+            return self.empty[shape], True
+        key = (rows, shape)
+        result = self.cache.get(key)
+        if result is not None:
+            self.cache.move_to_end(key)
+            self.hits += 1
+            return result, True
+        self.misses += 1
+        result = FinesseSearch(rows, shape)
+        self.cache[key] = result
+        if len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+        return result, False
+
+
+class FinesseTracker:
+    # Conta as teclas de cada peça e, no encaixe, compara com o mínimo.
+    # spawn()/hold() começam a contagem, press() soma uma tecla, lock(engine)
+    # analisa a peça que acabou de encaixar.
+    def __init__(self, analyzer=None, history=2000):
+        self.analyzer = FinesseAnalyzer() if analyzer is None else analyzer
+        self.presses = 0
+        self.last = None
+        self.history = deque(maxlen=history)
+        self.pieces = 0
+        self.faults = 0
+        self.extra = 0
+
+    def spawn(self):
+        self.presses = 0
+
+    def press(self, action):
+        if action in COUNTED:
+            self.presses += 1
+
+    def lock(self, engine):
+        # Chamado no evento "lock": o engine já tem a peça no tabuleiro
+        start = time.perf_counter()
+        piece, x, y = engine.piece, engine.piece_x, engine.piece_y
+        rows = list(engine.rows)
+        for i, mask in enumerate(piece.masks):
+            rows[y + i] &= ~(mask << x)
+        search, cached = self.analyzer.search(rows, engine.current_shape)
+        found = search.minimum(engine.rotation, x, y)
+        elapsed = time.perf_counter() - start
+
+        if found is None:
+            # Chegou onde a busca não chega (p.ex. só com a gravidade)
+            minimum, inputs = None, []
+            extra = 0
+        else:
+            minimum, inputs = found
+            extra = max(0, self.presses - minimum)
+        self.pieces += 1
+        if extra:
+            self.faults += 1
+            self.extra += extra
+        self.last = FinesseResult(engine.current_shape, self.presses, minimum, extra,
+                                  [INPUT_NAMES[name] for name in inputs], elapsed, cached)
+        self.history.append(self.last)
+        self.presses = 0
+        return self.last
+
+    def message(self):
+        last = self.last
+        if last is None or last.minimum is None:
+            return None
+        hint = " ".join(last.inputs) or "-"
+        if last.extra:
+            return f"Finesse {last.shape}: +{last.extra} ({last.presses}, mín. {last.minimum}: {hint})"
+        return f"Finesse {last.shape}: ok ({last.minimum}: {hint})"
+
+    def timing(self):
+        # (média, p50, p99, pior) do tempo de análise por encaixe, em ms
+        times = sorted(result.elapsed * 1000 for result in self.history)
+        if not times:
+            return 0.0, 0.0, 0.0, 0.0
+        return (sum(times) / len(times), times[len(times) // 2],
+                times[min(len(times) - 1, int(len(times) * 0.99))], times[-1])
+
+    def report(self):
+        analyzer = self.analyzer
+        mean, p50, p99, worst = self.timing()
+        return (f"{self.pieces} peças, {self.faults} com teclas a mais "
+                f"({self.extra} no total); análise por encaixe: média {mean:.2f} ms, "
+                f"p50 {p50:.2f} ms, p99 {p99:.2f} ms, pior {worst:.2f} ms; "
+                f"cache {analyzer.hits} acertos, {analyzer.misses} buscas")
@@ -0,0 +1,90 @@
+import time
+from collections import deque
+
+# Agendador da gravidade, rodando na linha do tempo do loop principal.
+# Em vez de dormir gravity_delay() (e acumular o tempo gasto em cada volta),
+# cada queda tem um prazo exato: o próximo prazo é o anterior mais o atraso do
+# nível atual. O relógio é monotônico (perf_counter) e nada aqui dorme.
+# tick é quem aplica cada queda: o próprio engine ou a fila da simulação.
+# Com a fila, process (Simulation.process) é chamado depois de cada tick: só
+# assim o nível e o game over que decidem o próximo prazo já contam a queda.
+
+# Número máximo de quedas aplicadas numa única chamada de update; depois de um
+# travamento longo o restante é descartado em vez de derrubar a peça de uma vez.
+MAX_CATCH_UP = 5
+
+
+class GravityScheduler:
+    def __init__(self, engine, clock=time.perf_counter, history=2000, tick=None, process=None):
+        self.engine = engine
+        self.tick = engine.tick if tick is None else tick
+        self.process = process
+        self.clock = clock
+        # (nível, atraso em segundos) de cada queda aplicada
+        self.history = deque(maxlen=history)
+        self.skipped = 0  # quedas descartadas depois de travamentos, em todas as partidas
+        self.reset()
+
+    def reset(self, now=None):
+        self.deadline = (self.clock() if now is None else now) + self.engine.gravity_delay()
+        self.paused_at = None
+
+    def pause(self, now=None):
+        if self.paused_at is None:
+            self.paused_at = self.clock() if now is None else now
+
+    def resume(self, now=None):
+        # O tempo pausado não conta: o prazo anda junto
+        if self.paused_at is not None:
+            now = self.clock() if now is None else now
+            self.deadline += now - self.paused_at
+            self.paused_at = None
+
+    def next_deadline(self):
+        return self.deadline
+
+    def update(self, now=None):
+        # Aplica todas as quedas cujo prazo já passou; retorna quantas
+        if self.paused_at is not None:
+            return 0
+        engine = self.engine
+        now = self.clock() if now is None else now
+        steps = 0
+        while now >= self.deadline and not engine.game_over:
+            if steps == MAX_CATCH_UP:
+                # Travou demais: descarta as quedas atrasadas e recomeça a
+                # contagem a partir de agora
+                self.skipped += 1 + int((now - self.deadline) / engine.gravity_delay())
+                self.deadline = now + engine.gravity_delay()
+                break
+            self.history.append((engine.level, now - self.deadline))
+            self.tick()
+            if self.process is not None:
+                self.process()
+            # A queda já foi aplicada: se subiu o nível, o próximo prazo usa o novo
+            self.deadline += engine.gravity_delay()
+            steps += 1
+        return steps
+
+    def jitter(self):
+        # {nível: (quedas, média, p99, máximo)} dos atrasos em segundos
+        per_level = {}
+        for level, late in self.history:
+            per_level.setdefault(level, []).append(late)
+        report = {}
+        for level, values in sorted(per_level.items()):
+            values.sort()
+            p99 = values[min(len(values) - 1, int(len(values) * 0.99))]
+            report[level] = (len(values), sum(values) / len(values), p99, values[-1])
+        return report
+
+    def worst_p99(self):
+        # Maior p99 entre os níveis, em segundos (linha do HUD)
+        return max((p99 for _, _, p99, _ in self.jitter().values()), default=0.0)
+
+    def report(self):
+        # Atrasos por nível e quedas descartadas, para a saída do jogo
+        levels = ", ".join(f"nível {level}: {count} quedas, média {mean * 1000:.2f} ms, "
+                           f"p99 {p99 * 1000:.2f} ms, pior {worst * 1000:.2f} ms"
+                           for level, (count, mean, p99, worst) in self.jitter().items())
+        return f"{levels}; {self.skipped} quedas descartadas por travamento"
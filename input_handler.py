@@ -0,0 +1,205 @@
+import time
+
+from tetris_engine import BOARD_WIDTH, ACTION_LEFT, ACTION_RIGHT, ACTION_DOWN
+
+# Entrada com auto-repetição no estilo DAS/ARR:
+# - DAS (delayed auto-shift): quanto tempo ←/→ precisam ficar pressionadas
+#   antes de começar a repetir;
+# - ARR (auto-repeat rate): intervalo entre as repetições depois disso
+#   (0 = vai direto até a parede);
+# - SOFT_DROP: intervalo de repetição do ↓, sem espera inicial.
+# Os prazos são absolutos no relógio monotônico, então todas as repetições
+# vencidas são aplicadas de uma vez, no mesmo quadro, sem acumular atraso.
+
+DAS = 0.170
+ARR = 0.050
+SOFT_DROP = 0.050
+# Limite de repetições numa única chamada de update (travamento)
+MAX_REPEATS = 30
+# Com ARR 0, passos de uma vez: mais que isso a peça não anda no tabuleiro
+MAX_SHIFT = BOARD_WIDTH - 1
+
+HORIZONTAL = (ACTION_LEFT, ACTION_RIGHT)
+
+
+class LatencyHistogram:
+    # Histograma de latência com baldes de bucket_ms; o último balde junta
+    # tudo que passou de max_ms.
+    def __init__(self, bucket_ms=1, max_ms=100):
+        self.bucket_ms = bucket_ms
+        self.buckets = [0] * (max_ms // bucket_ms + 1)
+        self.count = 0
+        self.total = 0.0
+        self.worst = 0.0
+
+    def add(self, seconds):
+        ms = seconds * 1000
+        index = min(len(self.buckets) - 1, int(ms // self.bucket_ms))
+        self.buckets[index] += 1
+        self.count += 1
+        self.total += ms
+        self.worst = max(self.worst, ms)
+
+    def percentile(self, p):
+        # Limite superior (ms) do balde onde cai o percentil p (0-100)
+        if not self.count:
+            return 0
+        target = self.count * p / 100
+        seen = 0
+        for index, amount in enumerate(self.buckets):
+            seen += amount
+            if seen >= target:
+                return (index + 1) * self.bucket_ms
+        return len(self.buckets) * self.bucket_ms
+
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    def report(self):
+        return (f"{self.count} entradas, média {self.mean():.1f} ms, "
+                f"p50 ≤{self.percentile(50)} ms, p95 ≤{self.percentile(95)} ms, "
+                f"p99 ≤{self.percentile(99)} ms, pior {self.worst:.1f} ms")
+
+
+class InputHandler:
+    # perform(ação, on_result) executa a ação no jogo (ou a enfileira) e
+    # devolve False se ela nem foi aceita (e então on_result não é chamado);
+    # on_result(bool) recebe depois se o engine a aplicou. Uma tecla cuja ação foi recusada (peça encostada)
+    # para de repetir até unblock() (algo mudou no jogo) ou até ser solta.
+    # Com ARR 0 cada update manda uma rajada e espera os resultados dela antes
+    # da próxima; depois de encostar, a rajada seguinte é de um passo só, e
+    # só volta a ser inteira se esse passo andar.
+    # As teclas são opacas aqui (códigos do pygame, por exemplo); bind() diz
+    # o que cada uma faz. on_press(ação), se dado, é avisado de cada tecla
+    # pressionada (não das repetições), logo antes do perform.
+    def __init__(self, perform, das=DAS, arr=ARR, soft_drop=SOFT_DROP,
+                 clock=time.perf_counter, on_press=None):
+        self.perform = perform
+        self.on_press = on_press
+        self.das = das
+        self.arr = arr
+        self.soft_drop = soft_drop
+        self.clock = clock
+        self.bindings = {}
+        self.latency = LatencyHistogram()
+        self.reset()
+
+    def bind(self, key, action):
+        self.bindings[key] = action
+
+    def reset(self):
+        # Solta tudo (pausa, menu, novo jogo)
+        self.held = {}  # tecla -> {"action", "interval", "next", "blocked", "pending", "burst"}
+        self.horizontal = None  # última tecla ←/→ pressionada ainda segura
+        self.pending = []  # instantes das entradas ainda não apresentadas
+
+    def key_down(self, key, timestamp=None):
+        action = self.bindings.get(key)
+        if action is None:
+            return False
+        now = self.clock() if timestamp is None else timestamp
+        self.pending.append(now)
+        if self.on_press is not None:
+            self.on_press(action)
+
+        state = None
+        if action in HORIZONTAL:
+            state = self.new_state(action, self.arr, now + self.das)
+            self.held[key] = state
+            self.horizontal = key
+        elif action == ACTION_DOWN:
+            state = self.new_state(action, self.soft_drop, now + self.soft_drop)
+            self.held[key] = state
+        self.send(action, state)
+        return True
+
+    @staticmethod
+    def new_state(action, interval, next_time):
+        return {"action": action, "interval": interval, "next": next_time,
+                "blocked": False, "pending": 0, "burst": MAX_SHIFT}
+
+    def send(self, action, state):
+        # perform com o on_result da tecla; uma ação recusada não fica pendente
+        if self.perform(action, self.result_for(state)):
+            return True
+        if state is not None:
+            state["pending"] -= 1
+        return False
+
+    def result_for(self, state):
+        # on_result de uma ação da tecla (state é None para teclas que não repetem)
+        if state is None:
+            return None
+        state["pending"] += 1
+
+        def result(ok):
+            state["pending"] -= 1
+            if ok:
+                state["burst"] = MAX_SHIFT
+            else:
+                state["blocked"] = True
+                state["burst"] = 1
+        return result
+
+    def unblock(self):
+        # O jogo mudou (peça nova, girou, desceu): as teclas voltam a repetir
+        for state in self.held.values():
+            state["blocked"] = False
+
+    def key_up(self, key, timestamp=None):
+        state = self.held.pop(key, None)
+        if state is None or key != self.horizontal:
+            return
+        # A outra direção, se ainda estiver segura, volta a carregar o DAS
+        self.horizontal = None
+        now = self.clock() if timestamp is None else timestamp
+        for other, other_state in self.held.items():
+            if other_state["action"] in HORIZONTAL:
+                self.horizontal = other
+                other_state["next"] = now + self.das
+
+    def next_deadline(self):
+        # Próxima repetição agendada (None se nenhuma tecla repete). Com
+        # intervalo 0 a tecla é reavaliada a cada update, sem prazo próprio.
+        deadlines = [state["next"] for key, state in self.held.items()
+                     if state["interval"] > 0
+                     and (state["action"] not in HORIZONTAL or key == self.horizontal)]
+        return min(deadlines) if deadlines else None
+
+    def update(self, now=None):
+        # Aplica todas as repetições vencidas; retorna quantas
+        now = self.clock() if now is None else now
+        repeats = 0
+        for key, state in self.held.items():
+            if state["action"] in HORIZONTAL and key != self.horizontal:
+                continue
+            action, interval = state["action"], state["interval"]
+            if interval == 0:
+                # Rajada anterior ainda sem resposta: não manda outra às cegas
+                if now < state["next"] or state["blocked"] or state["pending"]:
+                    continue
+                count = 0
+                while count < state["burst"] and not state["blocked"]:
+                    count += 1
+                    if not self.send(action, state):
+                        break
+                repeats += count
+                continue
+            count = 0
+            while now >= state["next"]:
+                if state["blocked"] or count == MAX_REPEATS:
+                    state["next"] = max(state["next"], now + interval)
+                    break
+                self.send(action, state)
+                count += 1
+                state["next"] += interval
+            repeats += count
+        return repeats
+
+    def presented(self, now=None):
+        # Chamado logo depois de o quadro ir para a tela
+        if self.pending:
+            now = self.clock() if now is None else now
+            for timestamp in self.pending:
+                self.latency.add(now - timestamp)
+            self.pending = []
@@ -0,0 +1,125 @@
+import io
+import os
+
+import pygame
+
+# Música de fundo guiada por eventos, sem thread.
+#
+# O mixer avisa o fim de cada faixa com MUSIC_END (set_endevent), que chega
+# pela fila de eventos do loop principal e vai para handle_end(). No jogo, a
+# próxima faixa da playlist já fica na fila do mixer (music.queue) e começa
+# sem intervalo; o evento só serve para enfileirar a seguinte. Trocar entre
+# menu e jogo faz fadeout sem esperar: o fim do fade também gera MUSIC_END, e
+# aí a música do outro modo entra com fade in.
+#
+# Todas as chamadas ao mixer acontecem na thread principal. Os arquivos vêm
+# já lidos para a memória (attach); até lá, switch() só guarda o modo pedido.
+
+MUSIC_END = pygame.USEREVENT + 1
+FADE_IN = 500  # ms de fade in depois de uma troca
+
+
+class MusicPlayer:
+    def __init__(self, menu_track, playlist, menu_volume=0.5, game_volume=0.35):
+        self.menu_track = menu_track
+        self.playlist = list(playlist)
+        self.volumes = {"menu": menu_volume, "game": game_volume}
+        self.files = None  # caminho -> bytes, depois de attach
+        self.available = False
+        self.mode = None  # "menu", "game" ou None (sem música)
+        self.pending = None  # modo que entra quando o fadeout atual terminar
+        self.index = 0
+        self.paused = False
+
+    def attach(self, files):
+        # Chamado quando o mixer e os arquivos ficam prontos; faixas que não
+        # carregaram saem da playlist
+        self.files = files
+        self.playlist = [path for path in self.playlist if path in files]
+        self.available = True
+        pygame.mixer.music.set_endevent(MUSIC_END)
+        if self.mode is not None:
+            self.start(self.mode)
+
+    def source(self, path):
+        data = self.files.get(path)
+        if data is None:
+            return None
+        return io.BytesIO(data), os.path.splitext(path)[1][1:]
+
+    def current_track(self):
+        if self.mode == "menu":
+            return self.menu_track
+        if self.playlist:
+            return self.playlist[self.index % len(self.playlist)]
+        return None
+
+    def start(self, mode, fade_ms=0):
+        self.pending = None
+        self.mode = mode
+        source = self.source(self.current_track()) if self.current_track() else None
+        if source is None:
+            pygame.mixer.music.stop()
+            return
+        try:
+            pygame.mixer.music.load(*source)
+            pygame.mixer.music.set_volume(self.volumes[mode])
+            # Menu repete a mesma música; no jogo a playlist avança pela fila
+            pygame.mixer.music.play(-1 if mode == "menu" else 0, fade_ms=fade_ms)
+            if mode == "game":
+                self.queue_next()
+            if self.paused:
+                pygame.mixer.music.pause()
+        except pygame.error as e:
+            print(f"Erro ao tocar música: {e}")
+
+    def queue_next(self):
+        if len(self.playlist) < 2:
+            return
+        source = self.source(self.playlist[(self.index + 1) % len(self.playlist)])
+        if source is not None:
+            pygame.mixer.music.queue(*source)
+
+    def switch(self, mode, fade_ms=500):
+        # Troca de modo sem bloquear: fadeout agora, o resto em handle_end
+        if mode == self.mode and self.pending is None:
+            return
+        if not self.available:
+            self.mode = mode
+            return
+        if self.pending is not None or (pygame.mixer.music.get_busy() and not self.paused):
+            if self.pending is None:
+                pygame.mixer.music.fadeout(fade_ms)
+            self.pending = mode
+        else:
+            self.start(mode)
+
+    def handle_end(self):
+        if not self.available:
+            return
+        if self.pending is not None:
+            # Fim do fadeout de uma troca
+            self.start(self.pending, FADE_IN)
+        elif self.mode == "game" and self.playlist:
+            self.index = (self.index + 1) % len(self.playlist)
+            if pygame.mixer.music.get_busy():
+                # A faixa da fila já começou; enfileira a seguinte
+                self.queue_next()
+            else:
+                self.start("game")
+        elif self.mode == "menu":
+            self.start("menu")
+
+    def skip(self):
+        if self.available and self.mode == "game" and self.pending is None and self.playlist:
+            self.index = (self.index + 1) % len(self.playlist)
+            self.start("game")
+
+    def set_paused(self, paused):
+        self.paused = paused
+        if not self.available:
+            return
+        if paused:
+            pygame.mixer.music.pause()
+        else:
+            pygame.mixer.music.unpause()
@@ -0,0 +1,133 @@
+import numpy as np
+import pygame
+
+# Sistema de partículas com os dados em arrays NumPy pré-alocados.
+# Mesmo comportamento do antigo Particle (base_tetris.py), mas a atualização
+# é vetorizada e o desenho usa sprites de círculos já prontos em um único
+# Surface.blits.
+
+# Quantização do alpha dos sprites (256 / ALPHA_STEP variações por cor/tamanho)
+ALPHA_STEP = 8
+MIN_SIZE = 5
+MAX_SIZE = 10
+
+
+class ParticleSystem:
+    def __init__(self, capacity=5000, seed=None):
+        self.capacity = capacity
+        self.count = 0
+        self.rng = np.random.default_rng(seed)
+
+        self.x = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        self.speed_x = np.zeros(capacity)
+        self.speed_y = np.zeros(capacity)
+        self.lifetime = np.zeros(capacity, dtype=np.int32)
+        self.alpha = np.zeros(capacity, dtype=np.int32)
+        self.size = np.zeros(capacity, dtype=np.int32)
+        self.color = np.zeros(capacity, dtype=np.int32)  # índice em palette
+
+        self.palette = []
+        self.palette_index = {}
+        self.sprites = {}
+        self.dropped = 0
+
+    def clear(self):
+        self.count = 0
+
+    def seed(self, seed):
+        # Recomeça o gerador: a exportação de vídeo sorteia as mesmas
+        # partículas em qualquer processo
+        self.rng = np.random.default_rng(seed)
+
+    def color_id(self, color):
+        color = tuple(color[:3])
+        index = self.palette_index.get(color)
+        if index is None:
+            index = len(self.palette)
+            self.palette.append(color)
+            self.palette_index[color] = index
+        return index
+
+    def emit(self, x, y, color, amount):
+        # Partículas além da capacidade são descartadas (e contadas)
+        start = self.count
+        end = min(self.capacity, start + amount)
+        self.dropped += amount - (end - start)
+        if end <= start:
+            return
+        n = end - start
+        rng = self.rng
+
+        self.x[start:end] = x
+        self.y[start:end] = y
+        self.size[start:end] = rng.integers(MIN_SIZE, MAX_SIZE + 1, n)
+        self.speed_x[start:end] = rng.uniform(-3, 3, n)  # Mais dispersão
+        self.speed_y[start:end] = rng.uniform(-6, -2, n)  # Mais impulso para cima
+        self.lifetime[start:end] = rng.integers(40, 81, n)
+        self.alpha[start:end] = 255
+        self.color[start:end] = self.color_id(color)
+        self.count = end
+
+    def update(self):
+        n = self.count
+        if not n:
+            return 0
+
+        self.x[:n] += self.speed_x[:n]
+        self.y[:n] += self.speed_y[:n]
+        self.lifetime[:n] -= 1
+        np.maximum(self.alpha[:n] - 3, 0, out=self.alpha[:n])  # Fading lento
+        # Leve gravidade para que as partículas caiam um pouco
+        self.speed_y[:n] += 0.2
+
+        alive = (self.lifetime[:n] > 0) & (self.alpha[:n] > 0)
+        remaining = int(np.count_nonzero(alive))
+        if remaining != n:
+            # Compacta as vivas no começo dos mesmos buffers
+            for array in (self.x, self.y, self.speed_x, self.speed_y,
+                          self.lifetime, self.alpha, self.size, self.color):
+                array[:remaining] = array[:n][alive]
+            self.count = remaining
+        return remaining
+
+    def bounds(self):
+        # Retângulo que cobre todas as partículas (None se não houver)
+        n = self.count
+        if not n:
+            return None
+        size = self.size[:n]
+        left = (self.x[:n] - size).astype(np.int64)
+        top = (self.y[:n] - size).astype(np.int64)
+        x0, y0 = int(left.min()), int(top.min())
+        x1 = int((left + 2 * size).max())
+        y1 = int((top + 2 * size).max())
+        return pygame.Rect(x0, y0, x1 - x0, y1 - y0)
+
+    def sprite(self, size, color, bucket):
+        key = (size, color, bucket)
+        sprite = self.sprites.get(key)
+        if sprite is None:
+            alpha = min(255, bucket * ALPHA_STEP + ALPHA_STEP - 1)
+            sprite = pygame.Surface((size * 2, size * 2), pygame.SRCALPHA)
+            pygame.draw.circle(sprite, (*self.palette[color], alpha),
+                               (size, size), size)
+            self.sprites[key] = sprite
+        return sprite
+
+    def blit_list(self):
+        # Lista (sprite, posição) pronta para Surface.blits
+        n = self.count
+        if not n:
+            return []
+        size = self.size[:n]
+        left = (self.x[:n] - size).astype(np.int64).tolist()
+        top = (self.y[:n] - size).astype(np.int64).tolist()
+        buckets = (self.alpha[:n] // ALPHA_STEP).tolist()
+        sprite = self.sprite
+        return [(sprite(s, c, b), (x, y))
+                for s, c, b, x, y in zip(size.tolist(), self.color[:n].tolist(),
+                                         buckets, left, top)]
+
+    def draw(self, surface):
+        surface.blits(self.blit_list(), doreturn=False)
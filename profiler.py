@@ -0,0 +1,147 @@
+import csv
+import json
+import time
+
+import numpy as np
+
+# Medição do tempo de cada fase do quadro (eventos, atualização, painel,
+# tabuleiro, partículas, composição, blit, flip...).
+#
+# O loop chama start() no começo do quadro, lap(fase) ao fim de cada fase e
+# end() no fim. lap mede o tempo desde a marca anterior, então as fases não
+# precisam de início e fim. Os quadros ficam num buffer circular de tamanho
+# fixo. Desligado, start/lap/end são uma função vazia: o custo é só a chamada.
+
+
+def _noop(*args):
+    pass
+
+
+class FrameProfiler:
+    def __init__(self, capacity=600, enabled=False):
+        self.capacity = capacity
+        self.totals = np.zeros(capacity)
+        self.phases = {}  # fase -> np.array(capacity) em segundos
+        self.frames = 0  # quadros gravados desde o início (o buffer guarda os últimos)
+        self.current = {}
+        self.frame_start = self.last = 0.0
+        self.enabled = False
+        self.set_enabled(enabled)
+
+    def set_enabled(self, enabled):
+        self.enabled = enabled
+        if enabled:
+            self.start, self.lap, self.end = self._start, self._lap, self._end
+        else:
+            self.start = self.lap = self.end = _noop
+
+    def _start(self):
+        self.frame_start = self.last = time.perf_counter()
+        self.current = {}
+
+    def _lap(self, phase):
+        now = time.perf_counter()
+        current = self.current
+        current[phase] = current.get(phase, 0.0) + now - self.last
+        self.last = now
+
+    def _end(self):
+        row = self.frames % self.capacity
+        self.totals[row] = time.perf_counter() - self.frame_start
+        current = self.current
+        for phase in current:
+            if phase not in self.phases:
+                self.phases[phase] = np.zeros(self.capacity)
+        for phase, values in self.phases.items():
+            values[row] = current.get(phase, 0.0)
+        self.frames += 1
+
+    def filled(self):
+        return min(self.frames, self.capacity)
+
+    def recent(self, values, count=None):
+        # Valores em ordem cronológica (os count mais recentes)
+        filled = self.filled()
+        count = filled if count is None else min(count, filled)
+        end = self.frames % self.capacity
+        if filled < self.capacity:
+            return values[end - count:end]
+        return np.roll(values, -end)[self.capacity - count:]
+
+    def frame_times(self, count=None):
+        return self.recent(self.totals, count)
+
+    def work_times(self, count=None):
+        # Tempo do quadro sem a espera pelo próximo
+        totals = self.recent(self.totals, count)
+        wait = self.phases.get("wait")
+        if wait is None:
+            return totals
+        return totals - self.recent(wait, count)
+
+    def percentiles(self, values, points=(50, 95, 99)):
+        filled = self.filled()
+        if not filled:
+            return tuple(0.0 for _ in points)
+        return tuple(float(v) for v in np.percentile(values[:filled], points))
+
+    def summary(self):
+        # {fase: (p50, p95, p99)} em milissegundos, mais "frame" e "work"
+        report = {phase: tuple(v * 1000 for v in self.percentiles(values))
+                  for phase, values in self.phases.items()}
+        report["work"] = tuple(v * 1000 for v in self.percentiles(self.work_times()))
+        report["frame"] = tuple(v * 1000 for v in self.percentiles(self.totals))
+        return report
+
+    def dump_csv(self, path):
+        phases = list(self.phases)
+        frames = self.filled()
+        totals = self.frame_times()
+        columns = [self.recent(self.phases[phase]) for phase in phases]
+        first = self.frames - frames
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["frame", "frame_ms"] + [f"{phase}_ms" for phase in phases])
+            for i in range(frames):
+                writer.writerow([first + i, f"{totals[i] * 1000:.3f}"] +
+                                [f"{column[i] * 1000:.3f}" for column in columns])
+
+    def dump_json(self, path):
+        data = {
+            "frames": self.frames,
+            "kept": self.filled(),
+            "percentiles_ms": {phase: dict(zip(("p50", "p95", "p99"), values))
+                               for phase, values in self.summary().items()},
+            "frame_ms": [round(v * 1000, 3) for v in self.frame_times().tolist()],
+        }
+        with open(path, "w") as f:
+            json.dump(data, f, indent=2)
+
+
+class StartupTimer:
+    # Tempo de cada etapa da inicialização. lap(etapa) mede desde a marca
+    # anterior (como no FrameProfiler); mark(marco) guarda o instante desde a
+    # origem, para o primeiro quadro e o momento em que tudo ficou pronto.
+    def __init__(self, origin=None):
+        self.origin = time.perf_counter() if origin is None else origin
+        self.last = self.origin
+        self.stages = []  # (etapa, segundos)
+        self.marks = {}  # marco -> segundos desde a origem
+
+    def lap(self, stage):
+        now = time.perf_counter()
+        self.stages.append((stage, now - self.last))
+        self.last = now
+
+    def mark(self, name):
+        self.marks[name] = time.perf_counter() - self.origin
+
+    def report(self, background=None):
+        # background: {etapa: segundos} do que carregou fora da thread principal
+        lines = [", ".join(f"{name} {seconds * 1000:.1f} ms" for name, seconds in self.marks.items())]
+        lines.append("  " + ", ".join(f"{stage} {seconds * 1000:.1f}"
+                                      for stage, seconds in self.stages))
+        if background:
+            lines.append("  em segundo plano: " + ", ".join(
+                f"{stage} {seconds * 1000:.1f}" for stage, seconds in background.items()))
+        return "\n".join(lines)
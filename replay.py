@@ -0,0 +1,261 @@
+import sys
+import time
+import zlib
+
+from tetris_engine import TetrisEngine, ACTION_NONE, ACTION_HOLD
+
+# Replays determinísticos.
+# Uma partida é a semente do engine mais a sequência de ações, cada uma com o
+# número de quedas de gravidade (engine.ticks) desde a ação anterior. Como o
+# engine só muda por step() e tick(), refazer a mesma sequência a partir da
+# mesma semente chega exatamente ao mesmo estado, sem depender de relógio.
+#
+# Formato binário (.trp):
+#   b"TRP" + versão (1 byte) + varint(semente)
+#   registros varint((quedas << 3) | ação), ação de 1 a 6
+#   registro final varint((quedas restantes << 3) | ACTION_END)
+#   estado final: varint(score, linhas, peças, ticks, crc do tabuleiro) + game_over
+# A maioria dos registros cabe em um byte.
+
+MAGIC = b"TRP"
+VERSION = 1
+ACTION_END = 7
+# Intervalo entre ações de uma mesma queda na reprodução em tempo real
+ACTION_SPACING = 0.05
+
+
+def write_varint(out, value):
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return
+
+
+def read_varint(data, pos):
+    value = shift = 0
+    while True:
+        if pos >= len(data):
+            raise ValueError("replay truncado")
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return value, pos
+        shift += 7
+
+
+def final_state(engine):
+    # Resumo do estado para comparar partidas (estados "de ouro")
+    board = "".join(cell or "." for row in engine.board for cell in row)
+    return {
+        "score": engine.score,
+        "lines": engine.lines_cleared,
+        "pieces": engine.pieces_placed,
+        "ticks": engine.ticks,
+        "board_crc": zlib.crc32(board.encode()),
+        "game_over": engine.game_over,
+    }
+
+
+class Replay:
+    def __init__(self, seed, events, trailing=0, final=None):
+        self.seed = seed
+        self.events = events  # [(quedas desde a ação anterior, ação)]
+        self.trailing = trailing  # quedas depois da última ação
+        self.final = final
+
+    def to_bytes(self):
+        out = bytearray(MAGIC)
+        out.append(VERSION)
+        write_varint(out, self.seed)
+        for delta, action in self.events:
+            write_varint(out, (delta << 3) | action)
+        write_varint(out, (self.trailing << 3) | ACTION_END)
+        final = self.final or {}
+        for key in ("score", "lines", "pieces", "ticks", "board_crc"):
+            write_varint(out, final.get(key, 0))
+        out.append(1 if final.get("game_over") else 0)
+        return bytes(out)
+
+    @classmethod
+    def from_bytes(cls, data):
+        if data[:3] != MAGIC:
+            raise ValueError("não é um replay")
+        if data[3] != VERSION:
+            raise ValueError(f"versão de replay não suportada: {data[3]}")
+        seed, pos = read_varint(data, 4)
+        events = []
+        while True:
+            value, pos = read_varint(data, pos)
+            delta, action = value >> 3, value & 7
+            if action == ACTION_END:
+                break
+            if action == ACTION_NONE or action > ACTION_HOLD:
+                raise ValueError(f"ação inválida no replay: {action}")
+            events.append((delta, action))
+        final = {}
+        for key in ("score", "lines", "pieces", "ticks", "board_crc"):
+            final[key], pos = read_varint(data, pos)
+        if pos >= len(data):
+            raise ValueError("replay truncado")
+        final["game_over"] = bool(data[pos])
+        return cls(seed, events, delta, final)
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read())
+
+
+class ReplayRecorder:
+    # Grava as ações aplicadas a um engine já iniciado (engine.start())
+    def __init__(self, engine):
+        self.engine = engine
+        self.seed = engine.seed
+        self.events = []
+        self.last_tick = engine.ticks
+
+    def record(self, action):
+        ticks = self.engine.ticks
+        self.events.append((ticks - self.last_tick, action))
+        self.last_tick = ticks
+
+    def finish(self):
+        engine = self.engine
+        return Replay(self.seed, list(self.events), engine.ticks - self.last_tick,
+                      final_state(engine))
+
+
+class ReplayPlayer:
+    # Reproduz um replay num engine já iniciado com replay.seed.
+    # step()/run() vão o mais rápido possível; update(now) segue o relógio,
+    # com cada queda no atraso do nível e as ações espaçadas por ACTION_SPACING.
+    # commands recebe as quedas e ações de update (o engine ou a fila da
+    # simulação); o engine continua sendo lido para os atrasos e o verify.
+    def __init__(self, replay, engine, commands=None):
+        self.replay = replay
+        self.engine = engine
+        self.commands = engine if commands is None else commands
+        self.index = 0
+        self.ticks_left = replay.events[0][0] if replay.events else replay.trailing
+        self.tick_time = self.action_time = None
+
+    @property
+    def finished(self):
+        return self.index > len(self.replay.events)
+
+    def next_record(self):
+        self.index += 1
+        events = self.replay.events
+        if self.index < len(events):
+            self.ticks_left = events[self.index][0]
+        elif self.index == len(events):
+            self.ticks_left = self.replay.trailing
+
+    def step(self):
+        # Aplica um registro inteiro (quedas + ação); False quando acabou
+        if self.finished:
+            return False
+        engine = self.engine
+        for _ in range(self.ticks_left):
+            engine.tick()
+        self.ticks_left = 0
+        if self.index < len(self.replay.events):
+            engine.step(self.replay.events[self.index][1])
+        self.next_record()
+        return True
+
+    def run(self):
+        while self.step():
+            pass
+        return self.engine
+
+    def start(self, now=None):
+        now = time.perf_counter() if now is None else now
+        self.tick_time = self.action_time = now
+
+    def update(self, now=None):
+        now = time.perf_counter() if now is None else now
+        if self.tick_time is None:
+            self.start(now)
+        engine = self.engine
+        commands = self.commands
+        while not self.finished:
+            if self.ticks_left:
+                due = self.tick_time + engine.gravity_delay()
+                if now < due:
+                    break
+                commands.tick()
+                self.ticks_left -= 1
+                self.tick_time = self.action_time = due
+                continue
+            if self.index < len(self.replay.events):
+                due = self.action_time + ACTION_SPACING
+                if now < due:
+                    break
+                commands.step(self.replay.events[self.index][1])
+                self.action_time = due
+            self.next_record()
+        return not self.finished
+
+    def next_deadline(self):
+        # Instante da próxima queda ou ação gravada (None antes de start/no fim)
+        if self.finished or self.tick_time is None:
+            return None
+        if self.ticks_left:
+            return self.tick_time + self.engine.gravity_delay()
+        return self.action_time + ACTION_SPACING
+
+    def verify(self):
+        # Compara o estado atual com o estado final gravado no replay
+        return self.replay.final is None or final_state(self.engine) == self.replay.final
+
+
+def play(replay, engine=None):
+    # Refaz a partida sem janela, o mais rápido possível
+    if engine is None:
+        engine = TetrisEngine()
+    engine.start(replay.seed)
+    player = ReplayPlayer(replay, engine)
+    player.run()
+    return player
+
+
+def main(paths):
+    # python replay.py partida.trp [...]: refaz cada partida e confere o estado final
+    failures = 0
+    for path in paths:
+        try:
+            replay = Replay.load(path)
+        except (OSError, ValueError) as e:
+            print(f"{path}: erro ao ler replay: {e}")
+            failures += 1
+            continue
+        start = time.perf_counter()
+        player = play(replay)
+        elapsed = time.perf_counter() - start
+        state = final_state(player.engine)
+        ok = player.verify()
+        failures += not ok
+        print(f"{path}: {'ok' if ok else 'DIVERGIU'} — semente {replay.seed}, "
+              f"{len(replay.events)} ações, {state['ticks']} quedas, score {state['score']}, "
+              f"{state['lines']} linhas em {elapsed * 1000:.1f} ms")
+        if not ok:
+            print(f"  esperado {replay.final}")
+            print(f"  obtido   {state}")
+    return failures
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("uso: python replay.py partida.trp [...]")
+        sys.exit(2)
+    sys.exit(1 if main(sys.argv[1:]) else 0)
@@ -0,0 +1,115 @@
+from collections import deque, namedtuple
+
+# Dono único do estado do jogo.
+#
+# Quem quer mudar o jogo (teclado, jogador automático, gravidade, replay) só
+# põe comandos numa fila: step(ação) e tick() aqui têm a mesma assinatura do
+# engine, mas apenas enfileiram. process() é o único lugar que chama o engine;
+# depois de aplicar os comandos, publica um Snapshot imutável do que a tela
+# precisa. O desenho lê só latest(), então nunca vê um tabuleiro pela metade e
+# pode rodar num ritmo diferente da simulação.
+#
+# A fila é um deque: append e popleft são atômicos no CPython, então um
+# produtor em outra thread não precisa de trava. Os snapshots ficam em dois
+# espaços; o novo é escrito no de trás e só então o índice da frente troca.
+
+TICK = "tick"
+CALL = "call"
+
+Snapshot = namedtuple("Snapshot", [
+    "version", "board", "board_version", "piece", "shape", "piece_x", "piece_y",
+    "ghost_y", "hold_piece", "next_pieces", "score", "level", "lines_cleared",
+    "ticks", "game_over",
+])
+
+
+class Simulation:
+    def __init__(self, engine):
+        self.engine = engine
+        self.commands = deque()
+        self.buffers = [None, None]
+        self.front = 0
+        self.version = 0
+        self.on_action = None  # chamado com cada ação aceita pelo engine (gravação)
+        self.processed = 0
+        self.publish()
+
+    # ------------------------------------------------------------------
+    # Produtores
+    # ------------------------------------------------------------------
+    def step(self, action, on_result=None):
+        # on_result(bool) recebe o resultado quando a ação for aplicada
+        self.commands.append((action, on_result))
+        return True
+
+    def tick(self):
+        self.commands.append((TICK, None))
+        return True
+
+    def call(self, fn, *args):
+        # fn(*args) roda em process(), na ordem, entre os outros comandos
+        self.commands.append((CALL, (fn, args)))
+        return True
+
+    def gravity_delay(self):
+        return self.engine.gravity_delay()
+
+    # ------------------------------------------------------------------
+    # Dono
+    # ------------------------------------------------------------------
+    def process(self):
+        # Aplica tudo o que está na fila; publica se algo foi aplicado
+        commands = self.commands
+        engine = self.engine
+        count = 0
+        while commands:
+            command, on_result = commands.popleft()
+            if command == TICK:
+                engine.tick()
+            elif command == CALL:
+                fn, args = on_result
+                fn(*args)
+            else:
+                result = engine.step(command)
+                if result and self.on_action is not None:
+                    self.on_action(command)
+                if on_result is not None:
+                    on_result(result)
+            count += 1
+        if count:
+            self.processed += count
+            self.publish()
+        return count
+
+    def start(self, seed=None):
+        # Início e reinício não passam pela fila: o que estava nela é descartado
+        self.commands.clear()
+        self.engine.start(seed)
+        self.publish()
+
+    def reset(self):
+        self.commands.clear()
+        self.engine.reset()
+        self.publish()
+
+    def publish(self):
+        engine = self.engine
+        previous = self.buffers[self.front]
+        if previous is not None and previous.board_version == engine.board_version:
+            board = previous.board
+        else:
+            board = tuple(tuple(row) for row in engine.board)
+        piece = engine.piece
+        self.version += 1
+        snapshot = Snapshot(
+            self.version, board, engine.board_version, piece, engine.current_shape,
+            engine.piece_x, engine.piece_y, engine.get_ghost_y() if piece is not None else None,
+            engine.hold_piece, tuple(engine.next_pieces[:3]), engine.score, engine.level,
+            engine.lines_cleared, engine.ticks, engine.game_over)
+        back = 1 - self.front
+        self.buffers[back] = snapshot
+        self.front = back
+        return snapshot
+
+    def latest(self):
+        return self.buffers[self.front]
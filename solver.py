@@ -0,0 +1,553 @@
+import argparse
+import multiprocessing
+import os
+import random
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from autoplay import fits, drop_y, place
+from tetris_engine import (BOARD_WIDTH, BOARD_HEIGHT, ROTATIONS, SHAPE_NAMES, TetrisEngine,
+                           column_heights,
+                           ACTION_LEFT, ACTION_RIGHT, ACTION_ROTATE,
+                           ACTION_DROP, ACTION_HOLD)
+
+# Solucionador de perfect clear (tabuleiro vazio no fim) e de quebra-cabeças
+# de "limpe N linhas" com as peças conhecidas: a atual, o hold e as próximas.
+#
+# Busca em profundidade sobre sequências de jogadas. Cada jogada escolhe a
+# peça (a da vez ou, trocando, a do hold) e uma posição alcançável girando no
+# spawn e andando na horizontal, como o AutoPlayer. Podas do perfect clear:
+#   - células: só dá se células + 4k fecham linhas inteiras para algum k
+#     dentro das peças restantes, e a pilha não pode ser mais alta que isso;
+#   - buracos cobertos: sem tuck, nunca serão preenchidos;
+#   - paridade dos poços: com L linhas, colunas já com altura L dividem o
+#     tabuleiro e cada trecho vazio entre elas precisa ter múltiplo de 4 células.
+# Estados já explorados sem solução vão para uma tabela de transposição
+# (tabuleiro, posição na fila, hold).
+#
+# A primeira jogada de cada ramo vira uma tarefa num ProcessPoolExecutor. Os
+# processos são criados com "spawn", não com fork: o pool nasce dentro do jogo,
+# que já tem o SDL aberto e threads de carga e de música.
+# Toda busca tem prazo: ao estourar (ou sem solução), devolve o melhor
+# resultado visto até ali: no perfect clear, o caminho mais longo que ainda não
+# o impede; com N linhas, mais linhas e menos células sobrando.
+
+GOAL_PC = "pc"
+GRACE = 0.05  # segundos além do prazo esperando os processos responderem
+CHECK_EVERY = 256  # nós entre consultas ao relógio e ao pedido de parada
+STOP_SLOTS = 64  # buscas no pool ao mesmo tempo, cada uma com a sua parada
+PUZZLE_TIME = 10.0  # segundos no máximo procurando um quebra-cabeça
+
+# Uma jogada: trocar pelo hold antes?, peça, rotação, coluna, linha final
+Move = namedtuple("Move", ["hold", "shape", "rotation", "x", "y"])
+SolveResult = namedtuple("SolveResult", ["solved", "moves", "lines", "cells", "nodes",
+                                         "elapsed", "timed_out"])
+
+_live = None  # multiprocessing.RawArray: id do job vivo em cada posição
+
+
+def _init_worker(live):
+    global _live
+    _live = live
+
+
+def _warm_up():
+    # Tarefa vazia: só faz o pool criar (e importar) os processos agora
+    return os.getpid()
+
+
+class StopFlag:
+    # Parada de um job no pool: ele vale enquanto a sua posição em live tem
+    # o seu id. Cancelar (ou reaproveitar a posição) para só os ramos dele
+    def __init__(self, live, slot, job_id):
+        self.live = live
+        self.slot = slot
+        self.job_id = job_id
+
+    def is_set(self):
+        return self.live[self.slot] != self.job_id
+
+
+def placements(rows, heights, shape):
+    # (rotação, x, y, peça) alcançáveis do spawn, sem repetir orientações;
+    # as mais baixas primeiro, que costumam levar à solução mais cedo
+    states = ROTATIONS[shape]
+    px = states[0].spawn_x
+    seen = set()
+    result = []
+    for r, piece in enumerate(states):
+        if not fits(rows, px, 0, piece.masks, piece.width):
+            break  # Girar no lugar bateu em algo
+        if piece.matrix in seen:
+            continue
+        seen.add(piece.matrix)
+        x = px
+        while fits(rows, x, 0, piece.masks, piece.width):
+            result.append((r, x, drop_y(rows, heights, piece, x, 0), piece))
+            x -= 1
+        x = px + 1
+        while fits(rows, x, 0, piece.masks, piece.width):
+            result.append((r, x, drop_y(rows, heights, piece, x, 0), piece))
+            x += 1
+    result.sort(key=lambda item: -(item[2] + item[3].height))
+    return result
+
+
+def choices(queue, index, hold, can_hold=True):
+    # (usar hold?, peça, próximo índice, hold depois) de cada jogada possível
+    options = []
+    if index < len(queue):
+        options.append((False, queue[index], index + 1, hold))
+        if can_hold:
+            if hold is not None and hold != queue[index]:
+                options.append((True, hold, index + 1, queue[index]))
+            elif hold is None and index + 1 < len(queue) and queue[index + 1] != queue[index]:
+                options.append((True, queue[index + 1], index + 2, queue[index]))
+    elif hold is not None and can_hold:
+        # Fila conhecida acabou: o hold ainda pode ser jogado
+        options.append((True, hold, index, None))
+    return options
+
+
+def covered_holes(rows, top):
+    covered = 0
+    for row in rows[BOARD_HEIGHT - top:]:
+        covered |= row
+        if covered & ~row:
+            return True
+    return False
+
+
+def pc_possible(rows, heights, remaining):
+    # Alguma altura L (em linhas) ainda permite limpar tudo?
+    filled = sum(row.bit_count() for row in rows)
+    top = max(heights)
+    if covered_holes(rows, top):
+        return False
+    for pieces in range(remaining + 1):
+        cells = filled + 4 * pieces
+        if cells % BOARD_WIDTH or cells // BOARD_WIDTH < top or cells == 0:
+            continue
+        lines = cells // BOARD_WIDTH
+        # Trechos vazios entre colunas que já chegaram a L
+        segment = 0
+        for height in heights:
+            if height == lines:
+                if segment % 4:
+                    break
+                segment = 0
+            else:
+                segment += lines - height
+        else:
+            if segment % 4 == 0:
+                return True
+    return False
+
+
+class Search:
+    # Busca em profundidade a partir de um estado; self.best guarda o melhor
+    # (pontuação, jogadas) visto
+    def __init__(self, goal, deadline, stop=None, use_hold=True):
+        self.goal = goal
+        self.use_hold = use_hold
+        self.deadline = deadline
+        self.stop = stop
+        self.table = set()
+        self.nodes = 0
+        self.timed_out = False
+        self.best = None
+        self.solution = None
+
+    def expired(self):
+        if time.monotonic() >= self.deadline or (self.stop is not None and self.stop.is_set()):
+            self.timed_out = True
+        return self.timed_out
+
+    def done(self, rows, lines):
+        if self.goal == GOAL_PC:
+            return lines > 0 and not any(rows)
+        return lines >= self.goal
+
+    def hopeless(self, rows, heights, lines, remaining):
+        if self.goal == GOAL_PC:
+            return not pc_possible(rows, heights, remaining)
+        filled = sum(row.bit_count() for row in rows)
+        return lines + (filled + 4 * remaining) // BOARD_WIDTH < self.goal
+
+    def run(self, rows, heights, queue, index, hold, lines, path, can_hold=True):
+        # True quando achou solução (em self.solution)
+        self.nodes += 1
+        if self.nodes % CHECK_EVERY == 0 and self.expired():
+            return False
+        if self.timed_out:
+            return False
+
+        if path and self.done(rows, lines):
+            self.solution = list(path)
+            return True
+
+        remaining = len(queue) - index + (hold is not None)
+        hopeless = self.hopeless(rows, heights, lines, remaining)
+        if path:
+            cells = sum(row.bit_count() for row in rows)
+            if self.goal != GOAL_PC:
+                # Progresso: células nas linhas de baixo que ainda faltam fechar
+                need = max(1, self.goal - lines)
+                target = sum(row.bit_count() for row in rows[BOARD_HEIGHT - need:])
+                score = (lines, target, -cells)
+            elif not hopeless:
+                score = (len(path), lines, -cells)
+            else:
+                score = None
+            if score is not None and (self.best is None or score > self.best[0]):
+                self.best = (score, list(path))
+        if remaining == 0 or hopeless:
+            return False
+        key = (rows, index, hold, can_hold)
+        if key in self.table:
+            return False
+
+        for held, shape, next_index, next_hold in choices(queue, index, hold,
+                                                          can_hold and self.use_hold):
+            for r, x, y, piece in placements(rows, heights, shape):
+                new_rows, new_heights, cleared = place(list(rows), heights, piece, x, y)
+                path.append(Move(held, shape, r, x, y))
+                found = self.run(tuple(new_rows), new_heights, queue, next_index, next_hold,
+                                 lines + cleared, path)
+                path.pop()
+                if found:
+                    return True
+                if self.timed_out:
+                    return False
+        self.table.add(key)
+        return False
+
+
+def solve_branch(rows, queue, index, hold, lines, first, goal, deadline, use_hold, slot, job_id):
+    # Tarefa de um processo: um ramo a partir da primeira jogada já feita
+    search = Search(goal, deadline, StopFlag(_live, slot, job_id), use_hold)
+    rows = tuple(rows)
+    search.run(rows, column_heights(rows), queue, index, hold, lines, [first])
+    best = search.best
+    return (search.solution, best, search.nodes, search.timed_out)
+
+
+class Solver:
+    # workers=0 busca no próprio processo; senão usa um pool de processos que
+    # fica aberto entre as chamadas (a criação custa mais que uma busca curta)
+    def __init__(self, workers=None, budget=0.5):
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self.budget = budget
+        self.pool = None
+        self.live = None
+        self.free_slots = []
+        self.next_id = 0
+
+    def start_pool(self):
+        if self.pool is None and self.workers > 0:
+            context = multiprocessing.get_context("spawn")
+            self.live = context.RawArray('q', STOP_SLOTS)
+            self.free_slots = list(range(STOP_SLOTS))
+            self.pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=context,
+                                            initializer=_init_worker, initargs=(self.live,))
+            # Com spawn cada processo importa tudo de novo: começa já, para a
+            # primeira busca não gastar o prazo esperando por eles
+            for _ in range(self.workers):
+                self.pool.submit(_warm_up)
+        return self.pool
+
+    def acquire(self):
+        # (posição, id) para um job novo, ou None se todas estão em uso
+        if not self.free_slots:
+            return None
+        self.next_id += 1
+        slot = self.free_slots.pop()
+        self.live[slot] = self.next_id
+        return slot, self.next_id
+
+    def release(self, slot):
+        # Os ramos ainda rodando desse job veem a parada e terminam logo
+        self.live[slot] = 0
+        self.free_slots.append(slot)
+
+    def shutdown(self):
+        if self.pool is not None:
+            for slot in range(STOP_SLOTS):
+                self.live[slot] = 0
+            self.pool.shutdown(wait=True, cancel_futures=True)
+            self.pool = None
+
+    def submit(self, rows, current, next_pieces, hold=None, can_hold=True, goal=GOAL_PC,
+               budget=None, use_hold=True):
+        # Começa a busca e devolve um SolveJob; poll() diz quando acabou.
+        # can_hold: o hold ainda vale para a peça atual; use_hold=False não
+        # usa o hold em jogada nenhuma
+        budget = self.budget if budget is None else budget
+        return SolveJob(self, tuple(rows), (current,) + tuple(next_pieces), hold,
+                        can_hold and use_hold, goal, budget, use_hold)
+
+    def solve(self, *args, **kwargs):
+        # Mesma coisa, esperando o resultado (até o prazo + GRACE)
+        job = self.submit(*args, **kwargs)
+        return job.wait()
+
+
+class SolveJob:
+    def __init__(self, solver, rows, queue, hold, can_hold, goal, budget, use_hold=True):
+        self.start = time.monotonic()
+        self.deadline = self.start + budget
+        self.rows = rows
+        self.goal = goal
+        self.result = None
+        self.futures = []
+        self.nodes = 0
+        self.timed_out = False
+        self.best = None
+        self.solution = None
+        self.solver = solver
+        self.slot = None
+
+        pool = solver.start_pool()
+        heights = column_heights(rows)
+        ticket = solver.acquire() if pool is not None else None
+        if ticket is None:
+            # Tudo aqui mesmo, com o mesmo prazo
+            search = Search(goal, self.deadline, use_hold=use_hold)
+            search.run(rows, heights, queue, 0, hold, 0, [], can_hold)
+            self.nodes = search.nodes
+            self.timed_out = search.timed_out
+            self.finish(search.solution, search.best)
+            return
+
+        self.slot, job_id = ticket
+        # Um ramo por primeira jogada
+        for held, shape, next_index, next_hold in choices(queue, 0, hold, can_hold):
+            for r, x, y, piece in placements(rows, heights, shape):
+                new_rows, _, cleared = place(list(rows), heights, piece, x, y)
+                first = Move(held, shape, r, x, y)
+                self.futures.append(pool.submit(solve_branch, new_rows, queue, next_index,
+                                                next_hold, cleared, first, goal, self.deadline,
+                                                use_hold, self.slot, job_id))
+        if not self.futures:
+            self.finish(None, None)
+
+    def poll(self):
+        # Junta o que os processos já devolveram; True quando há resultado
+        if self.result is not None:
+            return True
+        pending = []
+        for future in self.futures:
+            if not future.done():
+                pending.append(future)
+                continue
+            if future.cancelled():
+                continue
+            try:
+                solution, best, nodes, timed_out = future.result()
+            except Exception as e:
+                print('Erro no solucionador:', e)
+                continue
+            self.nodes += nodes
+            self.timed_out = self.timed_out or timed_out
+            if best is not None and (self.best is None or best[0] > self.best[0]):
+                self.best = best
+            if solution is not None and self.solution is None:
+                self.solution = solution
+        self.futures = pending
+        now = time.monotonic()
+        if self.solution is not None or not pending or now > self.deadline + GRACE:
+            if pending:
+                self.timed_out = True
+            # Achou (ou desistiu): os outros ramos param
+            self.stop()
+            self.finish(self.solution, self.best)
+            return True
+        return False
+
+    def stop(self):
+        for future in self.futures:
+            future.cancel()
+        self.futures = []
+        if self.slot is not None:
+            self.solver.release(self.slot)
+            self.slot = None
+
+    def cancel(self):
+        # Desiste da busca (só desta); result fica com o melhor já recebido
+        if self.result is None:
+            self.stop()
+            self.timed_out = True
+            self.finish(self.solution, self.best)
+
+    def wait(self):
+        while not self.poll():
+            time.sleep(0.002)
+        return self.result
+
+    def finish(self, solution, best):
+        solved = solution is not None
+        if solved:
+            moves = solution
+        else:
+            moves = best[1] if best is not None else []
+        rows, lines = apply_moves(self.rows, moves)
+        self.result = SolveResult(solved, moves, lines, sum(row.bit_count() for row in rows),
+                                  self.nodes, time.monotonic() - self.start, self.timed_out)
+
+
+def engine_state(engine):
+    # Argumentos de Solver.submit()/solve() para o estado atual do engine
+    return (engine.rows, engine.current_shape, engine.next_pieces, engine.hold_piece,
+            not engine.hold_used)
+
+
+def apply_moves(rows, moves):
+    # (linhas, linhas limpas) depois de jogar moves a partir de rows
+    rows = list(rows)
+    heights = column_heights(rows)
+    lines = 0
+    for move in moves:
+        rows, heights, cleared = place(rows, heights, ROTATIONS[move.shape][move.rotation],
+                                       move.x, move.y)
+        lines += cleared
+    return rows, lines
+
+
+def move_actions(move):
+    # Ações do engine que levam a peça do spawn até a jogada e a derrubam
+    actions = [ACTION_HOLD] if move.hold else []
+    actions += [ACTION_ROTATE] * move.rotation
+    dx = move.x - ROTATIONS[move.shape][0].spawn_x
+    actions += [ACTION_RIGHT if dx > 0 else ACTION_LEFT] * abs(dx)
+    actions.append(ACTION_DROP)
+    return actions
+
+
+def piece_sequence(engine, count):
+    # As próximas `count` peças (atual, próximas e os sorteios seguintes), sem
+    # mexer no gerador do engine. O hold não muda a ordem: ele só tira a
+    # próxima da fila mais cedo
+    rng = random.Random()
+    rng.setstate(engine.rng.getstate())
+    pieces = [engine.current_shape] + list(engine.next_pieces)
+    while len(pieces) < count:
+        pieces.append(rng.choice(SHAPE_NAMES))
+    return pieces[:count]
+
+
+class PuzzleJob:
+    # Procura um quebra-cabeça sem bloquear: cada poll() anda um pouco (uma
+    # semente por busca) e devolve True quando acabou. result fica com
+    # (semente, ações de preparação, jogadas que faltam) ou None.
+    #
+    # Quebra-cabeça de perfect clear: um perfect clear de `lines` linhas com
+    # as peças que a semente vai dar (uma a mais, por causa do hold), com as
+    # primeiras `setup_pieces` já jogadas; o resto fica para o jogador. As
+    # jogadas que faltam podem usar peças que ainda não estão à vista, mas a
+    # sequência é a da semente, então a solução vale. A procura para em
+    # `tries` sementes ou `time_limit` segundos.
+    def __init__(self, seed, solver, setup_pieces=2, lines=2, tries=50, budget=0.5,
+                 time_limit=PUZZLE_TIME):
+        self.seed = seed
+        self.solver = solver
+        self.setup_pieces = setup_pieces
+        self.lines = lines
+        self.tries = tries
+        self.budget = budget
+        self.deadline = time.monotonic() + time_limit
+        self.attempt = 0
+        self.engine = None
+        self.job = None
+        self.done = False
+        self.result = None
+
+    def poll(self):
+        if self.done:
+            return True
+        if self.job is None:
+            if self.attempt >= self.tries or time.monotonic() > self.deadline:
+                self.done = True
+                return True
+            puzzle_seed = self.seed + self.attempt
+            self.engine = TetrisEngine(seed=puzzle_seed)
+            self.engine.start(puzzle_seed)
+            sequence = piece_sequence(self.engine, self.lines * BOARD_WIDTH // 4 + 1)
+            self.job = self.solver.submit(self.engine.rows, sequence[0], sequence[1:],
+                                          budget=self.budget)
+        if not self.job.poll():
+            return False
+        result = self.job.result
+        self.job = None
+        self.attempt += 1
+        if result.solved:
+            # Confere no próprio engine: a solução inteira precisa zerar o tabuleiro
+            engine = self.engine
+            actions = [move_actions(move) for move in result.moves]
+            for action in sum(actions, []):
+                engine.step(action)
+            if engine.lines_cleared == self.lines and not any(engine.rows):
+                self.result = (engine.seed, sum(actions[:self.setup_pieces], []),
+                               result.moves[self.setup_pieces:])
+                self.done = True
+        return self.done
+
+    def cancel(self):
+        if self.job is not None:
+            self.job.cancel()
+            self.job = None
+        self.done = True
+
+    def wait(self):
+        while not self.poll():
+            time.sleep(0.002)
+        return self.result
+
+
+def make_puzzle(seed, solver, setup_pieces=2, lines=2, tries=50, budget=0.5,
+                time_limit=PUZZLE_TIME):
+    # O mesmo que PuzzleJob, esperando o resultado
+    return PuzzleJob(seed, solver, setup_pieces, lines, tries, budget, time_limit).wait()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Procura perfect clear (ou N linhas) com as peças conhecidas")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--setup", type=int, default=2, help="peças jogadas antes (quebra-cabeça)")
+    parser.add_argument("--lines", type=int, help="objetivo: limpar N linhas em vez de perfect clear")
+    parser.add_argument("--budget", type=float, default=1.0, help="segundos")
+    parser.add_argument("--workers", type=int, help="processos (0 = sem pool)")
+    parser.add_argument("--puzzles", type=int, default=0, help="gera N quebra-cabeças a partir da semente")
+    parser.add_argument("--puzzle-lines", type=int, default=2, help="altura do perfect clear dos quebra-cabeças")
+    args = parser.parse_args(argv)
+
+    solver = Solver(args.workers, args.budget)
+    try:
+        if args.puzzles:
+            seed = args.seed
+            for _ in range(args.puzzles):
+                puzzle = make_puzzle(seed, solver, args.setup, args.puzzle_lines, budget=args.budget)
+                if puzzle is None:
+                    print(f"semente {seed}: nenhum quebra-cabeça")
+                    break
+                seed, actions, moves = puzzle
+                print(f"semente {seed}: {len(actions)} ações de preparação, perfect clear em "
+                      f"{len(moves)} peças: " + ", ".join(f"{'hold ' if m.hold else ''}{m.shape}"
+                                                         for m in moves))
+                seed += 1
+            return
+        engine = TetrisEngine(seed=args.seed)
+        engine.start(args.seed)
+        goal = GOAL_PC if args.lines is None else args.lines
+        result = solver.solve(*engine_state(engine), goal=goal)
+        print(f"{'resolvido' if result.solved else 'sem solução'}: {result.lines} linhas, "
+              f"{result.cells} células sobrando, {result.nodes} nós em {result.elapsed * 1000:.0f} ms"
+              f"{' (prazo estourado)' if result.timed_out else ''}")
+        for move in result.moves:
+            print(f"  {'hold, ' if move.hold else ''}{move.shape} rotação {move.rotation} coluna {move.x}")
+    finally:
+        solver.shutdown()
+
+
+if __name__ == "__main__":
+    main()
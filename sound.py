@@ -0,0 +1,225 @@
+import time
+
+import pygame
+
+# Efeitos sonoros com pouca latência.
+#
+# O buffer do mixer define o atraso entre sound.play() e o som sair: 4096
+# amostras a 44,1 kHz são 93 ms. O perfil "low" usa 512 (12 ms); se o
+# dispositivo não abrir, ou se o áudio começar a atrasar, o mixer é reaberto
+# com o perfil seguinte (buffer maior).
+#
+# Cada categoria tem canais reservados e uma prioridade. Um som usa um canal
+# livre da sua categoria; sem nenhum, pega um livre de categoria de
+# prioridade menor; sem nenhum também, rouba o canal mais antigo da própria
+# categoria (contado em steals). Assim uma rajada de movimentos nunca tira o
+# canal da linha limpa. O mesmo som disparado várias vezes num quadro toca
+# uma vez só (merged).
+#
+# O SDL não informa underruns, então eles são estimados: um som mudo curto
+# toca num canal próprio de tempos em tempos, e o evento de fim (gerado pela
+# thread de áudio) tem de chegar até dois buffers depois do fim previsto.
+# Mais atraso que isso conta como underrun. O atraso só vale se o loop estava
+# olhando a fila: uma medição durante a qual ele ficou mais de PROBE_SLACK sem
+# ler eventos (quadro lento, espera ociosa em passos de IDLE_POLL) é
+# descartada, senão a demora do próprio loop contaria como underrun.
+
+# (nome, amostras por buffer), do mais rápido ao mais seguro
+AUDIO_PROFILES = (("low", 512), ("medium", 1024), ("safe", 4096))
+FREQUENCY = 44100
+
+# categoria -> (prioridade, canais)
+CATEGORIES = {
+    "clear": (3, 2),
+    "lock": (2, 2),
+    "ui": (2, 2),
+    "action": (1, 2),  # girar, hold
+    "move": (0, 2),
+}
+
+PROBE_EVENT = pygame.USEREVENT + 2
+PROBE_LENGTH = 0.05  # segundos de silêncio por medição
+PROBE_INTERVAL = 1.0  # segundos entre medições
+PROBE_SLACK = 0.005  # folga para o loop principal ler o evento
+UNDERRUN_LIMIT = 3  # underruns num perfil antes de passar para o seguinte
+
+
+class SoundEffects:
+    def __init__(self, profile="low"):
+        names = [name for name, _ in AUDIO_PROFILES]
+        self.profile_index = names.index(profile) if profile in names else 0
+        self.available = False
+        self.sounds = {}  # nome -> (Sound, categoria)
+        self.channels = {}  # categoria -> [Channel]
+        self.started = {}  # Channel -> instante do último play
+        self.frame_sounds = set()
+        self.probe_channel = None
+        self.probe_sound = None
+        self.probe_start = None
+        self.probe_next = 0.0
+        self.probe_blind = False
+        self.played = 0
+        self.merged = 0
+        self.steals = 0
+        self.underruns = 0
+        self.profile_underruns = 0
+        self.fallbacks = 0
+        self.probes_skipped = 0
+        self.worst_lateness = 0.0
+
+    @property
+    def profile(self):
+        return AUDIO_PROFILES[self.profile_index][0]
+
+    @property
+    def buffer(self):
+        return AUDIO_PROFILES[self.profile_index][1]
+
+    def buffer_time(self):
+        return self.buffer / FREQUENCY
+
+    # ------------------------------------------------------------------
+    # Dispositivo
+    # ------------------------------------------------------------------
+    def open(self):
+        # Abre o mixer no perfil atual ou, se falhar, nos seguintes
+        while self.profile_index < len(AUDIO_PROFILES):
+            pygame.mixer.pre_init(frequency=FREQUENCY, size=-16, channels=2, buffer=self.buffer)
+            try:
+                pygame.mixer.init()
+                break
+            except pygame.error as e:
+                print(f"Áudio: buffer {self.buffer} indisponível ({e})")
+                if self.profile_index == len(AUDIO_PROFILES) - 1:
+                    print("Áudio indisponível.")
+                    self.available = False
+                    return False
+                self.profile_index += 1
+                self.fallbacks += 1
+
+        # Canais reservados: nenhum Sound.play() automático usa estes
+        total = sum(count for _, count in CATEGORIES.values()) + 1
+        pygame.mixer.set_num_channels(total)
+        pygame.mixer.set_reserved(total)
+        index = 0
+        self.channels = {}
+        for category, (_, count) in CATEGORIES.items():
+            self.channels[category] = [pygame.mixer.Channel(index + i) for i in range(count)]
+            index += count
+        self.started = {}
+        self.probe_channel = pygame.mixer.Channel(index)
+        self.probe_channel.set_endevent(PROBE_EVENT)
+        samples = int(PROBE_LENGTH * FREQUENCY)
+        self.probe_sound = pygame.mixer.Sound(buffer=bytes(samples * 4))  # 16 bits, estéreo
+        self.probe_start = None
+        self.profile_underruns = 0
+        self.available = True
+        return True
+
+    def reopen(self):
+        # Perfil seguinte; os sons precisam ser carregados de novo
+        pygame.mixer.quit()
+        self.sounds = {}
+        self.profile_index = min(self.profile_index + 1, len(AUDIO_PROFILES) - 1)
+        self.fallbacks += 1
+        print(f"Áudio: {self.underruns} underruns, buffer aumentado para {self.buffer}")
+        return self.open()
+
+    def load(self, name, path, volume, category):
+        # Roda na thread de carga
+        if not self.available:
+            return None
+        sound = pygame.mixer.Sound(path)
+        sound.set_volume(volume)
+        self.sounds[name] = (sound, category)
+        return sound
+
+    # ------------------------------------------------------------------
+    # Reprodução
+    # ------------------------------------------------------------------
+    def begin_frame(self):
+        self.frame_sounds.clear()
+
+    def play(self, name):
+        entry = self.sounds.get(name)
+        if not self.available or entry is None:
+            return
+        if name in self.frame_sounds:
+            self.merged += 1
+            return
+        self.frame_sounds.add(name)
+        sound, category = entry
+        channel = self.find_channel(category)
+        channel.play(sound)
+        self.started[channel] = time.perf_counter()
+        self.played += 1
+
+    def find_channel(self, category):
+        own = self.channels[category]
+        for channel in own:
+            if not channel.get_busy():
+                return channel
+        priority = CATEGORIES[category][0]
+        for other, (other_priority, _) in CATEGORIES.items():
+            if other_priority < priority:
+                for channel in self.channels[other]:
+                    if not channel.get_busy():
+                        return channel
+        self.steals += 1
+        return min(own, key=lambda channel: self.started.get(channel, 0.0))
+
+    # ------------------------------------------------------------------
+    # Medição de underruns
+    # ------------------------------------------------------------------
+    def update(self, now):
+        # Dispara a próxima medição; chamado uma vez por quadro
+        if self.available and self.probe_start is None and now >= self.probe_next:
+            self.probe_channel.play(self.probe_sound)
+            self.probe_start = now
+            self.probe_blind = False
+
+    def busy(self, seconds):
+        # O loop passou seconds sem ler a fila de eventos
+        if self.probe_start is not None and seconds > PROBE_SLACK:
+            self.probe_blind = True
+
+    def handle_probe(self, stamp):
+        # Evento de fim da medição; stamp é quando o loop o recebeu
+        if self.probe_start is None:
+            return
+        lateness = stamp - self.probe_start - PROBE_LENGTH
+        self.probe_start = None
+        self.probe_next = stamp + PROBE_INTERVAL
+        if self.probe_blind:
+            # O evento pode ter esperado na fila: a medição não diz nada
+            self.probes_skipped += 1
+            return
+        self.worst_lateness = max(self.worst_lateness, lateness)
+        if lateness > 2 * self.buffer_time() + PROBE_SLACK:
+            self.underruns += 1
+            self.profile_underruns += 1
+
+    def needs_fallback(self):
+        return (self.profile_underruns >= UNDERRUN_LIMIT and
+                self.profile_index < len(AUDIO_PROFILES) - 1)
+
+    def stats(self):
+        return {
+            "profile": self.profile,
+            "buffer": self.buffer,
+            "latency_ms": self.buffer_time() * 1000,
+            "played": self.played,
+            "merged": self.merged,
+            "steals": self.steals,
+            "underruns": self.underruns,
+            "fallbacks": self.fallbacks,
+            "probes_skipped": self.probes_skipped,
+            "worst_probe_ms": self.worst_lateness * 1000,
+        }
+
+    def report(self):
+        s = self.stats()
+        return (f"perfil {s['profile']} (buffer {s['buffer']}, {s['latency_ms']:.1f} ms), "
+                f"{s['played']} sons, {s['merged']} repetidos no quadro, "
+                f"{s['steals']} canais roubados, {s['underruns']} underruns, "
+                f"{s['fallbacks']} trocas de perfil")
@@ -0,0 +1,95 @@
+import random
+
+from autoplay import AutoPlayer, drop_y, fits, place
+from tetris_engine import (BOARD_WIDTH, BOARD_HEIGHT, ROTATIONS, SHAPE_NAMES,
+                           TetrisEngine, empty_board, ACTION_DROP)
+
+
+def random_board(rng, filled_rows, density=0.5):
+    board = empty_board()
+    for y in range(BOARD_HEIGHT - filled_rows, BOARD_HEIGHT):
+        for x in range(BOARD_WIDTH):
+            if rng.random() < density:
+                board[y][x] = rng.choice(SHAPE_NAMES)
+        # Nenhuma linha já cheia
+        board[y][rng.randrange(BOARD_WIDTH)] = ''
+    return board
+
+
+def test_drop_and_place_match_the_engine():
+    rng = random.Random(4)
+    engine = TetrisEngine(seed=4)
+    engine.start(4)
+    for _ in range(200):
+        engine.set_board(random_board(rng, rng.randrange(0, 12)))
+        shape = rng.choice(SHAPE_NAMES)
+        rotation = rng.randrange(4)
+        piece = ROTATIONS[shape][rotation]
+        x = rng.randrange(BOARD_WIDTH - piece.width + 1)
+        if not engine.fits(x, 0, piece.masks, piece.width):
+            continue
+        engine.set_piece(shape, rotation)
+        engine.piece_x, engine.piece_y = x, 0
+        y = drop_y(engine.rows, engine.heights, piece, x, 0)
+        assert y == engine.get_ghost_y()
+        rows, heights, cleared = place(engine.rows, engine.heights, piece, x, y)
+        before = engine.lines_cleared
+        engine.hard_drop()
+        assert cleared == engine.lines_cleared - before
+        assert rows == engine.rows
+        assert heights == engine.heights
+
+
+def test_placements_are_valid_landings_without_duplicates():
+    rng = random.Random(5)
+    player = AutoPlayer(TetrisEngine(seed=5))
+    engine = TetrisEngine(seed=5)
+    engine.start(5)
+    for _ in range(50):
+        engine.set_board(random_board(rng, rng.randrange(0, 10)))
+        for shape in SHAPE_NAMES:
+            spawn = ROTATIONS[shape][0]
+            found = player.placements(engine.rows, engine.heights, shape, 0, spawn.spawn_x, 0)
+            keys = [(piece.matrix, x) for _, x, _, piece in found]
+            assert len(keys) == len(set(keys))
+            for r, x, y, piece in found:
+                assert piece is ROTATIONS[shape][r]
+                assert fits(engine.rows, x, y, piece.masks, piece.width)
+                assert not fits(engine.rows, x, y + 1, piece.masks, piece.width)
+
+
+def test_placements_on_empty_board():
+    player = AutoPlayer(TetrisEngine(seed=1))
+    rows, heights = [0] * BOARD_HEIGHT, [0] * BOARD_WIDTH
+    spawn = ROTATIONS['O'][0]
+    # O: uma orientação só, em todas as colunas
+    assert len(player.placements(rows, heights, 'O', 0, spawn.spawn_x, 0)) == BOARD_WIDTH - 1
+    spawn = ROTATIONS['I'][0]
+    # I: deitado e em pé
+    assert len(player.placements(rows, heights, 'I', 0, spawn.spawn_x, 0)) == \
+        (BOARD_WIDTH - 3) + BOARD_WIDTH
+
+
+def test_next_action_carries_out_the_plan():
+    engine = TetrisEngine(seed=7)
+    engine.start(7)
+    player = AutoPlayer(engine, use_hold=False)
+    hold, rotation, x = player.search()
+    action = player.next_action()
+    while action != ACTION_DROP:
+        assert engine.step(action)
+        action = player.next_action()
+    assert (engine.rotation, engine.piece_x) == (rotation, x)
+
+
+def test_plays_a_seeded_game_and_clears_lines():
+    engine = TetrisEngine(seed=3)
+    engine.start(3)
+    player = AutoPlayer(engine)
+    for _ in range(3000):
+        if engine.game_over or engine.pieces_placed >= 150:
+            break
+        engine.step(player.next_action())
+    assert not engine.game_over
+    assert engine.lines_cleared >= 40
+    assert player.evaluations > 0
@@ -0,0 +1,86 @@
+import json
+
+import pytest
+
+from batch import (chunks, distribution, histogram, make_engine, parse_args, play_game, run,
+                   summarize)
+
+
+def config(**overrides):
+    base = {"policy": "ai", "lookahead": False, "action_delay": 0.05, "max_pieces": 30}
+    base.update(overrides)
+    return base
+
+
+def test_distribution():
+    d = distribution([5, 1, 4, 2, 3, 6, 7, 8, 9, 10])
+    assert d["mean"] == 5.5
+    assert (d["min"], d["p10"], d["p50"], d["p90"], d["max"]) == (1, 2, 6, 10, 10)
+    assert distribution([]) is None
+
+
+def test_histogram():
+    lines = histogram([0, 0, 10, 100], bins=2, width=4)
+    assert len(lines) == 2
+    assert lines[0].endswith("#### 3")
+    assert lines[1].endswith("#    1")
+    assert histogram([]) == []
+    assert histogram([7, 7]) == [f"{7:>10.0f} | {'#' * 40} 2"]
+
+
+def test_summarize():
+    results = [{"score": s, "lines": 1, "level": 1, "pieces": 2, "sim_time": 1.0,
+                "wall_time": 0.1, "game_over": s > 10} for s in (10, 20)]
+    summary = summarize(results)
+    assert summary["games"] == 2
+    assert summary["game_over_rate"] == 0.5
+    assert summary["score"]["mean"] == 15
+    empty = summarize([])
+    assert empty["games"] == 0
+    assert empty["game_over_rate"] == 0.0
+    assert empty["score"] is None
+
+
+def test_chunks_cover_all_seeds():
+    seeds = list(range(10))
+    assert [len(chunk) for chunk in chunks(seeds, 4)] == [4, 4, 2]
+    assert sum(chunks(seeds, 3), []) == seeds
+
+
+@pytest.mark.parametrize("argument", ["--games", "--workers", "--chunk", "--max-pieces",
+                                      "--lines-per-level"])
+def test_counts_must_be_positive(argument, capsys):
+    with pytest.raises(SystemExit):
+        parse_args([argument, "0"])
+    assert "precisa ser pelo menos 1" in capsys.readouterr().err
+    assert getattr(parse_args([argument, "3"]), argument[2:].replace("-", "_")) == 3
+
+
+def test_make_engine_overrides_only_this_instance():
+    engine = make_engine(1, {"lines_per_level": 2, "gravity_start": None})
+    assert engine.lines_per_level == 2
+    assert type(engine).lines_per_level != 2
+
+
+def test_play_game_is_deterministic_per_seed():
+    for policy in ("ai", "random"):
+        first = play_game(12, config(policy=policy))
+        second = play_game(12, config(policy=policy))
+        first.pop("wall_time")
+        second.pop("wall_time")
+        assert first == second
+        assert first["pieces"] > 0
+    assert play_game(12, config())["pieces"] == 30
+
+
+def test_run_writes_results_and_summary(tmp_path, capsys):
+    output, summary_path = tmp_path / "jogos.jsonl", tmp_path / "resumo.json"
+    args = parse_args(["--games", "3", "--seed", "5", "--workers", "1", "--max-pieces", "20",
+                       "--output", str(output), "--summary", str(summary_path)])
+    summary = run(args)
+    results = [json.loads(line) for line in output.read_text().splitlines()]
+    assert sorted(r["seed"] for r in results) == [5, 6, 7]
+    assert json.loads(summary_path.read_text())["games"] == summary["games"] == 3
+    for result in results:
+        expected = play_game(result["seed"], config(max_pieces=20))
+        assert result["score"] == expected["score"]
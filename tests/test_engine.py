@@ -0,0 +1,122 @@
+import random
+
+from tetris_engine import (BOARD_WIDTH, BOARD_HEIGHT, FULL_ROW, ROTATIONS, SHAPE_NAMES,
+                           TetrisEngine, board_rows, column_heights, empty_board,
+                           ACTION_LEFT, ACTION_RIGHT, ACTION_DROP)
+
+
+def random_board(rng, filled_rows, density=0.6):
+    # Tabuleiro com buracos e saliências nas filled_rows linhas de baixo
+    board = empty_board()
+    for y in range(BOARD_HEIGHT - filled_rows, BOARD_HEIGHT):
+        for x in range(BOARD_WIDTH):
+            if rng.random() < density:
+                board[y][x] = rng.choice(SHAPE_NAMES)
+    return board
+
+
+def fits_by_cells(board, x, y, matrix):
+    # Colisão célula a célula, como era antes do bitboard
+    for i, row in enumerate(matrix):
+        for j, cell in enumerate(row):
+            if not cell:
+                continue
+            bx, by = x + j, y + i
+            if bx < 0 or bx >= BOARD_WIDTH or by < 0 or by >= BOARD_HEIGHT or board[by][bx]:
+                return False
+    return True
+
+
+def engine_with(board, shape, rotation=0, x=None, y=0, seed=1):
+    engine = TetrisEngine(seed=seed)
+    engine.start(seed)
+    engine.set_board(board)
+    engine.set_piece(shape, rotation)
+    engine.piece_x = engine.piece.spawn_x if x is None else x
+    engine.piece_y = y
+    return engine
+
+
+def test_fits_matches_cell_by_cell_collision():
+    rng = random.Random(2)
+    for _ in range(20):
+        board = random_board(rng, rng.randrange(1, 12))
+        engine = engine_with(board, 'T')
+        for shape in SHAPE_NAMES:
+            for piece in ROTATIONS[shape]:
+                for y in range(-1, BOARD_HEIGHT + 1):
+                    for x in range(-2, BOARD_WIDTH + 1):
+                        expected = fits_by_cells(board, x, y, piece.matrix)
+                        assert engine.fits(x, y, piece.masks, piece.width) == expected
+                        assert engine.valid_position(x, y, piece.matrix) == expected
+
+
+def test_rows_and_heights_follow_the_color_board():
+    rng = random.Random(3)
+    engine = TetrisEngine(seed=3)
+    engine.start(3)
+    for _ in range(200):
+        if engine.game_over:
+            engine.start(rng.randrange(1 << 32))
+        for _ in range(rng.randrange(5)):
+            engine.step(rng.choice((ACTION_LEFT, ACTION_RIGHT)))
+        engine.step(ACTION_DROP)
+        assert engine.rows == board_rows(engine.board)
+        assert engine.heights == column_heights(engine.rows)
+
+
+def test_line_clear_removes_full_rows_and_scores():
+    events = []
+    engine = TetrisEngine(listener=lambda event, **data: events.append((event, data)), seed=5)
+    engine.start(5)
+    board = empty_board()
+    # Duas linhas cheias menos a coluna 0, e uma marca acima delas
+    for y in (BOARD_HEIGHT - 2, BOARD_HEIGHT - 1):
+        for x in range(1, BOARD_WIDTH):
+            board[y][x] = 'O'
+    board[BOARD_HEIGHT - 3][5] = 'Z'
+    engine.set_board(board)
+    # I em pé na coluna 0 completa as duas linhas de baixo
+    engine.set_piece('I', 1)
+    engine.piece_x = 0
+    engine.piece_y = 0
+    events.clear()
+    engine.hard_drop()
+
+    clears = [data for event, data in events if event == "clear"]
+    assert len(clears) == 1
+    assert clears[0]["rows"] == [BOARD_HEIGHT - 2, BOARD_HEIGHT - 1]
+    assert len(clears[0]["cells"]) == 2 * BOARD_WIDTH
+    assert engine.lines_cleared == 2
+    assert engine.score == 300
+    assert FULL_ROW not in engine.rows
+    # Sobram as duas células do I acima das linhas e a marca, duas linhas abaixo
+    assert engine.board[BOARD_HEIGHT - 1][5] == 'Z'
+    assert engine.board[BOARD_HEIGHT - 1][0] == 'I'
+    assert engine.board[BOARD_HEIGHT - 2][0] == 'I'
+    assert engine.rows == board_rows(engine.board)
+    assert engine.heights == column_heights(engine.rows)
+
+
+def test_level_multiplies_line_score():
+    engine = TetrisEngine(seed=1)
+    engine.start(1)
+    engine.lines_cleared = 9
+    board = empty_board()
+    for x in range(1, BOARD_WIDTH):
+        board[BOARD_HEIGHT - 1][x] = 'L'
+    engine.set_board(board)
+    engine.set_piece('I', 1)
+    engine.piece_x = 0
+    engine.piece_y = 0
+    engine.hard_drop()
+    assert engine.lines_cleared == 10
+    assert engine.level == 2
+    assert engine.score == 100 * 2
+
+
+def test_rejected_actions_do_not_change_state():
+    engine = engine_with(empty_board(), 'I', 0, 0, 0)
+    version, x, y = engine.board_version, engine.piece_x, engine.piece_y
+    assert not engine.step(ACTION_LEFT)
+    assert (engine.board_version, engine.piece_x, engine.piece_y) == (version, x, y)
@@ -0,0 +1,155 @@
+import random
+
+import pytest
+
+from finesse import EMPTY_ROWS, FinesseAnalyzer, FinesseSearch, FinesseTracker
+from tetris_engine import (BOARD_WIDTH, BOARD_HEIGHT, ROTATIONS, SHAPE_NAMES, TetrisEngine,
+                           board_rows, empty_board, ACTION_LEFT, ACTION_ROTATE, ACTION_DROP)
+
+
+def engine_at_spawn(rows, shape):
+    engine = TetrisEngine(seed=1)
+    engine.start(1)
+    board = empty_board()
+    for y, row in enumerate(rows):
+        for x in range(BOARD_WIDTH):
+            if row >> x & 1:
+                board[y][x] = 'I'
+    engine.set_board(board)
+    engine.set_piece(shape)
+    engine.piece_x = engine.piece.spawn_x
+    engine.piece_y = 0
+    return engine
+
+
+def replay_inputs(engine, inputs):
+    # As entradas da busca com o que o InputHandler faz com cada tecla
+    for name in inputs:
+        if name == "left":
+            assert engine.move(-1, 0)
+        elif name == "right":
+            assert engine.move(1, 0)
+        elif name == "das_left":
+            assert engine.move(-1, 0)
+            while engine.move(-1, 0):
+                pass
+        elif name == "das_right":
+            assert engine.move(1, 0)
+            while engine.move(1, 0):
+                pass
+        elif name == "rotate":
+            assert engine.rotate()
+        elif name == "down":
+            assert engine.move(0, 1)
+        elif name == "soft_drop":
+            assert engine.move(0, 1)
+            while engine.move(0, 1):
+                pass
+    return engine.piece.matrix, engine.piece_x, engine.get_ghost_y()
+
+
+def random_rows(rng, filled_rows):
+    board = empty_board()
+    for y in range(BOARD_HEIGHT - filled_rows, BOARD_HEIGHT):
+        for x in range(BOARD_WIDTH):
+            if rng.random() < 0.5:
+                board[y][x] = 'S'
+    return tuple(board_rows(board))
+
+
+@pytest.mark.parametrize("shape, rotation, x, presses", [
+    ('T', 0, 4, 0),  # onde nasce
+    ('T', 0, 3, 1),  # <
+    ('T', 0, 0, 1),  # <<
+    ('T', 0, 1, 2),  # << >
+    ('T', 0, 7, 1),  # >>
+    ('T', 1, 4, 1),  # gira
+    ('I', 0, 0, 1),
+    ('I', 0, 6, 1),
+    ('I', 1, 0, 2),  # gira <<
+    ('O', 0, 0, 1),
+    ('O', 2, 4, 0),  # O girado é o mesmo destino
+])
+def test_known_minimums_on_empty_board(shape, rotation, x, presses):
+    piece = ROTATIONS[shape][rotation]
+    search = FinesseSearch(EMPTY_ROWS, shape)
+    found = search.minimum(rotation, x, BOARD_HEIGHT - piece.height)
+    assert found is not None
+    assert found[0] == presses
+    assert len(found[1]) == presses
+
+
+@pytest.mark.parametrize("shape", SHAPE_NAMES)
+def test_every_target_is_reached_by_its_inputs(shape):
+    rng = random.Random(SHAPE_NAMES.index(shape))
+    for rows in (EMPTY_ROWS, random_rows(rng, 6), random_rows(rng, 10)):
+        search = FinesseSearch(rows, shape)
+        search.expand()
+        assert search.targets
+        for target in search.targets:
+            matrix, x, y = target
+            rotation = next(r for r, piece in enumerate(ROTATIONS[shape]) if piece.matrix == matrix)
+            presses, inputs = search.minimum(rotation, x, y)
+            assert presses == len(inputs)
+            engine = engine_at_spawn(rows, shape)
+            assert replay_inputs(engine, inputs) == target
+
+
+def test_partial_search_agrees_with_full_search():
+    rng = random.Random(5)
+    rows = random_rows(rng, 8)
+    full = FinesseSearch(rows, 'L')
+    full.expand()
+    for matrix, x, y in full.targets:
+        rotation = next(r for r, piece in enumerate(ROTATIONS['L']) if piece.matrix == matrix)
+        partial = FinesseSearch(rows, 'L')
+        assert partial.minimum(rotation, x, y)[0] == full.minimum(rotation, x, y)[0]
+
+
+def test_unreachable_target():
+    # Buraco coberto: só se chega lá de baixo, não do spawn
+    board = empty_board()
+    for x in range(BOARD_WIDTH):
+        board[BOARD_HEIGHT - 3][x] = 'Z'
+    rows = tuple(board_rows(board))
+    search = FinesseSearch(rows, 'O')
+    assert search.minimum(0, 0, BOARD_HEIGHT - 2) is None
+
+
+def test_analyzer_cache():
+    analyzer = FinesseAnalyzer(cache_size=2)
+    search, cached = analyzer.search(EMPTY_ROWS, 'T')
+    assert cached
+    rng = random.Random(1)
+    boards = [random_rows(rng, 4) for _ in range(3)]
+    first, cached = analyzer.search(boards[0], 'T')
+    assert not cached
+    assert analyzer.search(boards[0], 'T') == (first, True)
+    analyzer.search(boards[1], 'T')
+    analyzer.search(boards[2], 'T')
+    # O mais antigo saiu do LRU
+    assert not analyzer.search(boards[0], 'T')[1]
+
+
+def test_tracker_counts_extra_presses():
+    tracker = FinesseTracker()
+    engine = TetrisEngine(seed=2)
+    engine.start(2)
+    engine.set_piece('T')
+    engine.piece_x = engine.piece.spawn_x
+    engine.piece_y = 0
+    tracker.spawn()
+    # Gira quatro vezes (volta ao começo) e anda uma: mínimo 1
+    for _ in range(4):
+        engine.step(ACTION_ROTATE)
+        tracker.press(ACTION_ROTATE)
+    engine.step(ACTION_LEFT)
+    tracker.press(ACTION_LEFT)
+    tracker.press(ACTION_DROP)  # não conta
+    engine.piece_y = engine.get_ghost_y()
+    engine.freeze_piece()
+    result = tracker.lock(engine)
+    assert result.presses == 5
+    assert result.minimum == 1
+    assert result.extra == 4
+    assert tracker.faults == 1
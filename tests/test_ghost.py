@@ -0,0 +1,86 @@
+import random
+
+from tetris_engine import (BOARD_WIDTH, BOARD_HEIGHT, ROTATIONS, SHAPE_NAMES,
+                           TetrisEngine, empty_board)
+
+
+def random_board(rng, filled_rows, density=0.5):
+    board = empty_board()
+    for y in range(BOARD_HEIGHT - filled_rows, BOARD_HEIGHT):
+        for x in range(BOARD_WIDTH):
+            if rng.random() < density:
+                board[y][x] = rng.choice(SHAPE_NAMES)
+    return board
+
+
+def fits_by_cells(board, x, y, matrix):
+    for i, row in enumerate(matrix):
+        for j, cell in enumerate(row):
+            if not cell:
+                continue
+            bx, by = x + j, y + i
+            if bx < 0 or bx >= BOARD_WIDTH or by < 0 or by >= BOARD_HEIGHT or board[by][bx]:
+                return False
+    return True
+
+
+def engine_with(board, shape, rotation, x, y):
+    engine = TetrisEngine(seed=1)
+    engine.start(1)
+    engine.set_board(board)
+    engine.set_piece(shape, rotation)
+    engine.piece_x = x
+    engine.piece_y = y
+    return engine
+
+
+def test_ghost_matches_step_by_step_drop():
+    rng = random.Random(7)
+    for _ in range(300):
+        board = random_board(rng, rng.randrange(0, 15), density=0.5)
+        shape = rng.choice(SHAPE_NAMES)
+        rotation = rng.randrange(4)
+        piece = ROTATIONS[shape][rotation]
+        x = rng.randrange(BOARD_WIDTH - piece.width + 1)
+        engine = engine_with(board, shape, rotation, x, 0)
+        if not engine.fits(x, 0, piece.masks, piece.width):
+            continue
+        expected = 0
+        while fits_by_cells(board, x, expected + 1, piece.matrix):
+            expected += 1
+        assert engine.get_ghost_y() == expected
+
+
+def test_ghost_under_overhang():
+    # Peça já embaixo de uma saliência: as alturas das colunas não servem
+    board = empty_board()
+    for x in range(BOARD_WIDTH):
+        board[10][x] = 'J' if x != 9 else ''
+    engine = engine_with(board, 'O', 0, 2, 12)
+    assert engine.get_ghost_y() == BOARD_HEIGHT - 2
+
+
+def test_ghost_cache_follows_piece_and_board():
+    engine = engine_with(empty_board(), 'T', 0, 3, 0)
+    first = engine.get_ghost_y()
+    assert first == BOARD_HEIGHT - 2
+    # Mesma chave: vem do cache
+    engine._ghost_y = -1
+    assert engine.get_ghost_y() == -1
+    # Peça andou: recalcula
+    engine.move(1, 0)
+    assert engine.get_ghost_y() == first
+    # Tabuleiro mudou (board_version): recalcula
+    board = empty_board()
+    for x in range(BOARD_WIDTH):
+        board[BOARD_HEIGHT - 1][x] = 'S' if x else ''
+    engine.set_board(board)
+    assert engine.get_ghost_y() == BOARD_HEIGHT - 3
+
+
+
+
+def test_heights_follow_lock():
+    engine = engine_with(empty_board(), 'O', 0, 0, 0)
+    engine.hard_drop()
+    assert engine.heights[:3] == [2, 2, 0]
@@ -0,0 +1,97 @@
+from gravity import GravityScheduler, MAX_CATCH_UP
+
+
+class FakeEngine:
+    # Engine mínimo: atraso de 1 s no nível 1, meio segundo a partir do 2
+    def __init__(self):
+        self.level = 1
+        self.game_over = False
+        self.ticks = 0
+
+    def gravity_delay(self):
+        return 1.0 if self.level == 1 else 0.5
+
+    def tick(self):
+        self.ticks += 1
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_scheduler():
+    engine, clock = FakeEngine(), FakeClock()
+    return engine, clock, GravityScheduler(engine, clock)
+
+
+def test_drops_on_exact_deadlines_without_drift():
+    engine, clock, gravity = make_scheduler()
+    assert gravity.next_deadline() == 1.0
+    assert gravity.update(0.99) == 0
+    # Chegou atrasado: o próximo prazo continua no múltiplo de 1 s
+    assert gravity.update(1.25) == 1
+    assert gravity.next_deadline() == 2.0
+    assert gravity.update(2.0) == 1
+    assert engine.ticks == 2
+    assert [late for _, late in gravity.history] == [0.25, 0.0]
+
+
+def test_catch_up_is_capped_and_counts_skipped_drops():
+    engine, clock, gravity = make_scheduler()
+    # Travou 10 s: aplica MAX_CATCH_UP quedas e descarta as outras
+    assert gravity.update(10.0) == MAX_CATCH_UP
+    assert engine.ticks == MAX_CATCH_UP
+    # Prazos 6..10 ainda venciam: 5 descartadas
+    assert gravity.skipped == 5
+    assert gravity.next_deadline() == 11.0
+    gravity.reset(20.0)
+    assert gravity.skipped == 5
+
+
+def test_pause_shifts_the_deadline():
+    engine, clock, gravity = make_scheduler()
+    gravity.pause(0.5)
+    assert gravity.update(3.0) == 0
+    gravity.resume(3.0)
+    assert gravity.next_deadline() == 3.5
+    assert gravity.update(3.4) == 0
+    assert gravity.update(3.5) == 1
+
+
+def test_next_deadline_uses_the_level_after_the_drop():
+    engine, clock, gravity = make_scheduler()
+
+    def tick():
+        engine.ticks += 1
+        engine.level = 2
+
+    gravity.tick = tick
+    assert gravity.update(1.0) == 1
+    assert gravity.next_deadline() == 1.5
+
+
+def test_stops_on_game_over():
+    engine, clock, gravity = make_scheduler()
+    engine.game_over = True
+    assert gravity.update(5.0) == 0
+
+
+def test_jitter_and_report_per_level():
+    engine, clock, gravity = make_scheduler()
+    gravity.update(1.002)
+    gravity.update(2.004)
+    engine.level = 2
+    gravity.update(3.0)
+    report = gravity.jitter()
+    assert sorted(report) == [1, 2]
+    count, mean, p99, worst = report[1]
+    assert count == 2
+    assert abs(mean - 0.003) < 1e-9
+    assert abs(worst - 0.004) < 1e-9
+    assert abs(gravity.worst_p99() - 0.004) < 1e-9
+    assert "nível 1: 2 quedas" in gravity.report()
+    assert "0 quedas descartadas" in gravity.report()
@@ -0,0 +1,149 @@
+from input_handler import InputHandler, MAX_SHIFT, MAX_REPEATS
+from tetris_engine import BOARD_WIDTH, ACTION_LEFT, ACTION_RIGHT, ACTION_DOWN, ACTION_ROTATE
+
+LEFT, RIGHT, DOWN, UP = "left", "right", "down", "up"
+
+
+class FakeGame:
+    # Peça numa linha só, entre as paredes; as ações ficam na fila até
+    # process(), como na Simulation
+    def __init__(self, x=4):
+        self.x = x
+        self.queue = []
+        self.sent = []
+        self.accepting = True
+
+    def perform(self, action, on_result=None):
+        if not self.accepting:
+            return False
+        self.sent.append(action)
+        self.queue.append((action, on_result))
+        return True
+
+    def process(self):
+        queue, self.queue = self.queue, []
+        for action, on_result in queue:
+            ok = True
+            if action == ACTION_LEFT:
+                ok = self.x > 0
+                self.x -= ok
+            elif action == ACTION_RIGHT:
+                ok = self.x < BOARD_WIDTH - 1
+                self.x += ok
+            if on_result is not None:
+                on_result(ok)
+
+
+def make_input(arr=0.05, x=4):
+    game = FakeGame(x)
+    handler = InputHandler(game.perform, das=0.1, arr=arr, soft_drop=0.05, clock=lambda: 0.0)
+    for key, action in ((LEFT, ACTION_LEFT), (RIGHT, ACTION_RIGHT),
+                        (DOWN, ACTION_DOWN), (UP, ACTION_ROTATE)):
+        handler.bind(key, action)
+    return game, handler
+
+
+def test_das_then_arr_repeats():
+    game, handler = make_input()
+    handler.key_down(RIGHT, 0.0)
+    assert game.sent == [ACTION_RIGHT]
+    # Antes do DAS não repete
+    assert handler.update(0.09) == 0
+    assert handler.next_deadline() == 0.1
+    # DAS e mais dois intervalos de ARR vencidos no mesmo update
+    assert handler.update(0.2) == 3
+    assert len(game.sent) == 4
+    assert abs(handler.next_deadline() - 0.25) < 1e-9
+
+
+def test_repeats_are_capped_after_a_stall():
+    game, handler = make_input()
+    handler.key_down(DOWN, 0.0)
+    assert handler.update(100.0) == MAX_REPEATS
+    assert handler.next_deadline() == 100.0 + 0.05
+
+
+def test_unbound_key_is_ignored():
+    game, handler = make_input()
+    assert not handler.key_down("space", 0.0)
+    assert game.sent == []
+
+
+def test_blocked_key_stops_until_unblock():
+    game, handler = make_input(x=1)
+    handler.key_down(LEFT, 0.0)
+    game.process()
+    handler.update(0.1)
+    game.process()
+    assert game.x == 0
+    # A repetição que bateu na parede bloqueia a tecla
+    handler.update(0.15)
+    game.process()
+    assert handler.update(1.0) == 0
+    # Ao desbloquear não despeja as repetições perdidas: retoma no próximo intervalo
+    handler.unblock()
+    assert handler.update(1.0) == 0
+    assert handler.update(1.05) == 1
+
+
+def test_arr_zero_sends_one_burst_and_waits_for_results():
+    game, handler = make_input(arr=0, x=BOARD_WIDTH - 1)
+    handler.key_down(LEFT, 0.0)
+    game.process()
+    # Rajada inteira no fim do DAS, nada mais enquanto não houver resposta
+    assert handler.update(0.1) == MAX_SHIFT
+    assert handler.update(0.2) == 0
+    game.process()
+    assert game.x == 0
+    # Encostou: só volta a tentar depois de unblock, e com um passo só
+    assert handler.update(0.3) == 0
+    handler.unblock()
+    assert handler.update(0.3) == 1
+    game.process()
+    assert handler.update(0.4) == 0
+
+
+def test_arr_zero_full_burst_again_after_a_step_that_moves():
+    game, handler = make_input(arr=0, x=0)
+    handler.key_down(LEFT, 0.0)
+    game.process()
+    handler.unblock()
+    # Abre espaço: o passo de prova anda e a rajada seguinte volta a ser inteira
+    game.x = 5
+    assert handler.update(0.1) == 1
+    game.process()
+    assert handler.update(0.1) == MAX_SHIFT
+
+
+def test_rejected_perform_does_not_stay_pending():
+    game, handler = make_input(arr=0)
+    game.accepting = False
+    handler.key_down(LEFT, 0.0)
+    game.accepting = True
+    assert handler.update(0.1) == MAX_SHIFT
+
+
+def test_releasing_a_direction_recharges_the_other():
+    game, handler = make_input()
+    handler.key_down(LEFT, 0.0)
+    handler.key_down(RIGHT, 0.05)
+    # Só a última direção pressionada repete
+    handler.update(0.2)
+    assert ACTION_LEFT not in game.sent[2:]
+    handler.key_up(RIGHT, 0.3)
+    assert handler.next_deadline() == 0.3 + 0.1
+    del game.sent[:]
+    handler.update(0.4)
+    assert game.sent == [ACTION_LEFT]
+
+
+def test_latency_is_measured_until_presented():
+    game, handler = make_input()
+    handler.key_down(UP, 1.0)
+    handler.key_down(UP, 1.004)
+    handler.presented(1.010)
+    assert handler.latency.count == 2
+    assert abs(handler.latency.worst - 10.0) < 1e-6
+    assert handler.latency.percentile(50) == 7
+    handler.presented(2.0)
+    assert handler.latency.count == 2
@@ -0,0 +1,33 @@
+from tetris_engine import BOARD_WIDTH, ROTATIONS, SHAPES, TetrisEngine, empty_board
+
+
+def test_rotation_table_matches_shapes():
+    for shape, matrix in SHAPES.items():
+        states = ROTATIONS[shape]
+        assert states[0].matrix == tuple(tuple(row) for row in matrix)
+        # Quatro giros horários voltam ao começo
+        assert tuple(zip(*states[3].matrix[::-1])) == states[0].matrix
+        for piece in states:
+            assert len(piece.cells) == 4
+            assert piece.width == len(piece.matrix[0])
+            assert piece.height == len(piece.matrix)
+
+
+def test_each_rotation_is_the_previous_turned_clockwise():
+    for shape in SHAPES:
+        states = ROTATIONS[shape]
+        for r in range(4):
+            assert states[(r + 1) % 4].matrix == tuple(zip(*states[r].matrix[::-1]))
+
+
+def test_rotate_advances_the_rotation_index():
+    engine = TetrisEngine(seed=1)
+    engine.start(1)
+    engine.set_board(empty_board())
+    engine.set_piece('T', 0)
+    engine.piece_x = BOARD_WIDTH // 2 - 1
+    engine.piece_y = 5
+    for expected in (1, 2, 3, 0):
+        assert engine.rotate()
+        assert engine.rotation == expected
+        assert engine.piece is ROTATIONS['T'][expected]
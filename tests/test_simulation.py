@@ -0,0 +1,149 @@
+from gravity import GravityScheduler
+from replay import ReplayPlayer, ReplayRecorder, final_state, play
+from simulation import Simulation
+from tetris_engine import (BOARD_WIDTH, BOARD_HEIGHT, TetrisEngine, empty_board,
+                           ACTION_LEFT, ACTION_RIGHT, ACTION_HOLD, ACTION_DROP)
+
+
+def make_simulation(seed=6):
+    engine = TetrisEngine(seed=seed)
+    simulation = Simulation(engine)
+    simulation.start(seed)
+    return engine, simulation
+
+
+def test_commands_apply_in_order_and_publish_once():
+    engine, simulation = make_simulation()
+    first = simulation.latest()
+    x = engine.piece_x
+    simulation.step(ACTION_LEFT)
+    simulation.step(ACTION_LEFT)
+    simulation.step(ACTION_RIGHT)
+    # Só enfileirou: nem o engine nem o snapshot mudaram
+    assert engine.piece_x == x
+    assert simulation.latest() is first
+    assert simulation.process() == 3
+    snapshot = simulation.latest()
+    assert snapshot.version == first.version + 1
+    assert snapshot.piece_x == engine.piece_x == x - 1
+    assert snapshot.ghost_y == engine.get_ghost_y()
+    # Fila vazia: nada a publicar
+    assert simulation.process() == 0
+    assert simulation.latest() is snapshot
+
+
+def test_snapshot_keeps_the_board_until_it_changes():
+    engine, simulation = make_simulation()
+    board = simulation.latest().board
+    simulation.step(ACTION_RIGHT)
+    simulation.process()
+    assert simulation.latest().board is board
+    simulation.step(ACTION_DROP)
+    simulation.process()
+    snapshot = simulation.latest()
+    assert snapshot.board is not board
+    assert snapshot.board == tuple(tuple(row) for row in engine.board)
+    assert snapshot.board_version == engine.board_version
+
+
+def test_on_result_reports_each_action():
+    engine, simulation = make_simulation()
+    results = []
+    for _ in range(BOARD_WIDTH):
+        simulation.step(ACTION_LEFT, results.append)
+    simulation.process()
+    # Anda até a parede e depois é recusada
+    assert results[0] is True
+    assert results[-1] is False
+    assert results == sorted(results, reverse=True)
+
+
+def test_calls_run_between_commands():
+    engine, simulation = make_simulation()
+    seen = []
+    simulation.call(lambda: seen.append(engine.ticks))
+    simulation.tick()
+    simulation.call(lambda tag: seen.append((tag, engine.ticks)), "depois")
+    assert seen == []
+    simulation.process()
+    assert seen == [0, ("depois", 1)]
+
+
+def test_start_discards_queued_commands():
+    engine, simulation = make_simulation()
+    simulation.step(ACTION_DROP)
+    simulation.tick()
+    simulation.start(7)
+    assert simulation.process() == 0
+    assert engine.pieces_placed == 0
+    assert engine.ticks == 0
+    assert simulation.latest().ticks == 0
+
+
+def test_simulation_records_only_accepted_actions():
+    engine, simulation = make_simulation()
+    recorder = ReplayRecorder(engine)
+    simulation.on_action = recorder.record
+    # Contra a parede: só as primeiras andam
+    for _ in range(10):
+        simulation.step(ACTION_LEFT)
+    simulation.step(ACTION_HOLD)
+    simulation.step(ACTION_HOLD)
+    simulation.process()
+    moved = engine.piece_x
+    recorded = [action for _, action in recorder.events]
+    assert recorded.count(ACTION_HOLD) == 1
+    assert 0 < recorded.count(ACTION_LEFT) < 10
+    # O replay refaz a mesma posição
+    player = play(recorder.finish())
+    assert player.engine.piece_x == moved
+    assert player.verify()
+
+
+def test_realtime_playback_through_simulation():
+    # update(now) pela fila da simulação chega ao mesmo estado que step()
+    engine, simulation = make_simulation(9)
+    recorder = ReplayRecorder(engine)
+    simulation.on_action = recorder.record
+    for i in range(300):
+        simulation.step((ACTION_LEFT, ACTION_RIGHT, ACTION_DROP)[i % 3])
+        if i % 4 == 0:
+            simulation.tick()
+    simulation.process()
+    replay = recorder.finish()
+
+    target = TetrisEngine()
+    target_simulation = Simulation(target)
+    target_simulation.start(replay.seed)
+    player = ReplayPlayer(replay, target, target_simulation)
+    now = 0.0
+    player.start(now)
+    while not player.finished:
+        now += 1 / 60
+        player.update(now)
+        target_simulation.process()
+    target_simulation.process()
+    assert player.verify()
+    assert final_state(target) == final_state(engine)
+
+
+def test_gravity_deadline_sees_the_queued_drop():
+    engine, simulation = make_simulation()
+    engine.lines_per_level = 1
+    board = empty_board()
+    for x in range(BOARD_WIDTH - 1):
+        board[BOARD_HEIGHT - 1][x] = 'L'
+    engine.set_board(board)
+    # I em pé na última coluna, encostado no fundo: a próxima queda trava e limpa
+    engine.set_piece('I', 1)
+    engine.piece_x = BOARD_WIDTH - 1
+    engine.piece_y = BOARD_HEIGHT - 4
+    delay = engine.gravity_delay()
+    gravity = GravityScheduler(engine, clock=lambda: 0.0, tick=simulation.tick,
+                               process=simulation.process)
+    gravity.reset(0.0)
+    assert gravity.update(delay) == 1
+    assert engine.level == 2
+    # O prazo seguinte já usa o atraso do nível novo
+    assert gravity.next_deadline() == delay + engine.gravity_delay()
+    assert simulation.latest().level == 2
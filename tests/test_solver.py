@@ -0,0 +1,135 @@
+from solver import (GOAL_PC, STOP_SLOTS, Move, PuzzleJob, Solver, StopFlag, apply_moves,
+                    make_puzzle, move_actions, pc_possible, placements)
+from tetris_engine import (BOARD_WIDTH, BOARD_HEIGHT, FULL_ROW, ROTATIONS, TetrisEngine,
+                           column_heights, ACTION_LEFT, ACTION_RIGHT, ACTION_ROTATE,
+                           ACTION_DROP, ACTION_HOLD)
+
+
+def rows_with_gap(gap_columns, lines=2):
+    # `lines` linhas de baixo cheias, menos as colunas de gap_columns
+    rows = [0] * BOARD_HEIGHT
+    mask = FULL_ROW
+    for x in gap_columns:
+        mask &= ~(1 << x)
+    for y in range(BOARD_HEIGHT - lines, BOARD_HEIGHT):
+        rows[y] = mask
+    return tuple(rows)
+
+
+def test_placements_land_and_put_lower_ones_first():
+    rows = rows_with_gap((4, 5))
+    heights = column_heights(rows)
+    found = placements(rows, heights, 'O')
+    assert len(found) == BOARD_WIDTH - 1
+    # O buraco 2x2 é o lugar mais baixo
+    r, x, y, piece = found[0]
+    assert (x, y) == (4, BOARD_HEIGHT - 2)
+
+
+def test_solves_a_perfect_clear_in_process():
+    solver = Solver(workers=0, budget=2.0)
+    result = solver.solve(rows_with_gap((4, 5)), 'O', ['T'])
+    assert result.solved
+    assert result.moves == [Move(False, 'O', 0, 4, BOARD_HEIGHT - 2)]
+    assert (result.lines, result.cells) == (2, 0)
+    assert not result.timed_out
+
+
+def test_uses_the_hold_piece():
+    solver = Solver(workers=0, budget=2.0)
+    result = solver.solve(rows_with_gap((4, 5)), 'S', ['Z'], hold='O')
+    assert result.solved
+    assert result.moves[0].hold
+    assert result.moves[0].shape == 'O'
+    # Sem hold não dá
+    result = solver.solve(rows_with_gap((4, 5)), 'S', ['Z'], hold='O', use_hold=False)
+    assert not result.solved
+
+
+def test_line_goal_keeps_the_best_attempt():
+    solver = Solver(workers=0, budget=2.0)
+    rows = rows_with_gap((0, 1, 2, 3), lines=1)
+    result = solver.solve(rows, 'I', [], goal=1)
+    assert result.solved
+    assert result.lines == 1
+    result = solver.solve(rows, 'O', [], goal=1)
+    assert not result.solved
+    assert result.lines == 0
+    assert len(result.moves) == 1
+
+
+def test_pc_possible_pruning():
+    empty = (0,) * BOARD_HEIGHT
+    heights = column_heights(empty)
+    # Tabuleiro vazio sem peças: nada a limpar
+    assert not pc_possible(empty, heights, 0)
+    assert pc_possible(empty, heights, 5)
+    gap = rows_with_gap((4, 5))
+    assert pc_possible(gap, column_heights(gap), 1)
+    # Buraco coberto nunca fecha
+    covered = list(gap)
+    covered[BOARD_HEIGHT - 3] = 1 << 4
+    assert not pc_possible(tuple(covered), column_heights(covered), 3)
+    # Trecho de 2 células (colunas 0) entre a parede e a coluna 1 já cheia
+    split = rows_with_gap((0, 2, 3, 4, 5, 6, 7, 8, 9), lines=2)
+    split_heights = column_heights(split)
+    assert split_heights[1] == 2
+    assert not pc_possible(split, split_heights, 4)
+
+
+def test_move_actions_reach_the_move():
+    spawn_x = ROTATIONS['T'][0].spawn_x
+    assert move_actions(Move(True, 'T', 2, spawn_x - 2, 0)) == [
+        ACTION_HOLD, ACTION_ROTATE, ACTION_ROTATE, ACTION_LEFT, ACTION_LEFT, ACTION_DROP]
+    assert move_actions(Move(False, 'T', 0, spawn_x + 1, 0)) == [ACTION_RIGHT, ACTION_DROP]
+
+
+def test_apply_moves():
+    rows, lines = apply_moves(rows_with_gap((4, 5)), [Move(False, 'O', 0, 4, BOARD_HEIGHT - 2)])
+    assert lines == 2
+    assert not any(rows)
+
+
+def test_stop_flag_follows_its_slot():
+    live = [0] * 2
+    live[1] = 7
+    flag = StopFlag(live, 1, 7)
+    assert not flag.is_set()
+    # A posição foi liberada ou reaproveitada por outro job
+    live[1] = 8
+    assert flag.is_set()
+
+
+def test_puzzle_from_a_known_seed():
+    solver = Solver(workers=0, budget=0.5)
+    assert make_puzzle(0, solver)[0] == 20
+    seed, actions, moves = PuzzleJob(20, solver, tries=1).wait()
+    assert seed == 20
+    # Preparação e jogadas que faltam zeram o tabuleiro no engine
+    engine = TetrisEngine(seed=seed)
+    engine.start(seed)
+    for action in actions + sum((move_actions(move) for move in moves), []):
+        engine.step(action)
+    assert engine.lines_cleared == 2
+    assert not any(engine.rows)
+
+
+def test_pool_solves_and_frees_its_slot():
+    solver = Solver(workers=1, budget=5.0)
+    try:
+        result = solver.solve(rows_with_gap((4, 5)), 'O', ['T'], goal=GOAL_PC)
+        assert result.solved
+        assert result.moves[0].shape == 'O'
+        assert len(solver.free_slots) == STOP_SLOTS
+        slot, job_id = solver.acquire()
+        assert solver.live[slot] == job_id
+        assert len(solver.free_slots) == STOP_SLOTS - 1
+        solver.release(slot)
+        assert solver.live[slot] == 0
+        # Cancelar devolve a posição na hora
+        job = solver.submit((0,) * BOARD_HEIGHT, 'I', ['I', 'I', 'I', 'I'], budget=5.0)
+        job.cancel()
+        assert job.result.timed_out
+        assert len(solver.free_slots) == STOP_SLOTS
+    finally:
+        solver.shutdown()
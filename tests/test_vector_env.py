@@ -0,0 +1,142 @@
+import numpy as np
+
+from tetris_engine import (BOARD_WIDTH, BOARD_HEIGHT, ROTATIONS, SHAPE_NAMES, TetrisEngine,
+                           empty_board, ACTION_HOLD)
+from vector_env import EMPTY_HOLD, NUM_ACTIONS, PLACEMENTS, VectorTetris
+
+FILLED_ROWS = 4
+
+
+def prefill(env, engines, rng):
+    # Linhas de baixo cheias menos um buraco, para as jogadas limparem linhas
+    for i, engine in enumerate(engines):
+        board = empty_board()
+        for y in range(BOARD_HEIGHT - FILLED_ROWS, BOARD_HEIGHT):
+            gap = rng.integers(BOARD_WIDTH)
+            for x in range(BOARD_WIDTH):
+                if x != gap:
+                    shape = int(rng.integers(len(SHAPE_NAMES)))
+                    board[y][x] = SHAPE_NAMES[shape]
+                    env.board[i, y, x] = shape + 1
+        occupied = env.board[i] != 0
+        env.heights[i] = np.where(occupied.any(axis=0), BOARD_HEIGHT - occupied.argmax(axis=0), 0)
+        engine.set_board(board)
+
+
+def engine_board(engine):
+    # Tabuleiro do engine no formato do VectorTetris (0 = vazio, 1 + formato)
+    return np.array([[SHAPE_NAMES.index(cell) + 1 if cell else 0 for cell in row]
+                     for row in engine.board], dtype=np.int8)
+
+
+def sync_pieces(engine, env, i):
+    # A fila do ambiente manda: o engine sorteia com o próprio gerador
+    engine.set_piece(SHAPE_NAMES[env.piece[i]])
+    engine.piece_x = engine.piece.spawn_x
+    engine.piece_y = 0
+    engine.next_pieces = [SHAPE_NAMES[q] for q in env.queue[i]]
+
+
+def apply_on_engine(engine, action):
+    # A mesma jogada no engine: hold, giro e coluna direto e hard drop.
+    # False se a peça que sai da fila no hold já não nasce (o ambiente não
+    # confere isso)
+    if action >= PLACEMENTS:
+        assert engine.step(ACTION_HOLD)
+        if engine.game_over:
+            return False
+    placement = action % PLACEMENTS
+    rotation = placement // BOARD_WIDTH
+    piece = ROTATIONS[engine.current_shape][rotation]
+    x = min(placement % BOARD_WIDTH, BOARD_WIDTH - piece.width)
+    assert engine.fits(x, 0, piece.masks, piece.width)
+    engine.set_piece(engine.current_shape, rotation)
+    engine.piece_x = x
+    engine.piece_y = 0
+    engine.hard_drop()
+    return True
+
+
+def test_matches_engine_placement_by_placement():
+    num_envs, steps = 32, 60
+    rng = np.random.default_rng(0)
+    env = VectorTetris(num_envs, seed=0)
+    env.reset()
+    # Níveis curtos, para a pontuação passar por vários multiplicadores
+    env.lines_per_level = 2
+    engines = []
+    for i in range(num_envs):
+        engine = TetrisEngine(seed=i)
+        engine.lines_per_level = 2
+        engine.start(i)
+        engines.append(engine)
+    prefill(env, engines, rng)
+    for i, engine in enumerate(engines):
+        sync_pieces(engine, env, i)
+
+    alive = set(range(num_envs))
+    total_lines = 0
+    for _ in range(steps):
+        if not alive:
+            break
+        # Uma ação válida sorteada por tabuleiro
+        actions = (rng.random((num_envs, NUM_ACTIONS)) * env.action_mask()).argmax(axis=1)
+        for i in list(alive):
+            engine = engines[i]
+            held = SHAPE_NAMES[env.hold[i]] if env.hold[i] != EMPTY_HOLD else None
+            assert engine.hold_piece == held
+            engine.next_pieces = [SHAPE_NAMES[q] for q in env.queue[i]]
+            engine.hold_used = False
+            if not apply_on_engine(engine, actions[i]):
+                alive.discard(i)
+
+        _, reward, done, info = env.step(actions)
+        for i in list(alive):
+            engine = engines[i]
+            if done[i]:
+                # Tabuleiro recomeçou sozinho; o engine não acompanha mais
+                alive.discard(i)
+                continue
+            # O engine só acaba se o ambiente também acabou
+            assert not engine.game_over
+            assert (env.board[i] == engine_board(engine)).all()
+            assert list(env.heights[i]) == engine.heights
+            assert env.lines[i] == engine.lines_cleared
+            assert reward[i] == engine.line_scores.get(int(info["lines"][i]), 0) * engine.level
+            assert env.score[i] == engine.score
+            assert env.level[i] == engine.level
+            assert env.pieces[i] == engine.pieces_placed
+            assert SHAPE_NAMES[env.piece[i]] == engine.current_shape
+            total_lines += int(info["lines"][i])
+    # O teste só vale se houve linhas limpas
+    assert total_lines > 0
+
+
+def test_action_mask_matches_engine_fits():
+    rng = np.random.default_rng(1)
+    env = VectorTetris(8, seed=1)
+    env.reset()
+    engines = [TetrisEngine(seed=i) for i in range(8)]
+    for engine in engines:
+        engine.start()
+    prefill(env, engines, rng)
+    # Algumas jogadas para o tabuleiro ficar irregular
+    for _ in range(10):
+        env.step((rng.random((8, NUM_ACTIONS)) * env.action_mask()).argmax(axis=1))
+    mask = env.action_mask()
+    for i in range(8):
+        engine = TetrisEngine()
+        engine.start()
+        engine.set_board([[SHAPE_NAMES[v - 1] if v else '' for v in row] for row in env.board[i]])
+        hold = env.hold[i] if env.hold[i] != EMPTY_HOLD else env.queue[i, 0]
+        for action in range(NUM_ACTIONS):
+            shape = SHAPE_NAMES[hold if action >= PLACEMENTS else env.piece[i]]
+            placement = action % PLACEMENTS
+            piece = ROTATIONS[shape][placement // BOARD_WIDTH]
+            x = placement % BOARD_WIDTH
+            # A máscara usa as alturas: cabe se a queda do topo cabe
+            expected = (x <= BOARD_WIDTH - piece.width and
+                        engine.fits(x, 0, piece.masks, piece.width) and
+                        all(BOARD_HEIGHT - engine.heights[x + c] - 1 - bottom >= 0
+                            for c, bottom in enumerate(piece.bottom)))
+            assert mask[i, action] == expected
@@ -0,0 +1,401 @@
+import random
+from collections import namedtuple
+
+# Núcleo de regras do Tetris, sem dependência de pygame.
+# O TetrisGame (base_tetris.py) apenas desenha o estado deste objeto,
+# então ele pode ser simulado sem janela nem áudio (CI, testes em lote).
+
+# Tamanho do tabuleiro
+BOARD_WIDTH = 10
+BOARD_HEIGHT = 22
+
+# Formatos das peças (mesmo do original)
+SHAPES = {
+    'I': [[1, 1, 1, 1]],
+    'O': [[1, 1],
+          [1, 1]],
+    'T': [[0, 1, 0],
+          [1, 1, 1]],
+    'S': [[0, 1, 1],
+          [1, 1, 0]],
+    'Z': [[1, 1, 0],
+          [0, 1, 1]],
+    'J': [[1, 0, 0],
+          [1, 1, 1]],
+    'L': [[0, 0, 1],
+          [1, 1, 1]]
+}
+
+SHAPE_NAMES = tuple(SHAPES)
+
+# Pontuação por quantidade de linhas limpas de uma vez
+LINE_SCORES = {1: 100, 2: 300, 3: 500, 4: 800}
+
+# Ações aceitas por step()
+ACTION_NONE = 0
+ACTION_LEFT = 1
+ACTION_RIGHT = 2
+ACTION_DOWN = 3
+ACTION_ROTATE = 4
+ACTION_DROP = 5
+ACTION_HOLD = 6
+ACTIONS = (ACTION_NONE, ACTION_LEFT, ACTION_RIGHT, ACTION_DOWN,
+           ACTION_ROTATE, ACTION_DROP, ACTION_HOLD)
+
+
+# Linha cheia no bitboard (um bit por coluna, bit x = coluna x)
+FULL_ROW = (1 << BOARD_WIDTH) - 1
+
+# Máscaras por linha de cada formato de peça, indexadas pela matriz 0/1
+_ROW_MASKS = {}
+
+
+def empty_board():
+    return [['' for _ in range(BOARD_WIDTH)] for _ in range(BOARD_HEIGHT)]
+
+
+def row_masks(shape):
+    key = tuple(tuple(row) for row in shape)
+    masks = _ROW_MASKS.get(key)
+    if masks is None:
+        masks = tuple(sum(1 << j for j, cell in enumerate(row) if cell)
+                      for row in shape)
+        _ROW_MASKS[key] = masks
+    return masks
+
+
+def board_rows(board):
+    # Converte a grade de cores em uma máscara de ocupação por linha
+    return [sum(1 << x for x, cell in enumerate(row) if cell) for row in board]
+
+
+def column_heights(rows):
+    # Altura de cada coluna (0 = vazia), medida a partir do fundo
+    heights = [0] * BOARD_WIDTH
+    for x in range(BOARD_WIDTH):
+        bit = 1 << x
+        for y, row in enumerate(rows):
+            if row & bit:
+                heights[x] = BOARD_HEIGHT - y
+                break
+    return heights
+
+
+# Uma orientação de peça, calculada uma única vez:
+#   matrix   matriz 0/1 (tupla de tuplas)
+#   cells    células ocupadas como (coluna, linha) relativas ao canto
+#   masks    máscara de bits de cada linha (para o bitboard)
+#   top      linha mais alta ocupada em cada coluna
+#   bottom   linha mais baixa ocupada em cada coluna
+#   spawn_x  coluna em que a peça nasce
+Rotation = namedtuple(
+    'Rotation', ['matrix', 'cells', 'masks', 'width', 'height', 'top', 'bottom',
+                 'spawn_x'])
+
+
+def build_rotations():
+    table = {}
+    for name, shape in SHAPES.items():
+        states = []
+        matrix = tuple(tuple(row) for row in shape)
+        for _ in range(4):
+            width, height = len(matrix[0]), len(matrix)
+            cells = tuple((j, i) for i, row in enumerate(matrix)
+                          for j, cell in enumerate(row) if cell)
+            top = tuple(min(i for j, i in cells if j == col)
+                        for col in range(width))
+            bottom = tuple(max(i for j, i in cells if j == col)
+                           for col in range(width))
+            states.append(Rotation(matrix, cells, row_masks(matrix), width, height,
+                                   top, bottom, BOARD_WIDTH // 2 - width // 2))
+            # Mesma rotação horária de antes (zip na matriz invertida)
+            matrix = tuple(zip(*matrix[::-1]))
+        table[name] = tuple(states)
+    return table
+
+
+# ROTATIONS[formato][índice de rotação] -> Rotation
+ROTATIONS = build_rotations()
+
+
+class TetrisEngine:
+    # listener(evento, **dados) é chamado a cada mudança relevante
+    # ("move", "rotate", "hold", "spawn", "lock", "clear", "game_over"), e é por ele
+    # que a interface toca sons e cria partículas.
+
+    # Curvas de pontuação e de velocidade. São atributos de classe para que
+    # simulações em lote (batch.py) possam testar variações por instância.
+    line_scores = LINE_SCORES
+    lines_per_level = 10
+    gravity_start = 0.8
+    gravity_step = 0.07
+    gravity_min = 0.05
+
+    def __init__(self, listener=None, seed=None):
+        self.listener = listener
+        self.reset(seed)
+
+    def reset(self, seed=None):
+        # Cada partida tem seu próprio gerador; sem semente, sorteia uma e a
+        # guarda em self.seed para a partida poder ser reproduzida (replay)
+        if seed is None:
+            seed = random.randrange(1 << 32)
+        self.seed = seed
+        self.rng = random.Random(seed)
+        # board guarda as cores (só para desenhar); rows é o bitboard
+        # usado nas colisões e na detecção de linhas completas
+        self.board = empty_board()
+        self.rows = [0] * BOARD_HEIGHT
+        # Altura de cada coluna; atualizada ao encaixar e ao limpar linhas
+        self.heights = [0] * BOARD_WIDTH
+        # Muda sempre que o tabuleiro muda; invalida o cache da sombra
+        self.board_version = 0
+        self._ghost_key = None
+        self._ghost_y = 0
+        # A peça atual é (current_shape, rotation); piece é a entrada
+        # correspondente de ROTATIONS
+        self.current_shape = None
+        self.rotation = 0
+        self.piece = None
+        self.piece_x = 0
+        self.piece_y = 0
+        self.score = 0
+        self.level = 1
+        self.lines_cleared = 0
+        self.pieces_placed = 0
+        self.ticks = 0
+        self.hold_piece = None
+        self.hold_used = False
+        self.game_over = False
+        self.next_pieces = [self.rng.choice(SHAPE_NAMES) for _ in range(3)]
+
+    def start(self, seed=None):
+        self.reset(seed)
+        return self.spawn_piece()
+
+    def set_board(self, board):
+        # Substitui o tabuleiro (ex.: puzzles, benchmarks) mantendo o bitboard
+        self.board = [row[:] for row in board]
+        self.rows = board_rows(self.board)
+        self.heights = column_heights(self.rows)
+        self.board_version += 1
+
+    def set_piece(self, shape, rotation=0):
+        self.current_shape = shape
+        self.rotation = rotation
+        self.piece = ROTATIONS[shape][rotation]
+
+    def clear_piece(self):
+        self.current_shape = None
+        self.rotation = 0
+        self.piece = None
+
+    @property
+    def current_piece(self):
+        # Matriz 0/1 da peça atual (ou None), como era antes das tabelas
+        return self.piece.matrix if self.piece is not None else None
+
+    def emit(self, event, **data):
+        if self.listener is not None:
+            self.listener(event, **data)
+
+    # ------------------------------------------------------------------
+    # API de simulação
+    # ------------------------------------------------------------------
+    def step(self, action):
+        if action == ACTION_LEFT:
+            return self.move(-1, 0)
+        if action == ACTION_RIGHT:
+            return self.move(1, 0)
+        if action == ACTION_DOWN:
+            return self.move(0, 1)
+        if action == ACTION_ROTATE:
+            return self.rotate()
+        if action == ACTION_DROP:
+            return self.hard_drop()
+        if action == ACTION_HOLD:
+            return self.hold_current_piece()
+        return False
+
+    def tick(self):
+        # Um passo de gravidade: desce a peça ou a encaixa
+        if self.game_over or self.piece is None:
+            return False
+        self.ticks += 1
+        if not self.move(0, 1):
+            self.lock_piece()
+        return True
+
+    def gravity_delay(self):
+        return max(self.gravity_min, self.gravity_start - (self.level * self.gravity_step))
+
+    # ------------------------------------------------------------------
+    # Regras
+    # ------------------------------------------------------------------
+    def spawn_piece(self):
+        while len(self.next_pieces) < 3:
+            self.next_pieces.append(self.rng.choice(SHAPE_NAMES))
+
+        self.set_piece(self.next_pieces.pop(0))
+        self.piece_x = self.piece.spawn_x
+        self.piece_y = 0
+        self.hold_used = False
+
+        if not self.fits(self.piece_x, self.piece_y, self.piece.masks, self.piece.width):
+            self.game_over = True
+            self.clear_piece()
+            self.emit("game_over")
+            return False
+        self.emit("spawn")
+        return True
+
+    def get_ghost_y(self):
+        piece = self.piece
+        if piece is None:
+            return 0
+
+        # A sombra só muda quando a peça se move/gira ou o tabuleiro muda
+        key = (piece, self.piece_x, self.piece_y, self.board_version)
+        if key == self._ghost_key:
+            return self._ghost_y
+
+        # Pelas alturas das colunas: a peça para na coluna em que o topo
+        # fica mais perto da célula mais baixa dela
+        x, y = self.piece_x, self.piece_y
+        heights = self.heights
+        ghost_y = BOARD_HEIGHT
+        for col, bottom in enumerate(piece.bottom):
+            landing = BOARD_HEIGHT - heights[x + col] - 1 - bottom
+            if landing < y:
+                # Peça embaixo de uma saliência: o topo da coluna não serve
+                ghost_y = None
+                break
+            ghost_y = min(ghost_y, landing)
+
+        if ghost_y is None:
+            ghost_y = y
+            while self.fits(x, ghost_y + 1, piece.masks, piece.width):
+                ghost_y += 1
+
+        self._ghost_key = key
+        self._ghost_y = ghost_y
+        return ghost_y
+
+    def valid_position(self, x, y, shape):
+        if shape is None:
+            return False
+        return self.fits(x, y, row_masks(shape), len(shape[0]))
+
+    def fits(self, x, y, masks, width):
+        # Toda linha e coluna das matrizes de SHAPES tem ao menos uma célula,
+        # então checar o retângulo da peça equivale a checar célula a célula
+        if x < 0 or y < 0 or x + width > BOARD_WIDTH or y + len(masks) > BOARD_HEIGHT:
+            return False
+        rows = self.rows
+        for i, mask in enumerate(masks):
+            if rows[y + i] & (mask << x):
+                return False
+        return True
+
+    def move(self, dx, dy):
+        piece = self.piece
+        if self.game_over or piece is None:
+            return False
+
+        new_x = self.piece_x + dx
+        new_y = self.piece_y + dy
+        if self.fits(new_x, new_y, piece.masks, piece.width):
+            self.piece_x = new_x
+            self.piece_y = new_y
+            if dx != 0 or dy != 0:
+                self.emit("move", dx=dx, dy=dy)
+            return True
+        return False
+
+    def rotate(self):
+        if self.game_over or self.piece is None:
+            return False
+        rotation = (self.rotation + 1) % 4
+        rotated = ROTATIONS[self.current_shape][rotation]
+        if self.fits(self.piece_x, self.piece_y, rotated.masks, rotated.width):
+            self.rotation = rotation
+            self.piece = rotated
+            self.emit("rotate")
+            return True
+        return False
+
+    def hold_current_piece(self):
+        if self.game_over or self.hold_used or self.piece is None:
+            return False
+
+        self.emit("hold")
+        if self.hold_piece is None:
+            self.hold_piece = self.current_shape
+            self.spawn_piece()
+        else:
+            held = self.hold_piece
+            self.hold_piece = self.current_shape
+            self.set_piece(held)
+            self.piece_x = self.piece.spawn_x
+            self.piece_y = 0
+        self.hold_used = True
+        return True
+
+    def hard_drop(self):
+        if self.game_over or self.piece is None:
+            return False
+        self.piece_y = self.get_ghost_y()
+        self.lock_piece()
+        return True
+
+    def lock_piece(self):
+        self.freeze_piece()
+        self.clear_lines()
+        self.spawn_piece()
+
+    def freeze_piece(self):
+        piece = self.piece
+        if piece is None:
+            return
+
+        x, y = self.piece_x, self.piece_y
+        for dx, dy in piece.cells:
+            self.board[y + dy][x + dx] = self.current_shape
+        for i, mask in enumerate(piece.masks):
+            self.rows[y + i] |= mask << x
+        heights = self.heights
+        for dx, top in enumerate(piece.top):
+            heights[x + dx] = max(heights[x + dx], BOARD_HEIGHT - y - top)
+        self.board_version += 1
+        self.pieces_placed += 1
+        self.emit("lock")
+
+    def clear_lines(self):
+        # Identifica linhas completas com uma comparação por linha
+        lines_cleared = [i for i, row in enumerate(self.rows) if row == FULL_ROW]
+        if not lines_cleared:
+            return 0
+
+        # Células removidas, informadas ANTES de modificar o tabuleiro
+        cells = [(x, y, self.board[y][x])
+                 for y in lines_cleared for x in range(BOARD_WIDTH)]
+
+        self.lines_cleared += len(lines_cleared)
+        self.update_level()
+
+        # Remove as linhas completas e adiciona linhas vazias no topo
+        count = len(lines_cleared)
+        self.board = ([['' for _ in range(BOARD_WIDTH)] for _ in range(count)] +
+                      [row for row, mask in zip(self.board, self.rows) if mask != FULL_ROW])
+        self.rows = [0] * count + [row for row in self.rows if row != FULL_ROW]
+        self.heights = column_heights(self.rows)
+        self.board_version += 1
+
+        # Sistema de pontuação
+        self.score += self.line_scores.get(len(lines_cleared), 0) * self.level
+
+        self.emit("clear", rows=lines_cleared, cells=cells)
+        return len(lines_cleared)
+
+    def update_level(self):
+        self.level = 1 + self.lines_cleared // self.lines_per_level
@@ -0,0 +1,223 @@
+import numpy as np
+
+from tetris_engine import (BOARD_WIDTH, BOARD_HEIGHT, LINE_SCORES, ROTATIONS, SHAPE_NAMES,
+                           TetrisEngine)
+
+# Ambiente vetorizado: B tabuleiros avançando juntos, para treinar políticas
+# de posicionamento offline.
+#
+#   env = VectorTetris(4096, seed=0)
+#   obs = env.reset()
+#   obs, reward, done, info = env.step(actions)  # uma jogada por tabuleiro
+#
+# Cada ação é uma posição final da peça, não uma tecla:
+#   ação = hold * PLACEMENTS + rotação * BOARD_WIDTH + coluna
+# A peça (ou a do hold, se hold=1) gira no topo, vai até a coluna e cai. O
+# caminho não é simulado, como nos "placement policies" de costume. Colunas
+# além da largura da peça são trazidas para a última válida (info["clamped"]);
+# action_mask() diz quais ações cabem.
+#
+# Regras de pontuação, nível e fim de jogo são as do TetrisEngine: a partida
+# acaba quando a peça escolhida não cabe na primeira linha ou quando a próxima
+# não cabe onde nasce. Tabuleiros que acabam recomeçam sozinhos no mesmo
+# step; o resultado da partida vem em info["final_score"] etc.
+#
+# O estado fica em arrays NumPy: board (B, 22, 10) int8 com 0 = vazio e
+# 1 + índice em SHAPE_NAMES, alturas das colunas, peça atual, hold, fila de
+# próximas, pontos, linhas, nível. Colisão, encaixe e limpeza de linhas são
+# operações sobre o lote inteiro. As observações são os próprios arrays (sem
+# cópia): o step seguinte os altera, então copie o que precisar guardar.
+
+PLACEMENTS = 4 * BOARD_WIDTH
+NUM_ACTIONS = 2 * PLACEMENTS
+QUEUE_SIZE = 3
+EMPTY_HOLD = -1
+# Colunas extras em heights: as colunas de preenchimento das peças (x + 3 no
+# máximo) caem nelas em vez de serem cortadas para a coluna 9
+HEIGHT_PAD = 3
+
+
+def build_tables():
+    # Tabelas (formato, rotação, ...) a partir de ROTATIONS; colunas que a
+    # peça não ocupa ficam com valores que nunca limitam a queda
+    n = len(SHAPE_NAMES)
+    cell_x = np.zeros((n, 4, 4), dtype=np.intp)
+    cell_y = np.zeros((n, 4, 4), dtype=np.intp)
+    bottom = np.full((n, 4, 4), -2 * BOARD_HEIGHT, dtype=np.intp)
+    top = np.full((n, 4, 4), 2 * BOARD_HEIGHT, dtype=np.intp)
+    width = np.zeros((n, 4), dtype=np.intp)
+    height = np.zeros((n, 4), dtype=np.intp)
+    for s, name in enumerate(SHAPE_NAMES):
+        for r, rotation in enumerate(ROTATIONS[name]):
+            for k, (dx, dy) in enumerate(rotation.cells):
+                cell_x[s, r, k] = dx
+                cell_y[s, r, k] = dy
+            bottom[s, r, :rotation.width] = rotation.bottom
+            top[s, r, :rotation.width] = rotation.top
+            width[s, r] = rotation.width
+            height[s, r] = rotation.height
+    spawn_x = np.array([ROTATIONS[name][0].spawn_x for name in SHAPE_NAMES], dtype=np.intp)
+    return cell_x, cell_y, bottom, top, width, height, spawn_x
+
+
+CELL_X, CELL_Y, BOTTOM, TOP, WIDTH, HEIGHT, SPAWN_X = build_tables()
+SCORE_TABLE = np.array([0] + [LINE_SCORES.get(n, 0) for n in range(1, 5)], dtype=np.int64)
+OFFSETS = np.arange(4)
+COLUMNS = np.arange(BOARD_WIDTH)
+
+
+class VectorTetris:
+    lines_per_level = TetrisEngine.lines_per_level
+
+    def __init__(self, num_envs, seed=None):
+        self.num_envs = num_envs
+        self.rng = np.random.default_rng(seed)
+        self.index = np.arange(num_envs)
+
+        self.board = np.zeros((num_envs, BOARD_HEIGHT, BOARD_WIDTH), dtype=np.int8)
+        self.padded_heights = np.zeros((num_envs, BOARD_WIDTH + HEIGHT_PAD), dtype=np.intp)
+        self.heights = self.padded_heights[:, :BOARD_WIDTH]
+        self.piece = np.zeros(num_envs, dtype=np.intp)
+        self.hold = np.full(num_envs, EMPTY_HOLD, dtype=np.intp)
+        self.queue = np.zeros((num_envs, QUEUE_SIZE), dtype=np.intp)
+        self.score = np.zeros(num_envs, dtype=np.int64)
+        self.lines = np.zeros(num_envs, dtype=np.int64)
+        self.level = np.ones(num_envs, dtype=np.int64)
+        self.pieces = np.zeros(num_envs, dtype=np.int64)
+        self.steps = 0
+
+        # Sempre o mesmo dicionário, com os próprios arrays de estado
+        self.observation = {
+            "board": self.board,
+            "heights": self.heights,
+            "piece": self.piece,
+            "hold": self.hold,
+            "queue": self.queue,
+        }
+
+    def reset(self, seed=None):
+        if seed is not None:
+            self.rng = np.random.default_rng(seed)
+        self.reset_envs(self.index)
+        return self.observation
+
+    def reset_envs(self, envs):
+        self.board[envs] = 0
+        self.padded_heights[envs] = 0
+        self.hold[envs] = EMPTY_HOLD
+        self.queue[envs] = self.rng.integers(0, len(SHAPE_NAMES), (len(envs), QUEUE_SIZE))
+        self.score[envs] = 0
+        self.lines[envs] = 0
+        self.level[envs] = 1
+        self.pieces[envs] = 0
+        self.advance(envs)
+
+    def advance(self, envs):
+        # Próxima peça da fila vira a atual, como no spawn_piece
+        queue = self.queue
+        self.piece[envs] = queue[envs, 0]
+        queue[envs, :-1] = queue[envs, 1:]
+        queue[envs, -1] = self.rng.integers(0, len(SHAPE_NAMES), len(envs))
+
+    def landing(self, envs, shapes, rotations, xs):
+        # Linha em que cada peça para caindo do topo na coluna xs; negativa
+        # se ela já não cabe na primeira linha
+        heights = self.padded_heights[envs[:, None], xs[:, None] + OFFSETS]
+        return (BOARD_HEIGHT - 1 - heights - BOTTOM[shapes, rotations]).min(axis=1)
+
+    def action_mask(self):
+        # (B, NUM_ACTIONS): ações cuja coluna é válida e cuja peça cabe. Para
+        # cada rotação, a maior altura + fundo da peça sobre as 4 colunas sai
+        # de fatias deslocadas de heights, para as 10 colunas de uma vez
+        shapes = (self.piece, np.where(self.hold == EMPTY_HOLD, self.queue[:, 0], self.hold))
+        mask = np.empty((self.num_envs, 2, 4, BOARD_WIDTH), dtype=bool)
+        heights = self.padded_heights
+        for h, shape in enumerate(shapes):
+            for r in range(4):
+                bottom = BOTTOM[shape, r]
+                reach = heights[:, :BOARD_WIDTH] + bottom[:, :1]
+                for c in range(1, 4):
+                    np.maximum(reach, heights[:, c:c + BOARD_WIDTH] + bottom[:, c:c + 1], out=reach)
+                mask[:, h, r] = ((reach < BOARD_HEIGHT) &
+                                 (COLUMNS <= (BOARD_WIDTH - WIDTH[shape, r])[:, None]))
+        return mask.reshape(self.num_envs, NUM_ACTIONS)
+
+    def step(self, actions):
+        actions = np.asarray(actions, dtype=np.intp)
+        envs = self.index
+        self.steps += 1
+
+        # Hold: troca com a peça guardada ou, sem nenhuma, com a da fila
+        held = np.flatnonzero(actions >= PLACEMENTS)
+        if held.size:
+            previous = self.hold[held]
+            self.hold[held] = self.piece[held]
+            empty = previous == EMPTY_HOLD
+            self.piece[held] = previous
+            if empty.any():
+                self.advance(held[empty])
+
+        placement = actions % PLACEMENTS
+        rotations = placement // BOARD_WIDTH
+        xs = placement % BOARD_WIDTH
+        shapes = self.piece
+        max_x = BOARD_WIDTH - WIDTH[shapes, rotations]
+        clamped = xs > max_x
+        xs = np.minimum(xs, max_x)
+
+        ys = self.landing(envs, shapes, rotations, xs)
+        blocked = ys < 0
+        alive = np.flatnonzero(~blocked)
+        a_shapes, a_rot, a_x, a_y = shapes[alive], rotations[alive], xs[alive], ys[alive]
+
+        # Encaixe: as 4 células de cada peça de uma vez, e as alturas
+        rows = a_y[:, None] + CELL_Y[a_shapes, a_rot]
+        cols = a_x[:, None] + CELL_X[a_shapes, a_rot]
+        self.board[alive[:, None], rows, cols] = (a_shapes + 1)[:, None]
+        cols = a_x[:, None] + OFFSETS
+        self.padded_heights[alive[:, None], cols] = np.maximum(
+            self.padded_heights[alive[:, None], cols],
+            BOARD_HEIGHT - a_y[:, None] - TOP[a_shapes, a_rot])
+        self.pieces[alive] += 1
+
+        # Só as linhas que a peça ocupa podem ter ficado cheias
+        rows = np.minimum(a_y[:, None] + OFFSETS, BOARD_HEIGHT - 1)
+        full = (self.board[alive[:, None], rows] != 0).all(axis=2)
+        full &= OFFSETS < HEIGHT[a_shapes, a_rot][:, None]
+        cleared = np.zeros(self.num_envs, dtype=np.int64)
+        cleared[alive] = full.sum(axis=1)
+        self.clear_lines(np.flatnonzero(cleared))
+
+        self.lines += cleared
+        self.level[:] = 1 + self.lines // self.lines_per_level
+        reward = SCORE_TABLE[cleared] * self.level
+        self.score += reward
+
+        # Próxima peça; a partida acaba se ela não cabe onde nasce
+        self.advance(alive)
+        spawn = self.piece[alive]
+        done = blocked
+        done[alive] = self.landing(alive, spawn, np.zeros_like(spawn), SPAWN_X[spawn]) < 0
+
+        info = {"lines": cleared, "clamped": clamped}
+        finished = np.flatnonzero(done)
+        if finished.size:
+            info["final_score"] = self.score.copy()
+            info["final_lines"] = self.lines.copy()
+            info["final_pieces"] = self.pieces.copy()
+            self.reset_envs(finished)
+        return self.observation, reward, done, info
+
+    def clear_lines(self, envs):
+        # Linhas cheias vão para o topo (ordenação estável) e são zeradas
+        if not envs.size:
+            return
+        boards = self.board[envs]
+        full = (boards != 0).all(axis=2)
+        order = np.argsort(~full, axis=1, kind="stable")
+        boards = np.take_along_axis(boards, order[:, :, None], axis=1)
+        boards[np.arange(BOARD_HEIGHT) < full.sum(axis=1)[:, None]] = 0
+        self.board[envs] = boards
+        occupied = boards != 0
+        self.heights[envs] = np.where(occupied.any(axis=1),
+                                      BOARD_HEIGHT - occupied.argmax(axis=1), 0)